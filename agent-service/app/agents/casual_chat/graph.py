@@ -1,3 +1,4 @@
+import functools
 from typing import Literal
 
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -7,7 +8,7 @@ from langgraph.prebuilt import ToolNode
 
 from app.agents.casual_chat.tools import all_tools
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     compose_message_context
 )
 from app import config
@@ -25,6 +26,7 @@ SYSTEM_PROMPT = """
 REASONING = True
 
 
+@functools.cache
 def get_casual_chat_chain():
     llm = config.get_default_llm(reasoning=REASONING)
     llm = llm.bind_tools(tools=all_tools)
@@ -38,9 +40,9 @@ def get_casual_chat_chain():
     return chain
 
 
-def casual_chat_node(state: MessagesState):
+async def casual_chat_node(state: MessagesState):
     chain = get_casual_chat_chain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
     return {"messages": [response]}
 
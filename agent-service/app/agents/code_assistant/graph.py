@@ -1,10 +1,12 @@
+import functools
+
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import SystemMessage
 from langgraph.graph import MessagesState, StateGraph, START, END
 
 from app.agents.casual_chat.tools import all_tools
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     compose_message_context
 )
 from app import config
@@ -22,6 +24,7 @@ SYSTEM_PROMPT = """
 
 REASONING = False
 
+@functools.cache
 def get_coder_chain():
     llm = config.get_default_llm(
         model=config.DEFAULT_CODER_MODEL_NAME, # Change to a model specific to coding.
@@ -37,9 +40,9 @@ def get_coder_chain():
     return chain
 
 
-def coder_node(state: MessagesState):
+async def coder_node(state: MessagesState):
     chain = get_coder_chain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
     return {"messages": [response]}
 
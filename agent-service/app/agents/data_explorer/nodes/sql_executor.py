@@ -1,3 +1,5 @@
+import functools
+
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnableSerializable
 from langchain_core.messages import SystemMessage, AIMessage
@@ -6,7 +8,7 @@ from langgraph.prebuilt import ToolNode
 from app.agents.data_explorer.state import GraphState
 from app.agents.data_explorer.tools import execute_query
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     human_in_the_loop,
     compose_message_context
 )
@@ -31,6 +33,7 @@ REASONING = False
 TOOLS = [execute_query]
 
 
+@functools.cache
 def get_runnable_chain() -> RunnableSerializable:
     llm = config.get_default_llm(reasoning=REASONING)
     llm = llm.bind_tools(tools=TOOLS)
@@ -44,9 +47,9 @@ def get_runnable_chain() -> RunnableSerializable:
     return chain
 
 
-def node(state: GraphState) -> dict:
+async def node(state: GraphState) -> dict:
     chain = get_runnable_chain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
     
     # 도구 호출 성공
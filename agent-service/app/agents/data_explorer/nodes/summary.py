@@ -1,10 +1,12 @@
+import functools
+
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableSerializable
 from langchain_core.messages import SystemMessage
 
 from app.agents.data_explorer.state import GraphState
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     compose_message_context
 )
 from app import config
@@ -21,6 +23,7 @@ SYSTEM_PROMPT = """
 REASONING = False
 
 
+@functools.cache
 def get_runnable_chain() -> RunnableSerializable:
     llm = config.get_default_llm(reasoning=REASONING)
     prompt_template = ChatPromptTemplate.from_messages(
@@ -34,8 +37,8 @@ def get_runnable_chain() -> RunnableSerializable:
     return chain
 
 
-def node(state: GraphState) -> dict:
+async def node(state: GraphState) -> dict:
     chain = get_runnable_chain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
     return {"messages": [response]}
@@ -1,3 +1,5 @@
+import functools
+
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableSerializable
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
@@ -6,7 +8,7 @@ from langgraph.prebuilt import ToolNode
 from app.agents.data_explorer.state import GraphState
 from app.agents.data_explorer.tools import get_table_schemas
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     compose_message_context, 
     trim_messages_from
 )
@@ -34,6 +36,7 @@ REASONING = True
 TOOLS = [get_table_schemas]
 
 
+@functools.cache
 def get_runnable_chain() -> RunnableSerializable:
     llm = config.get_default_llm(reasoning=REASONING)
     llm = llm.bind_tools(tools=TOOLS)
@@ -47,14 +50,14 @@ def get_runnable_chain() -> RunnableSerializable:
     return chain
 
 
-def node(state: GraphState) -> dict:
+async def node(state: GraphState) -> dict:
     # 3번째 전 사용자 입력 이후의 대화 내용만 참고하여 결과를 생성합니다.
     trimmed_messages = trim_messages_from(state["messages"], HumanMessage, 3)
     # Node는 순수 함수여서 state 객체 업데이트는 그래프 영구 상태에는 영향을 주지 않으므로 안전합니다.
     state.update({"messages": trimmed_messages})
 
     chain = get_runnable_chain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
 
     # Tool 호출의 경우
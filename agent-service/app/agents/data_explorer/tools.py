@@ -1,28 +1,31 @@
 from typing import List
-import requests
 
 from langchain_core.tools import tool
 
 from app.utils import rag
+from app.utils.http_client import client
 from app import config
 
 
 # TODO: Response schema를 pydantic 같은 걸로 구체화하여 퍼포먼스 비교
 @tool
-def get_table_schemas(query: str) -> List[dict]:
+async def get_table_schemas(query: str, count: int = 3) -> List[dict]:
     """
     유저가 원하는 데이터를 조회하기 위해 필요한 연관성이 높은 테이블 스키마를 검색할 때 사용합니다.
     Join과 같은 복잡한 SQL이 요구되는 경우, 관련 테이블이 여러개 있을 수 있습니다.
+    검색 결과 하나가 테이블 하나의 전체 스키마(CREATE TABLE 문)입니다.
     Parameters:
     - query: VectorStore에서 검색하기 위한 쿼리. 자연어 기반으로 검색할 수 있으므로, 핵심 사용자 질문에 해당하는 자연어을 그대로 사용하세요.
+    - count: 가져올 테이블 개수. 질문에 필요한 테이블 수만큼만 지정하세요. 기본값: 3
     """
-    collection_id = rag.get_collection_id_by_name(config.DB_TABLE_SCHEMAS_RAG_COLLECTION_NAME)
-    return rag.document_search(collection_id, query, 10)
+    collection_id = await rag.get_collection_id_by_name(config.DB_TABLE_SCHEMAS_RAG_COLLECTION_NAME)
+    # 본문(CREATE TABLE 문)에 컬럼 정보가 모두 있으므로 메타데이터는 테이블 이름만 받음
+    return await rag.document_search(collection_id, query, count, metadata_fields=["table_name"])
 
 
 # TODO: Response schema를 pydantic 같은 걸로 구체화하여 퍼포먼스 비교
 @tool
-def execute_query(sql: str) -> dict:
+async def execute_query(sql: str) -> dict:
     """
     SQLite 데이터베이스에 SQL을 실행하고 쿼리 결과를 응답합니다.
     Parameters:
@@ -31,7 +34,7 @@ def execute_query(sql: str) -> dict:
     url = config.DW_SERVICE_URL + "/query"
     headers = {"Content-Type": "application/json"}
     payload = {"query": sql}
-    response = requests.post(url, headers=headers, json=payload)
+    response = await client.post(url, headers=headers, json=payload)
     response.raise_for_status()
     return response.json()
 
@@ -1,3 +1,4 @@
+import functools
 from typing import Literal
 
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -7,7 +8,7 @@ from langgraph.prebuilt import ToolNode
 
 from app.agents.document_qa.tools import get_internal_documents
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     compose_message_context
 )
 from app import config
@@ -38,6 +39,7 @@ REASONING = True
 TOOLS = [get_internal_documents]
 
 
+@functools.cache
 def get_document_qa_cain():
     llm = config.get_default_llm(reasoning=REASONING)
     llm = llm.bind_tools(tools=TOOLS)
@@ -51,9 +53,9 @@ def get_document_qa_cain():
     return chain
 
 
-def document_qa_node(state: MessagesState):
+async def document_qa_node(state: MessagesState):
     chain = get_document_qa_cain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
     return {"messages": [response]}
 
@@ -8,16 +8,18 @@ from app import config
 
 # TODO: Response schema를 pydantic 같은 걸로 구체화하여 퍼포먼스 비교
 @tool
-def get_internal_documents(query: str, count: int = 4) -> List[dict]:
+async def get_internal_documents(query: str, count: int = 4) -> List[dict]:
     """
     유저의 질의에 가장 연관성이 높은 문서를 검색할 때 사용합니다.
     일반적인 질문이 아닌 사내 문서 데이터베이스에서 조회가 필요할 때 연관 문서를 가져올 수 있습니다.
     Parameters:
     - query: VectorStore에서 검색하기 위한 쿼리.
     - count: 연관 문서 상위 몇개를 가져올 지. 기본값: 4
+    중복되거나 거의 같은 내용의 문서는 제외하고, 서로 다른 내용의 문서를 반환합니다.
     """
-    collection_id = rag.get_collection_id_by_name(config.INTERNAL_DOCUMENTS_RAG_COLLECTION_NAME)
-    return rag.document_search(collection_id, query, count)
+    collection_id = await rag.get_collection_id_by_name(config.INTERNAL_DOCUMENTS_RAG_COLLECTION_NAME)
+    # MMR: 번역본 등 중복 문서가 상위 결과를 모두 차지하지 않도록 다양성을 반영
+    return await rag.document_search(collection_id, query, count, search_type="mmr")
 
 
 all_tools = [
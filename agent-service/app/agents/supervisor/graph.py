@@ -1,3 +1,4 @@
+import functools
 from typing import Literal
 
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
@@ -7,7 +8,7 @@ from pydantic import BaseModel, Field
 
 from app.agents import document_qa, code_assistant, data_explorer, casual_chat
 from app.utils.helper import (
-    invoke_runnable_with_usage_callback,
+    ainvoke_runnable_with_usage_callback,
     compose_message_context,
     trim_messages_from
 )
@@ -44,6 +45,7 @@ class Route(BaseModel):
     next: Literal["Document_QA", "Code_Assistant", "Data_Explorer", "Casual_Chat"] = Field(..., description="다음 경로.")
 
 
+@functools.cache
 def get_supervisor_chain():
     llm = config.get_default_llm(reasoning=REASONING) 
     llm = llm.bind_tools(tools=[Route])
@@ -61,19 +63,19 @@ class SupervisorState(MessagesState):
     next: str
 
 
-def supervisor_node(state: SupervisorState):
+async def supervisor_node(state: SupervisorState):
     # 3번째 전 사용자 입력 이후의 대화 내용만 참고하여 라우팅 합니다.
     trimmed_messages = trim_messages_from(state["messages"], HumanMessage, 3)
     # Node는 순수 함수여서 state 객체 업데이트는 그래프 영구 상태에는 영향을 주지 않으므로 안전합니다.
     state.update({"messages": trimmed_messages})
 
     chain = get_supervisor_chain()
-    response = invoke_runnable_with_usage_callback(chain, state)
+    response = await ainvoke_runnable_with_usage_callback(chain, state)
     response = compose_message_context(response)
 
     if not response.tool_calls:
         # Supervisor가 라우팅 역할에 충실하지 않고 직접 답변을 한 경우, 한번의 추가 지침을 줍니다.
-        response = chain.invoke({"messages": trimmed_messages + [HumanMessage(content="Route 도구를 호출하세요.")]})
+        response = await chain.ainvoke({"messages": trimmed_messages + [HumanMessage(content="Route 도구를 호출하세요.")]})
 
     # 정상적으로 라우팅 된 경우
     if response.tool_calls:
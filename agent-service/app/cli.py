@@ -30,6 +30,8 @@ class ConsoleUI:
         self.app = graph_app
         self.console = Console()
         self.thread_id = None
+        # 대화 전체를 하나의 이벤트 루프에서 실행합니다. (턴마다 asyncio.run을 하면 공유 HTTP 커넥션이 루프와 함께 버려짐)
+        self.runner = asyncio.Runner()
     
     def _print_logo(self):
         logo_art = r"""
@@ -133,6 +135,10 @@ class ConsoleUI:
         """사용자 입력을 받고 에이전트를 실행하는 메인 루프"""
         self._print_logo()
         
+        with self.runner:
+            self._chat_loop()
+
+    def _chat_loop(self):
         while True:
             try:
                 user_input = self.console.input("[bold green]You: [/bold green]")
@@ -171,15 +177,15 @@ class ConsoleUI:
                     subgraphs=True
                 )
                 
-                asyncio.run(self._handle_stream(stream))
+                self.runner.run(self._handle_stream(stream))
 
                 # Interrupted by Human in the loop
-                while self.app.get_state(config).interrupts:
-                    self.console.print(self.app.get_state(config).interrupts)
+                while (state := self.runner.run(self.app.aget_state(config))).interrupts:
+                    self.console.print(state.interrupts)
                     user_input = self.console.input("[bold magenta]Make approvals: [/bold magenta]")
                     user_input = json.loads(user_input)
                     stream = self.app.astream_events(Command(resume=user_input), config=config, subgraphs=True)
-                    asyncio.run(self._handle_stream(stream))
+                    self.runner.run(self._handle_stream(stream))
                 
                 self.console.print("\n" + "-" * 50, style="dim")
 
@@ -10,8 +10,8 @@ from app.agents import supervisor
 #     f.write(supervisor.graph.graph.get_graph(xray=True).draw_mermaid_png())
 
 
-def chatbot(state: MessagesState):
-    response = supervisor.graph.graph.invoke(state)
+async def chatbot(state: MessagesState):
+    response = await supervisor.graph.graph.ainvoke(state)
     ai_message = response["messages"][-1]
     if isinstance(ai_message, AIMessage):
         # Append only the last AI message to state (to minimize context)
@@ -1,3 +1,6 @@
+import functools
+
+import httpx
 from starlette.config import Config
 from langchain_ollama import ChatOllama
 
@@ -9,10 +12,19 @@ LLM_SERVICE_URL = env("LLM_SERVICE_URL", cast=str, default="")
 RAG_SERVICE_URL = env("RAG_SERVICE_URL", cast=str, default="")
 DW_SERVICE_URL = env("DW_SERVICE_URL", cast=str, default="")
 
+# rag/dw 서비스 호출 타임아웃 (초)
+SERVICE_TIMEOUT_SECONDS = env("SERVICE_TIMEOUT_SECONDS", cast=float, default=60)
+
 DEFAULT_MODEL_NAME = env("DEFAULT_MODEL_NAME", cast=str, default="gpt-oss:20b")
 DEFAULT_CODER_MODEL_NAME = env("DEFAULT_CODER_MODEL_NAME", cast=str, default="qwen2.5-coder:7b")
 DEFAULT_REASONING_ENABLE = env("DEFAULT_REASONING_ENABLE", cast=str, default="false").lower() == "true"
 
+# 모든 ChatOllama 클라이언트가 공유하는 HTTP 커넥션 풀 (Ollama 연결을 노드 간에 재사용)
+LLM_HTTP_TRANSPORT = httpx.HTTPTransport()
+LLM_ASYNC_HTTP_TRANSPORT = httpx.AsyncHTTPTransport()
+
+
+@functools.cache
 def get_default_llm(
     model=DEFAULT_MODEL_NAME,
     base_url=LLM_SERVICE_URL,
@@ -20,11 +32,14 @@ def get_default_llm(
     num_ctx=8192 * 2,
     **kwargs
 ):
-    return  ChatOllama(
+    # 동일한 설정의 LLM은 한 번만 생성하여 재사용합니다. (인자는 hashable 해야 합니다.)
+    return ChatOllama(
         model=model,
         base_url=base_url,
         reasoning=reasoning,
         num_ctx=num_ctx,
+        sync_client_kwargs={"transport": LLM_HTTP_TRANSPORT},
+        async_client_kwargs={"transport": LLM_ASYNC_HTTP_TRANSPORT},
         **kwargs
     )
 
@@ -1,8 +1,10 @@
-from typing import List, Type
+from contextvars import ContextVar
+from typing import List, Optional, Type
 
 from langchain_core.messages import BaseMessage, ToolCall
 from langchain_core.runnables import RunnableSerializable
-from langchain_core.callbacks import get_usage_metadata_callback, dispatch_custom_event
+from langchain_core.callbacks import UsageMetadataCallbackHandler, adispatch_custom_event
+from langchain_core.tracers.context import register_configure_hook
 from langgraph.types import interrupt
 from langgraph.prebuilt.interrupt import HumanInterruptConfig, HumanInterrupt, ActionRequest, HumanResponse
 
@@ -88,8 +90,21 @@ def human_in_the_loop(tool_calls: List[ToolCall],
     return list(accepted_tool_calls)
 
 
-def invoke_runnable_with_usage_callback(runnable: RunnableSerializable, state: dict):
-    with get_usage_metadata_callback() as cb:
-        response = runnable.invoke(state)
-        dispatch_custom_event("usage_metadata", cb.usage_metadata)
-        return response
+# 노드 실행마다 사용량을 집계하는 콜백. get_usage_metadata_callback()은 호출마다 새 훅을 전역 등록하므로,
+# 훅은 한 번만 등록하고 contextvar 값만 교체합니다. 노드는 각자의 asyncio task(context)에서 실행되므로
+# 동시에 실행되는 다른 노드/대화의 사용량과 섞이지 않습니다.
+_usage_metadata_callback_var: ContextVar[Optional[UsageMetadataCallbackHandler]] = ContextVar(
+    "usage_metadata_callback", default=None
+)
+register_configure_hook(_usage_metadata_callback_var, inheritable=True)
+
+
+async def ainvoke_runnable_with_usage_callback(runnable: RunnableSerializable, state: dict):
+    cb = UsageMetadataCallbackHandler()
+    token = _usage_metadata_callback_var.set(cb)
+    try:
+        response = await runnable.ainvoke(state)
+    finally:
+        _usage_metadata_callback_var.reset(token)
+    await adispatch_custom_event("usage_metadata", cb.usage_metadata)
+    return response
@@ -0,0 +1,7 @@
+import httpx
+
+from app import config
+
+
+# 에이전트 도구들이 공유하는 비동기 HTTP 클라이언트 (rag/dw 서비스 연결을 대화 간에 재사용)
+client = httpx.AsyncClient(timeout=config.SERVICE_TIMEOUT_SECONDS)
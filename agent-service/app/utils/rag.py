@@ -1,13 +1,18 @@
-import requests
-from typing import List
-from functools import cache
+from typing import Dict, List
 
 from app import config
+from app.utils.http_client import client
 
 
-@cache
-def get_collection_id_by_name(name: str) -> str:
-    response = requests.get(f"{config.RAG_SERVICE_URL}/collections")
+# 컬렉션 이름 -> uuid (functools.cache는 코루틴 결과를 캐시할 수 없으므로 직접 보관)
+_collection_ids: Dict[str, str] = {}
+
+
+async def get_collection_id_by_name(name: str) -> str:
+    if name in _collection_ids:
+        return _collection_ids[name]
+
+    response = await client.get(f"{config.RAG_SERVICE_URL}/collections")
     response.raise_for_status()
     collections = response.json()
 
@@ -16,13 +21,16 @@ def get_collection_id_by_name(name: str) -> str:
         raise ValueError(f"Not found collection named '{name}'")
     if len(filtered_collections) > 1:
         raise ValueError(f"Duplicated collection nameed '{name}'")
-    return filtered_collections[0]["uuid"]
+    _collection_ids[name] = filtered_collections[0]["uuid"]
+    return _collection_ids[name]
 
 
-def document_search(collection_id: str, query: str, limit: int = 4) -> List[dict]:
+async def document_search(collection_id: str, query: str, limit: int = 4, **search_options) -> List[dict]:
+    """search_options: rag-service 검색 옵션 (예: search_type="mmr", fetch_k, lambda)"""
     url = f"{config.RAG_SERVICE_URL}/collections/{collection_id}/documents/search"
-    payload = {"query": query, "limit": limit}
-    response = requests.post(url, json=payload)
+    payload = {"query": query, "limit": limit, **search_options}
+    response = await client.post(url, json=payload)
     response.raise_for_status()
     documents = response.json()
     return documents
+
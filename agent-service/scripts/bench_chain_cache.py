@@ -0,0 +1,138 @@
+"""Benchmark node steps: chains rebuilt per step vs. cached chains.
+
+Compares the previous path (every node step builds a new `ChatOllama`, binds
+its tools and rebuilds the prompt template, each client opening its own
+connections) with the current path (chains built once per node and reused,
+all clients sharing one HTTP connection pool).
+
+Usage:
+    uv run python -m scripts.bench_chain_cache --steps 200
+    uv run python -m scripts.bench_chain_cache --steps 50 --base-url http://localhost:11434
+
+Without `--base-url` the steps go to a stub Ollama server answering instantly,
+so the timings are per-step overhead only and the TCP connections it accepted
+are counted. With `--base-url` a real Ollama server is used.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; do not let Nagle delay the body.
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(
+            {
+                "model": "stub",
+                "created_at": "2025-01-01T00:00:00Z",
+                "message": {"role": "assistant", "content": "ok"},
+                "done": True,
+                "done_reason": "stop",
+                "prompt_eval_count": 1,
+                "eval_count": 1,
+            }
+        ).encode() + b"\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--base-url", default=None)
+    args = parser.parse_args()
+
+    base_url = args.base_url or start_stub_server()
+    # The app reads its settings at import time.
+    os.environ["LLM_SERVICE_URL"] = base_url
+
+    from langchain_ollama import ChatOllama
+
+    from app import config
+    from app.agents.data_explorer.nodes import summary
+    from app.agents.supervisor import graph as supervisor
+
+    def legacy_llm(
+        model=config.DEFAULT_MODEL_NAME,
+        base_url=config.LLM_SERVICE_URL,
+        reasoning=config.DEFAULT_REASONING_ENABLE,
+        num_ctx=8192 * 2,
+        **kwargs,
+    ):
+        return ChatOllama(
+            model=model,
+            base_url=base_url,
+            reasoning=reasoning,
+            num_ctx=num_ctx,
+            **kwargs,
+        )
+
+    # A routing step and a summary step, alternating as in a conversation.
+    factories = [supervisor.get_supervisor_chain, summary.get_runnable_chain]
+    state = {"messages": [("human", "안녕하세요")], "user_question": "안녕하세요"}
+
+    def run(build, invoke: bool) -> list[float]:
+        samples = []
+        for step in range(args.steps):
+            factory = factories[step % len(factories)]
+            start = time.perf_counter()
+            chain = build(factory)
+            if invoke:
+                chain.invoke(state)
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    def legacy_build(factory):
+        cached_llm, config.get_default_llm = config.get_default_llm, legacy_llm
+        try:
+            return factory.__wrapped__()
+        finally:
+            config.get_default_llm = cached_llm
+
+    def cached_build(factory):
+        return factory()
+
+    print(f"{args.steps} steps against {base_url}\n")
+    print(f"{'path':<28}{'median ms':>12}{'p95 ms':>10}{'connections':>14}")
+    for name, build in (("rebuilt per step", legacy_build), ("cached", cached_build)):
+        build_only = run(build, invoke=False)
+        StubOllamaHandler.connections = 0
+        samples = run(build, invoke=True)
+        connections = "-" if args.base_url else StubOllamaHandler.connections
+        for label, values in ((f"{name}: build", build_only), (f"{name}: step", samples)):
+            values = sorted(values)
+            print(
+                f"{label:<28}{statistics.median(values) * 1000:>12.3f}"
+                f"{values[int(len(values) * 0.95) - 1] * 1000:>10.3f}"
+                f"{connections if label.endswith('step') else '':>14}"
+            )
+
+
+if __name__ == "__main__":
+    main()
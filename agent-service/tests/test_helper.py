@@ -0,0 +1,56 @@
+import asyncio
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from app.utils.helper import ainvoke_runnable_with_usage_callback
+
+
+class UsageEventCollector(AsyncCallbackHandler):
+    def __init__(self):
+        self.events = []
+
+    async def on_custom_event(self, name, data, **kwargs):
+        if name == "usage_metadata":
+            self.events.append(data)
+
+
+def fake_llm(model_name: str, input_tokens: int, output_tokens: int) -> FakeMessagesListChatModel:
+    message = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        },
+        response_metadata={"model_name": model_name},
+    )
+    return FakeMessagesListChatModel(responses=[message], sleep=0.05)
+
+
+async def run_node(model_name: str, input_tokens: int, output_tokens: int) -> list:
+    llm = fake_llm(model_name, input_tokens, output_tokens)
+    collector = UsageEventCollector()
+
+    async def node(state: dict):
+        # 두 번 호출해도 이 노드의 사용량만 합산되어야 함
+        await ainvoke_runnable_with_usage_callback(llm, state["messages"])
+        return await ainvoke_runnable_with_usage_callback(llm, state["messages"])
+
+    await RunnableLambda(node).ainvoke({"messages": [("human", "hi")]}, {"callbacks": [collector]})
+    return collector.events
+
+
+def test_usage_callback_isolated_between_concurrent_nodes():
+    # LLM 없이 가짜 모델로 동시에 실행되는 두 노드의 사용량이 섞이지 않는지 확인
+    async def main():
+        return await asyncio.gather(run_node("model-a", 3, 5), run_node("model-b", 7, 11))
+
+    events_a, events_b = asyncio.run(main())
+
+    assert [event["model-a"]["total_tokens"] for event in events_a] == [8, 8]
+    assert [event["model-b"]["total_tokens"] for event in events_b] == [18, 18]
+    assert all(list(event) == ["model-a"] for event in events_a)
+    assert all(list(event) == ["model-b"] for event in events_b)
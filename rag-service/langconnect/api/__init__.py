@@ -1,4 +1,13 @@
 from langconnect.api.collections import router as collections_router
 from langconnect.api.documents import router as documents_router
+from langconnect.api.jobs import router as jobs_router
+from langconnect.api.maintenance import router as maintenance_router
+from langconnect.api.search import router as search_router
 
-__all__ = ["collections_router", "documents_router"]
+__all__ = [
+    "collections_router",
+    "documents_router",
+    "jobs_router",
+    "maintenance_router",
+    "search_router",
+]
@@ -1,15 +1,54 @@
-from typing import Annotated
+import shutil
+import tempfile
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import ValidationError
+from starlette.background import BackgroundTask
 
+from langconnect import config
+from langconnect.api.consistency import ReadYourWrites
 from langconnect.auth import AuthenticatedUser, resolve_user
-from langconnect.database.collections import CollectionsManager
-from langconnect.models import CollectionCreate, CollectionResponse, CollectionUpdate
+from langconnect.database.collections import Collection, CollectionsManager
+from langconnect.database.connection import replica_reads
+from langconnect.models import (
+    ChunkingConfig,
+    CollectionCreate,
+    CollectionReindex,
+    CollectionResponse,
+    CollectionUpdate,
+    NearDuplicateConfig,
+)
+from langconnect.services.snapshot import SnapshotError, SnapshotReader, SnapshotWriter
 
 router = APIRouter(prefix="/collections", tags=["collections"])
 
 
+# Reserved keys of collection metadata and the models validating them.
+_RESERVED_METADATA = {
+    "chunking": ChunkingConfig,
+    "near_duplicates": NearDuplicateConfig,
+}
+
+
+def _validate_metadata(metadata: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Validate and normalize reserved keys of collection metadata."""
+    for key, model in _RESERVED_METADATA.items():
+        if not metadata or metadata.get(key) is None:
+            continue
+        try:
+            value = model.model_validate(metadata[key])
+        except ValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=e.errors()
+            )
+        metadata = {**metadata, key: value.model_dump(exclude_none=True)}
+    return metadata
+
+
 @router.post(
     "",
     response_model=CollectionResponse,
@@ -21,28 +60,38 @@ async def collections_create(
 ):
     """Creates a new PGVector collection by name with optional metadata."""
     collection_info = await CollectionsManager(user.identity).create(
-        collection_data.name, collection_data.metadata
+        collection_data.name, _validate_metadata(collection_data.metadata)
     )
     if not collection_info:
         raise HTTPException(status_code=500, detail="Failed to create collection")
     return CollectionResponse(**collection_info)
 
 
-@router.get("", response_model=list[CollectionResponse])
-async def collections_list(user: Annotated[AuthenticatedUser, Depends(resolve_user)]):
+@router.get(
+    "", response_model=list[CollectionResponse], response_class=ORJSONResponse
+)
+async def collections_list(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    *,
+    read_your_writes: ReadYourWrites = False,
+):
     """Lists all available PGVector collections (name and UUID)."""
-    return [
-        CollectionResponse(**c) for c in await CollectionsManager(user.identity).list()
-    ]
+    with replica_reads(enabled=not read_your_writes):
+        collections = await CollectionsManager(user.identity).list()
+    # The payload is already shaped by the database; skip re-validation.
+    return ORJSONResponse(collections)
 
 
 @router.get("/{collection_id}", response_model=CollectionResponse)
 async def collections_get(
     user: Annotated[AuthenticatedUser, Depends(resolve_user)],
     collection_id: UUID,
+    *,
+    read_your_writes: ReadYourWrites = False,
 ):
     """Retrieves details (name and UUID) of a specific PGVector collection."""
-    collection = await CollectionsManager(user.identity).get(str(collection_id))
+    with replica_reads(enabled=not read_your_writes):
+        collection = await CollectionsManager(user.identity).get(str(collection_id))
     if not collection:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,13 +100,43 @@ async def collections_get(
     return CollectionResponse(**collection)
 
 
+@router.get("/{collection_id}/stats", response_model=dict[str, Any])
+async def collections_stats(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    collection_id: UUID,
+):
+    """Retrieves row and file counts and storage statistics of a collection.
+
+    `storage` lists, per table, its live and dead tuples, table and index
+    bytes, and the last (auto)vacuum and (auto)analyze times.
+    """
+    collection = Collection(collection_id=str(collection_id), user_id=user.identity)
+    return await collection.stats()
+
+
 @router.delete("/{collection_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def collections_delete(
     user: Annotated[AuthenticatedUser, Depends(resolve_user)],
     collection_id: UUID,
+    *,
+    background: bool = Query(default=False),
 ):
-    """Deletes a specific PGVector collection by name."""
-    await CollectionsManager(user.identity).delete(str(collection_id))
+    """Deletes a specific PGVector collection by name.
+
+    The collection disappears immediately; its chunks are deleted in batches.
+    With `background=true` that happens in a background job, which is
+    returned with status 202 and can be followed at `/jobs/{job_id}`.
+    """
+    manager = CollectionsManager(user.identity)
+    if background:
+        job = await manager.delete_in_background(str(collection_id))
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Collection '{collection_id}' not found",
+            )
+        return ORJSONResponse(job.to_dict(), status_code=status.HTTP_202_ACCEPTED)
+    await manager.delete(str(collection_id))
     return "Collection deleted successfully."
 
 
@@ -71,7 +150,7 @@ async def collections_update(
     updated_collection = await CollectionsManager(user.identity).update(
         str(collection_id),
         name=collection_data.name,
-        metadata=collection_data.metadata,
+        metadata=_validate_metadata(collection_data.metadata),
     )
 
     if not updated_collection:
@@ -81,3 +160,101 @@ async def collections_update(
         )
 
     return CollectionResponse(**updated_collection)
+
+
+@router.post("/{collection_id}/reindex", status_code=status.HTTP_202_ACCEPTED)
+async def collections_reindex(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    collection_id: UUID,
+    reindex: CollectionReindex | None = None,
+):
+    """Re-chunks and re-embeds a collection without downtime.
+
+    The collection is rebuilt from its stored chunks in a background job,
+    returned with status 202 and followed at `/jobs/{job_id}`, then swapped
+    in at once. Searches are served from the current chunks until then;
+    uploads and deletes get 409. Use it after changing the chunking or the
+    embedding model.
+    """
+    collection = Collection(collection_id=str(collection_id), user_id=user.identity)
+    job = await collection.reindex_in_background(
+        chunking=reindex.chunking if reindex else None
+    )
+    return ORJSONResponse(job.to_dict(), status_code=status.HTTP_202_ACCEPTED)
+
+
+@router.get("/{collection_id}/export", response_class=FileResponse)
+async def collections_export(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    collection_id: UUID,
+    *,
+    read_your_writes: ReadYourWrites = False,
+):
+    """Exports a collection as a snapshot archive, including its vectors.
+
+    The snapshot can be imported into another collection (or deployment)
+    without re-embedding. See `langconnect.services.snapshot` for the format.
+    """
+    with replica_reads(enabled=not read_your_writes):
+        details = await CollectionsManager(user.identity).get(str(collection_id))
+    if not details:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Collection '{collection_id}' not found",
+        )
+    metadata = {k: v for k, v in details["metadata"].items() if k != "owner_id"}
+
+    directory = tempfile.mkdtemp(prefix="langconnect-export-")
+    try:
+        writer = SnapshotWriter(directory)
+        collection = Collection(collection_id=str(collection_id), user_id=user.identity)
+        with replica_reads(enabled=not read_your_writes):
+            async for records, vectors in collection.iter_vectors():
+                writer.write(records, vectors)
+        archive = await run_in_threadpool(
+            writer.finish,
+            model=config.EMBEDDING_MODEL_NAME,
+            collection={"name": details["name"], "metadata": metadata},
+        )
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    return FileResponse(
+        archive,
+        media_type="application/x-tar",
+        filename=f"{details['name']}.snapshot.tar",
+        background=BackgroundTask(shutil.rmtree, directory, ignore_errors=True),
+    )
+
+
+@router.post("/{collection_id}/import", response_model=dict[str, Any])
+async def collections_import(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    collection_id: UUID,
+    snapshot: UploadFile = File(...),
+):
+    """Imports a snapshot archive into a collection without re-embedding."""
+    try:
+        reader = SnapshotReader(snapshot.file)
+    except SnapshotError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if reader.manifest.get("model") != config.EMBEDDING_MODEL_NAME:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Snapshot was embedded with '{reader.manifest.get('model')}', "
+                f"but this service uses '{config.EMBEDDING_MODEL_NAME}'."
+            ),
+        )
+
+    collection = Collection(collection_id=str(collection_id), user_id=user.identity)
+    try:
+        imported = await collection.bulk_load(
+            reader.iter_batches(), dimension=reader.dimension
+        )
+    except SnapshotError as e:
+        # Raised while streaming the records; the load is rolled back.
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"success": True, "imported_chunks": imported}
@@ -0,0 +1,19 @@
+"""Read consistency of read-only endpoints.
+
+Read-only endpoints read from the replica when one is configured (see
+`langconnect.database.connection.replica_reads`). A client that must see its
+own writes, e.g. a search right after an upload, sends
+`X-Read-Your-Writes: true` to read from the primary instead.
+"""
+
+from typing import Annotated
+
+from fastapi import Header
+
+ReadYourWrites = Annotated[
+    bool,
+    Header(
+        alias="X-Read-Your-Writes",
+        description="Read from the primary, so that earlier writes are visible.",
+    ),
+]
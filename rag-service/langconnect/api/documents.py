@@ -2,20 +2,45 @@ import logging
 from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.responses import ORJSONResponse
 from langchain_core.documents import Document
 from pydantic import TypeAdapter, ValidationError
 
+from langconnect.api.consistency import ReadYourWrites
 from langconnect.auth import AuthenticatedUser, resolve_user
 from langconnect.database.collections import Collection
+from langconnect.database.connection import replica_reads
+from langconnect.metrics import INGESTION_IN_FLIGHT, stage
 from langconnect.models import DocumentResponse, SearchQuery, SearchResult
-from langconnect.services import process_document
+from langconnect.services import (
+    ChunkStats,
+    EmbeddingStats,
+    NearDuplicateStats,
+    ParseCacheStats,
+    process_document,
+    resolve_chunking,
+    shape_results,
+)
+from langconnect.services.pagination import CursorError, decode_cursor, encode_cursor
 
 # Create a TypeAdapter that enforces “list of dict”
 _metadata_adapter = TypeAdapter(list[dict[str, Any]])
 
 logger = logging.getLogger(__name__)
 
+# Response header carrying the cursor of the next page of search results.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 router = APIRouter(tags=["documents"])
 
 
@@ -27,6 +52,16 @@ async def documents_create(
     metadatas_json: str | None = Form(None),
 ):
     """Processes and indexes (adds) new document files with optional metadata."""
+    with INGESTION_IN_FLIGHT.track_inprogress():
+        return await _create_documents(user, collection_id, files, metadatas_json)
+
+
+async def _create_documents(
+    user: AuthenticatedUser,
+    collection_id: UUID,
+    files: list[UploadFile],
+    metadatas_json: str | None,
+) -> dict[str, Any]:
     # If no metadata JSON is provided, fill with None
     if not metadatas_json:
         metadatas: list[dict] | list[None] = [None] * len(files)
@@ -48,6 +83,15 @@ async def documents_create(
                 ),
             )
 
+    collection = Collection(
+        collection_id=str(collection_id),
+        user_id=user.identity,
+    )
+    # Raises 404 before any parsing work if the collection is not visible.
+    chunking = resolve_chunking(await collection.get_chunking_config())
+    chunk_stats = ChunkStats(chunking)
+    parse_stats = ParseCacheStats()
+
     docs_to_index: list[Document] = []
     processed_files_count = 0
     failed_files = []
@@ -56,7 +100,13 @@ async def documents_create(
     for file, metadata in zip(files, metadatas, strict=False):
         try:
             # Pass metadata to process_document
-            langchain_docs = await process_document(file, metadata=metadata)
+            langchain_docs = await process_document(
+                file,
+                metadata=metadata,
+                chunking=chunking,
+                stats=chunk_stats,
+                parse_stats=parse_stats,
+            )
             if langchain_docs:
                 docs_to_index.extend(langchain_docs)
                 processed_files_count += 1
@@ -84,13 +134,22 @@ async def documents_create(
 
     # If some files failed but others succeeded, proceed with adding successful ones
     # but maybe inform the user about the failures.
+    logger.info(f"Chunk stats for collection {collection_id}: {chunk_stats.as_dict()}")
+    logger.info(
+        f"Parse cache for collection {collection_id}: {parse_stats.as_dict()}"
+    )
+
     try:
-        collection = Collection(
-            collection_id=str(collection_id),
-            user_id=user.identity,
+        embedding_stats = EmbeddingStats()
+        duplicate_stats = NearDuplicateStats()
+        added_ids = await collection.upsert(
+            docs_to_index,
+            stats=embedding_stats,
+            duplicate_stats=duplicate_stats,
+            token_lengths=chunk_stats.token_lengths,
         )
-        added_ids = await collection.upsert(docs_to_index)
-        if not added_ids:
+        # Every chunk may have been skipped as a near-duplicate.
+        if not added_ids and not duplicate_stats.aliases:
             # This might indicate a problem with the vector store itself
             raise HTTPException(
                 status_code=500,
@@ -106,7 +165,14 @@ async def documents_create(
             "success": True,
             "message": success_message,
             "added_chunk_ids": added_ids,
+            "chunk_stats": chunk_stats.as_dict(),
+            "embedding_stats": embedding_stats.as_dict(),
+            "near_duplicates": duplicate_stats.as_dict(),
         }
+        logger.info(
+            f"Embedding stats for collection {collection_id}: "
+            f"{response_data['embedding_stats']}"
+        )
 
         if failed_files:
             response_data["warnings"] = (
@@ -129,20 +195,27 @@ async def documents_create(
 
 
 @router.get(
-    "/collections/{collection_id}/documents", response_model=list[DocumentResponse]
+    "/collections/{collection_id}/documents",
+    response_model=list[DocumentResponse],
+    response_class=ORJSONResponse,
 )
 async def documents_list(
     user: Annotated[AuthenticatedUser, Depends(resolve_user)],
     collection_id: UUID,
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    *,
+    read_your_writes: ReadYourWrites = False,
 ):
     """Lists documents within a specific collection."""
     collection = Collection(
         collection_id=str(collection_id),
         user_id=user.identity,
     )
-    return await collection.list(limit=limit, offset=offset)
+    with replica_reads(enabled=not read_your_writes):
+        documents = await collection.list(limit=limit, offset=offset)
+    # The payload is already shaped by the database; skip re-validation.
+    return ORJSONResponse(documents)
 
 
 @router.delete(
@@ -153,14 +226,24 @@ async def documents_delete(
     user: Annotated[AuthenticatedUser, Depends(resolve_user)],
     collection_id: UUID,
     document_id: str,
+    *,
+    background: bool = Query(default=False),
 ):
-    """Deletes a specific document from a collection by its ID."""
+    """Deletes a specific document from a collection by its ID.
+
+    The document is hidden from searches and listings immediately; its chunks
+    are deleted in batches. With `background=true` that happens in a
+    background job, which is returned with status 202.
+    """
     collection = Collection(
         collection_id=str(collection_id),
         user_id=user.identity,
     )
     # TODO(Eugene): Deletion logic does not look correct.
     #  Should I be deleting by ID or file ID?
+    if background:
+        job = await collection.delete_in_background(file_id=document_id)
+        return ORJSONResponse(job.to_dict(), status_code=status.HTTP_202_ACCEPTED)
     success = await collection.delete(file_id=document_id)
     if not success:
         raise HTTPException(status_code=404, detail="Failed to delete document.")
@@ -169,12 +252,16 @@ async def documents_delete(
 
 
 @router.post(
-    "/collections/{collection_id}/documents/search", response_model=list[SearchResult]
+    "/collections/{collection_id}/documents/search",
+    response_model=list[SearchResult],
+    response_class=ORJSONResponse,
 )
 async def documents_search(
     user: Annotated[AuthenticatedUser, Depends(resolve_user)],
     collection_id: UUID,
     search_query: SearchQuery,
+    *,
+    read_your_writes: ReadYourWrites = False,
 ):
     """Search for documents within a specific collection."""
     if not search_query.query:
@@ -185,8 +272,36 @@ async def documents_search(
         user_id=user.identity,
     )
 
-    results = await collection.search(
-        search_query.query,
-        limit=search_query.limit or 10,
-    )
-    return results
+    after = None
+    if search_query.cursor:
+        try:
+            after = decode_cursor(search_query.cursor, search_query.query)
+        except CursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    with replica_reads(enabled=not read_your_writes):
+        results, position = await collection.search_page(
+            search_query.query,
+            limit=search_query.limit or 10,
+            search_type=search_query.search_type,
+            fetch_k=search_query.fetch_k,
+            lambda_mult=search_query.lambda_mult,
+            window=search_query.window,
+            after=after,
+        )
+    with stage("search", "response"):
+        if (
+            search_query.return_mode != "full"
+            or search_query.metadata_fields is not None
+        ):
+            results = shape_results(
+                results,
+                search_query.query,
+                mode=search_query.return_mode,
+                snippet_chars=search_query.snippet_chars,
+                metadata_fields=search_query.metadata_fields,
+            )
+        headers = {}
+        if position is not None:
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(position, search_query.query)
+        return ORJSONResponse(results, headers=headers)
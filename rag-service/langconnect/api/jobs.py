@@ -0,0 +1,23 @@
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from langconnect.auth import AuthenticatedUser, resolve_user
+from langconnect.services.jobs import JOBS
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=dict[str, Any])
+async def jobs_get(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    job_id: str,
+):
+    """Retrieves the status and progress of a background job."""
+    job = await JOBS.get(job_id, user.identity)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job '{job_id}' not found",
+        )
+    return job
@@ -0,0 +1,53 @@
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import ORJSONResponse
+
+from langconnect.auth import AuthenticatedUser, resolve_admin
+from langconnect.database import maintenance
+from langconnect.database.connection import get_db_connection
+from langconnect.services.jobs import JOBS
+
+router = APIRouter(prefix="/maintenance", tags=["maintenance"])
+
+
+@router.get("", response_model=dict[str, Any])
+async def maintenance_status(
+    user: Annotated[AuthenticatedUser, Depends(resolve_admin)],
+):
+    """Reports the state of the embedding tables and the actions it calls for."""
+    async with get_db_connection() as conn:
+        tables = await maintenance.embedding_tables(conn)
+        return {
+            "tables": await maintenance.table_stats(conn, tables),
+            "indexes": await maintenance.index_bloat(conn, tables),
+            "actions": await maintenance.plan(conn),
+        }
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def maintenance_run(
+    user: Annotated[AuthenticatedUser, Depends(resolve_admin)],
+    dead_tuple_ratio: float | None = Query(None, ge=0.0, le=1.0),
+    index_bloat: float | None = Query(None, ge=0.0, le=1.0),
+):
+    """Runs VACUUM (ANALYZE) and REINDEX where bloat exceeds the thresholds.
+
+    Thresholds default to the configured ones; pass 0 to maintain every table
+    and index. The actions run in a background job, returned with the plan.
+    """
+    async with get_db_connection() as conn:
+        actions = await maintenance.plan(
+            conn,
+            dead_tuple_ratio_threshold=dead_tuple_ratio,
+            index_bloat_threshold=index_bloat,
+        )
+    job = await JOBS.start(
+        "maintenance",
+        user.identity,
+        lambda running: maintenance.run(actions, job=running),
+    )
+    return ORJSONResponse(
+        {"job": job.to_dict(), "actions": actions},
+        status_code=status.HTTP_202_ACCEPTED,
+    )
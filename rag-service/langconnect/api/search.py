@@ -0,0 +1,58 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+
+from langconnect.api.consistency import ReadYourWrites
+from langconnect.auth import AuthenticatedUser, resolve_user
+from langconnect.database.collections import CollectionsManager
+from langconnect.database.connection import replica_reads
+from langconnect.metrics import stage
+from langconnect.models import FederatedSearchQuery, SearchResult
+from langconnect.services import shape_results
+
+router = APIRouter(tags=["search"])
+
+
+@router.post(
+    "/search", response_model=list[SearchResult], response_class=ORJSONResponse
+)
+async def search(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+    search_query: FederatedSearchQuery,
+    *,
+    read_your_writes: ReadYourWrites = False,
+):
+    """Searches several collections at once, merging the results by score."""
+    if not search_query.query:
+        raise HTTPException(status_code=400, detail="Search query cannot be empty")
+    if search_query.cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor pagination is not supported across collections.",
+        )
+
+    with replica_reads(enabled=not read_your_writes):
+        results = await CollectionsManager(user.identity).search(
+            [str(collection_id) for collection_id in search_query.collection_ids],
+            search_query.query,
+            limit=search_query.limit or 10,
+            quota=search_query.quota,
+            search_type=search_query.search_type,
+            fetch_k=search_query.fetch_k,
+            lambda_mult=search_query.lambda_mult,
+            window=search_query.window,
+        )
+    with stage("search", "response"):
+        if (
+            search_query.return_mode != "full"
+            or search_query.metadata_fields is not None
+        ):
+            results = shape_results(
+                results,
+                search_query.query,
+                mode=search_query.return_mode,
+                snippet_chars=search_query.snippet_chars,
+                metadata_fields=search_query.metadata_fields,
+            )
+        return ORJSONResponse(results)
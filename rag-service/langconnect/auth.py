@@ -8,6 +8,8 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from gotrue.types import User
 from starlette.authentication import BaseUser
 
+from langconnect import config
+
 
 security = HTTPBearer()
 
@@ -78,3 +80,12 @@ def get_current_user(authorization: str) -> User:
 # TODO: Resolve user by credentials
 def resolve_user() -> AuthenticatedUser | None:
     return AuthenticatedUser("system_user_id", "system_user")
+
+
+def resolve_admin(
+    user: Annotated[AuthenticatedUser, Depends(resolve_user)],
+) -> AuthenticatedUser:
+    """Resolve the user and require them to be listed in `ADMIN_USER_IDS`."""
+    if user.identity not in config.ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Admin privileges required")
+    return user
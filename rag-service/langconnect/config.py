@@ -1,27 +1,143 @@
 import json
+import tempfile
+from pathlib import Path
 
 from langchain_core.embeddings import Embeddings
 from starlette.config import Config, undefined
 
+from langconnect.embedding_client import RemoteEmbeddings
+
 env = Config()
 
 IS_TESTING = env("IS_TESTING", cast=str, default="").lower() == "true"
 
+# Observability: set METRICS_ENABLED=false to drop the /metrics endpoint and
+# turn all metric recording into no-ops.
+METRICS_ENABLED = env("METRICS_ENABLED", cast=str, default="true").lower() == "true"
 
-def get_embeddings() -> Embeddings:
+
+EMBEDDING_MODEL_NAME = env(
+    "EMBEDDING_MODEL_NAME", cast=str, default="Qwen/Qwen3-Embedding-4B"
+)
+
+
+# Unix socket of a shared embedding server (`python -m
+# langconnect.embedding_server`). When set, workers embed through it instead of
+# each loading the model.
+EMBEDDING_SERVER_SOCKET = env("EMBEDDING_SERVER_SOCKET", cast=str, default="")
+# Seconds a worker waits for the server's answer: the base timeout, plus the
+# per-text allowance for every text of the request.
+EMBEDDING_SERVER_TIMEOUT_SECONDS = env(
+    "EMBEDDING_SERVER_TIMEOUT_SECONDS", cast=float, default=60.0
+)
+EMBEDDING_SERVER_TIMEOUT_PER_TEXT_SECONDS = env(
+    "EMBEDDING_SERVER_TIMEOUT_PER_TEXT_SECONDS", cast=float, default=0.5
+)
+
+
+def load_embedding_model() -> Embeddings:
+    """Load the embedding model in this process."""
     from langchain_huggingface import HuggingFaceEmbeddings
 
     # TODO: Allow setting different embedding configurations per collection.
     return HuggingFaceEmbeddings(
-        model_name="Qwen/Qwen3-Embedding-4B",
+        model_name=EMBEDDING_MODEL_NAME,
         model_kwargs={'device': 'cpu'},
         encode_kwargs={'normalize_embeddings': True}  # compare only cosine similarity (exclude vector size)
     )
 
 
+def get_embeddings() -> Embeddings:
+    """Embed through the shared embedding server if set, else in process."""
+    if EMBEDDING_SERVER_SOCKET:
+        return RemoteEmbeddings(
+            EMBEDDING_SERVER_SOCKET,
+            timeout=EMBEDDING_SERVER_TIMEOUT_SECONDS,
+            timeout_per_text=EMBEDDING_SERVER_TIMEOUT_PER_TEXT_SECONDS,
+        )
+    return load_embedding_model()
+
+
 DEFAULT_EMBEDDINGS = get_embeddings()
 DEFAULT_COLLECTION_NAME = "default_collection"
 
+# Chunking defaults. Collections override them with a `chunking` metadata key.
+# CHUNK_STRATEGY: "recursive" or "structure"; CHUNK_UNIT: "characters" or "tokens"
+# (counted with the embedding model's tokenizer).
+CHUNK_STRATEGY = env("CHUNK_STRATEGY", cast=str, default="recursive")
+CHUNK_UNIT = env("CHUNK_UNIT", cast=str, default="characters")
+CHUNK_SIZE = env("CHUNK_SIZE", cast=int, default=1000)
+CHUNK_OVERLAP_RATIO = env("CHUNK_OVERLAP_RATIO", cast=float, default=0.2)
+
+# Disk cache of parsed uploads, keyed by file hash, mimetype and parser version.
+# Least recently used entries are evicted beyond PARSE_CACHE_MAX_BYTES (0
+# disables the cache).
+PARSE_CACHE_DIR = env(
+    "PARSE_CACHE_DIR",
+    cast=str,
+    default=str(Path(tempfile.gettempdir()) / "langconnect" / "parsed"),
+)
+PARSE_CACHE_MAX_BYTES = env("PARSE_CACHE_MAX_BYTES", cast=int, default=512 * 2**20)
+
+# Near-duplicate chunk detection at ingestion (MinHash/LSH over character
+# shingles). NEAR_DUPLICATE_MODE: "off", "flag" (store, marked with
+# `duplicate_of`) or "skip" (record as an alias only). Collections override both
+# with a `near_duplicates` metadata key.
+NEAR_DUPLICATE_MODE = env("NEAR_DUPLICATE_MODE", cast=str, default="off")
+NEAR_DUPLICATE_THRESHOLD = env("NEAR_DUPLICATE_THRESHOLD", cast=float, default=0.9)
+
+# In-memory exact search for small collections (0 disables it). Entries are
+# refreshed on writes from any worker and expire after the TTL.
+MEMORY_INDEX_MAX_ROWS = env("MEMORY_INDEX_MAX_ROWS", cast=int, default=2000)
+MEMORY_INDEX_TTL_SECONDS = env("MEMORY_INDEX_TTL_SECONDS", cast=float, default=300)
+# Concurrent query embeddings are batched: a batch is embedded once it holds
+# EMBEDDING_BATCH_MAX_SIZE queries or its first query has waited
+# EMBEDDING_BATCH_MAX_WAIT_MS.
+EMBEDDING_BATCH_MAX_SIZE = env("EMBEDDING_BATCH_MAX_SIZE", cast=int, default=32)
+EMBEDDING_BATCH_MAX_WAIT_MS = env("EMBEDDING_BATCH_MAX_WAIT_MS", cast=float, default=5)
+# Ingested chunks are embedded in batches of similar token length, padded to at
+# most INGESTION_EMBEDDING_TOKEN_BUDGET tokens and INGESTION_EMBEDDING_MAX_BATCH_SIZE
+# chunks per batch.
+INGESTION_EMBEDDING_TOKEN_BUDGET = env(
+    "INGESTION_EMBEDDING_TOKEN_BUDGET", cast=int, default=16384
+)
+INGESTION_EMBEDDING_MAX_BATCH_SIZE = env(
+    "INGESTION_EMBEDDING_MAX_BATCH_SIZE", cast=int, default=128
+)
+# Query embeddings kept for repeated queries and follow-up pages (0 disables).
+QUERY_EMBEDDING_CACHE_SIZE = env("QUERY_EMBEDDING_CACHE_SIZE", cast=int, default=1024)
+
+# Opt-in storage layout: list-partition embeddings by collection, with one
+# vector index per partition. Existing data is migrated at startup.
+EMBEDDING_PARTITIONING = (
+    env("EMBEDDING_PARTITIONING", cast=str, default="false").lower() == "true"
+)
+# Opt-in storage layout: keep vectors in a narrow table of their own, so that
+# similarity scans do not read chunk text. Not combinable with partitioning.
+EMBEDDING_VECTOR_TABLE = (
+    env("EMBEDDING_VECTOR_TABLE", cast=str, default="false").lower() == "true"
+)
+
+# Large deletes run in batches of this many chunks, each in its own transaction.
+DELETE_BATCH_SIZE = env("DELETE_BATCH_SIZE", cast=int, default=1000)
+# Reindexing re-chunks and re-embeds stored chunks this many at a time.
+REINDEX_BATCH_SIZE = env("REINDEX_BATCH_SIZE", cast=int, default=1000)
+
+# Maintenance of the embedding tables: VACUUM (ANALYZE) tables whose dead tuple
+# ratio, and REINDEX B-tree indexes whose bloat, exceeds these thresholds. Runs
+# every MAINTENANCE_INTERVAL_SECONDS (0 disables the scheduler) or on demand.
+MAINTENANCE_INTERVAL_SECONDS = env(
+    "MAINTENANCE_INTERVAL_SECONDS", cast=float, default=0
+)
+MAINTENANCE_DEAD_TUPLE_RATIO = env(
+    "MAINTENANCE_DEAD_TUPLE_RATIO", cast=float, default=0.2
+)
+MAINTENANCE_INDEX_BLOAT_RATIO = env(
+    "MAINTENANCE_INDEX_BLOAT_RATIO", cast=float, default=0.3
+)
+# Users allowed to call admin endpoints, as a JSON list of identities.
+ADMIN_USER_IDS = json.loads(env("ADMIN_USER_IDS", cast=str, default="[]"))
+
 
 # Database configuration
 POSTGRES_HOST = env("POSTGRES_HOST", cast=str, default="localhost")
@@ -29,6 +145,10 @@ POSTGRES_PORT = env("POSTGRES_PORT", cast=int, default="5432")
 POSTGRES_USER = env("POSTGRES_USER", cast=str, default="langchain")
 POSTGRES_PASSWORD = env("POSTGRES_PASSWORD", cast=str, default="langchain")
 POSTGRES_DB = env("POSTGRES_DB", cast=str, default="langchain_test")
+# Optional streaming replica serving searches, listings and exports; it uses the
+# primary's user, password and database. Empty keeps every query on the primary.
+POSTGRES_REPLICA_HOST = env("POSTGRES_REPLICA_HOST", cast=str, default="")
+POSTGRES_REPLICA_PORT = env("POSTGRES_REPLICA_PORT", cast=int, default=POSTGRES_PORT)
 
 # Read allowed origins from environment variable
 ALLOW_ORIGINS_JSON = env("ALLOW_ORIGINS", cast=str, default="")
@@ -8,20 +8,411 @@ The current implementations are based on langchain-postgres PGVector class.
 Replace with your own implementation or favorite vectorstore if needed.
 """
 
+import asyncio
 import builtins
-import json
 import logging
 import uuid
-from typing import Any, NotRequired, Optional, TypedDict
+from collections.abc import AsyncIterator, Iterable, Mapping
+from functools import partial
+from typing import Any, Literal, NotRequired, Optional, TypedDict
 
+import asyncpg
+import numpy as np
+import orjson
 from fastapi import status
 from fastapi.exceptions import HTTPException
 from langchain_core.documents import Document
 
+from langconnect import config
+from langconnect.database import (
+    maintenance,
+    memory_index,
+    near_duplicates,
+    partitioning,
+    reindex,
+    tombstones,
+    vector_table,
+)
 from langconnect.database.connection import get_db_connection, get_vectorstore
+from langconnect.database.memory_index import MEMORY_INDEX
+from langconnect.database.ranking import maximal_marginal_relevance
+from langconnect.metrics import record_cache, stage
+from langconnect.models import ChunkingConfig, NearDuplicateConfig
+from langconnect.services import minhash
+from langconnect.services.chunking import (
+    ChunkStats,
+    merge_chunks,
+    resolve_chunking,
+    source_documents,
+)
+from langconnect.services.document_processor import split_documents
+from langconnect.services.embedding_buckets import EmbeddingStats, embed_by_length
+from langconnect.services.jobs import JOBS, Job
+from langconnect.services.minhash import NearDuplicateStats, resolve_near_duplicates
+from langconnect.services.pagination import SearchPosition
+from langconnect.services.query_embeddings import QUERY_EMBEDDINGS
 
 logger = logging.getLogger(__name__)
 
+# Candidates re-ranked by MMR when the caller does not set `fetch_k`.
+DEFAULT_MMR_FETCH_K = 20
+# Metadata key of flagged near-duplicate chunks, holding the canonical chunk id.
+DUPLICATE_OF_KEY = "duplicate_of"
+
+
+def _apply_window(
+    result: dict[str, Any], chunks: builtins.list[tuple[int, str, int | None]]
+) -> None:
+    """Replace a hit's content with the passage merged from its neighbours."""
+    if not chunks:
+        return
+    result["page_content"] = merge_chunks(
+        [(text, start) for _, text, start in chunks]
+    )
+    result["metadata"]["window"] = [chunks[0][0], chunks[-1][0]]
+
+
+async def _purge_collection(collection_id: str, job: Job | None = None) -> None:
+    """Delete a tombstoned collection: its chunks in batches, then the row."""
+    async with get_db_connection() as conn:
+        partitioned = await partitioning.is_partitioned(conn)
+        if partitioned:
+            # Dropping the partition is much cheaper than deleting its rows.
+            await partitioning.drop_partition(conn, collection_id)
+    if not partitioned:
+        await tombstones.delete_chunks(collection_id, job=job)
+    async with get_db_connection() as conn, conn.transaction():
+        await conn.execute(
+            "DELETE FROM langchain_pg_collection WHERE uuid = $1", collection_id
+        )
+        await tombstones.remove(conn, collection_id)
+        await near_duplicates.remove_collection(conn, collection_id)
+        await memory_index.remove_generation(conn, collection_id)
+    MEMORY_INDEX.invalidate(collection_id)
+
+
+async def _purge_file(collection_id: str, file_id: str, job: Job | None = None) -> int:
+    """Delete the chunks of a tombstoned file in batches, then the tombstone.
+
+    Near-duplicates of other files that were aliases of the file's chunks are
+    stored again in their place.
+    """
+    deleted = await tombstones.delete_chunks(collection_id, file_id, job=job)
+    async with get_db_connection() as conn, conn.transaction():
+        orphans = await near_duplicates.remove_file(conn, collection_id, file_id)
+        metadata = await conn.fetchval(
+            "SELECT cmetadata FROM langchain_pg_collection WHERE uuid = $1",
+            collection_id,
+        )
+        await tombstones.remove(conn, collection_id, file_id)
+    if orphans:
+        restored = [
+            Document(
+                id=row["alias_id"],
+                page_content=row["document"],
+                metadata={
+                    key: value
+                    for key, value in row["cmetadata"].items()
+                    if key != DUPLICATE_OF_KEY
+                },
+            )
+            for row in orphans
+        ]
+        await _store_chunks(
+            collection_id,
+            restored,
+            resolve_near_duplicates((metadata or {}).get("near_duplicates")),
+        )
+        logger.info(
+            f"Restored {len(restored)} near-duplicate chunks whose canonical "
+            f"chunk was deleted with file {file_id!r}."
+        )
+    MEMORY_INDEX.invalidate(collection_id)
+    return deleted
+
+
+def _bulk_signatures(
+    ids: list[str], records: list[dict[str, Any]]
+) -> list[tuple[str, str | None, np.ndarray]]:
+    """`(chunk id, file id, signature)` of bulk-loaded chunks to be indexed."""
+    entries = []
+    for id_, record in zip(ids, records, strict=True):
+        metadata = record.get("metadata") or {}
+        if DUPLICATE_OF_KEY in metadata:
+            continue
+        sig = minhash.signature(record["document"])
+        if sig is not None:
+            entries.append((id_, metadata.get("file_id"), sig))
+    return entries
+
+
+async def _detect_near_duplicates(
+    collection_id: str,
+    documents: list[Document],
+    ids: list[str],
+    threshold: float,
+) -> tuple[list[tuple[str, str, float]], list[tuple[str, str | None, np.ndarray]]]:
+    """Match chunks against the collection's LSH index and each other.
+
+    Returns:
+        `(alias id, canonical id, similarity)` of the near-duplicates, and
+        `(chunk id, file id, signature)` of the other chunks, to be indexed.
+    """
+    signatures = await asyncio.to_thread(
+        lambda: [minhash.signature(doc.page_content) for doc in documents]
+    )
+    keys = [minhash.band_keys(sig) if sig is not None else [] for sig in signatures]
+    async with get_db_connection() as conn:
+        deleted_files = await tombstones.deleted_files(conn, collection_id)
+        index = await near_duplicates.candidates(
+            conn,
+            collection_id,
+            sorted({key for chunk_keys in keys for key in chunk_keys}),
+            deleted_files,
+        )
+    aliases = []
+    canonical = []
+    for doc, id_, sig, chunk_keys in zip(documents, ids, signatures, keys, strict=True):
+        if sig is None:
+            continue
+        match = index.best_match(sig, threshold, keys=chunk_keys)
+        if match is not None:
+            aliases.append((id_, *match))
+        else:
+            # Later chunks of the same request are matched against this one.
+            index.add(id_, sig, chunk_keys)
+            canonical.append((id_, doc.metadata.get("file_id"), sig))
+    return aliases, canonical
+
+
+async def _store_chunks(
+    collection_id: str,
+    documents: list[Document],
+    near_duplicate_config: NearDuplicateConfig,
+    *,
+    stats: EmbeddingStats | None = None,
+    duplicate_stats: NearDuplicateStats | None = None,
+    token_lengths: Mapping[str, int] | None = None,
+    guard: bool = False,
+) -> list[str]:
+    """Embed and store chunks in a collection, handling near-duplicates.
+
+    With near-duplicate detection on, chunks whose estimated similarity to a
+    stored chunk (or an earlier chunk of the same call) reaches the threshold
+    are recorded as aliases of it. In `flag` mode they are stored too, with
+    the canonical chunk id under `duplicate_of` in their metadata; in `skip`
+    mode they are neither embedded nor stored. With `guard`, the write is
+    rejected while the collection is being reindexed (see `reindex.guard`).
+    `token_lengths` are token counts of chunk texts known from chunking.
+    """
+    ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+    mode = near_duplicate_config.mode
+    aliases: builtins.list[tuple[str, str, float]] = []
+    canonical: builtins.list[tuple[str, str | None, np.ndarray]] = []
+    if mode != "off":
+        with stage("upsert", "near_duplicates"):
+            aliases, canonical = await _detect_near_duplicates(
+                collection_id, documents, ids, near_duplicate_config.threshold
+            )
+        if duplicate_stats is not None:
+            duplicate_stats.mode = mode
+            duplicate_stats.checked += len(documents)
+            duplicate_stats.aliases.extend(aliases)
+    by_id = dict(zip(ids, documents, strict=True))
+    alias_rows = [
+        (
+            alias_id,
+            canonical_id,
+            score,
+            by_id[alias_id].page_content,
+            by_id[alias_id].metadata,
+        )
+        for alias_id, canonical_id, score in aliases
+    ]
+    if mode == "skip":
+        skipped = {alias_id for alias_id, _, _ in aliases}
+        ids = [id_ for id_ in ids if id_ not in skipped]
+        documents = [by_id[id_] for id_ in ids]
+    elif mode == "flag":
+        for alias_id, canonical_id, _ in aliases:
+            by_id[alias_id].metadata[DUPLICATE_OF_KEY] = canonical_id
+    texts = [doc.page_content for doc in documents]
+    with stage("upsert", "embed"):
+        embeddings = await asyncio.to_thread(
+            embed_by_length,
+            texts,
+            config.DEFAULT_EMBEDDINGS.embed_documents,
+            known_lengths=token_lengths,
+            stats=stats,
+        )
+    with stage("upsert", "sql"):
+        async with get_db_connection() as conn, conn.transaction():
+            if guard:
+                await reindex.guard(conn, collection_id)
+            partitioned = await partitioning.is_partitioned(conn)
+            split = await vector_table.is_split(conn)
+            await conn.executemany(
+                partitioning.upsert_sql(partitioned=partitioned),
+                [
+                    (
+                        id_,
+                        collection_id,
+                        None if split else embedding,
+                        text,
+                        doc.metadata,
+                    )
+                    for id_, embedding, text, doc in zip(
+                        ids, embeddings, texts, documents, strict=True
+                    )
+                ],
+            )
+            if split:
+                await conn.executemany(
+                    vector_table.UPSERT_VECTOR_SQL,
+                    [
+                        (id_, collection_id, embedding)
+                        for id_, embedding in zip(ids, embeddings, strict=True)
+                    ],
+                )
+            if partitioned and embeddings:
+                await partitioning.ensure_vector_index(
+                    conn, collection_id, len(embeddings[0])
+                )
+            await near_duplicates.add_signatures(conn, collection_id, canonical)
+            await near_duplicates.add_aliases(conn, collection_id, alias_rows)
+            await memory_index.bump_generation(conn, collection_id)
+    MEMORY_INDEX.invalidate(collection_id)
+    return ids
+
+
+def _file_batches(files: list[Any], batch_size: int) -> Iterable[builtins.list[Any]]:
+    """Group `(file_id, chunks)` rows into batches of about `batch_size` chunks.
+
+    Files are never divided, so a batch holding a single large file may be
+    bigger.
+    """
+    batch: builtins.list[Any] = []
+    size = 0
+    for row in files:
+        if batch and size + row["chunks"] > batch_size:
+            yield batch
+            batch, size = [], 0
+        batch.append(row)
+        size += row["chunks"]
+    if batch:
+        yield batch
+
+
+def _rechunk(
+    rows: list[Any], chunking: ChunkingConfig, stats: ChunkStats
+) -> list[Document]:
+    """Rebuild files from their stored chunks and split them again."""
+    by_file: dict[str, builtins.list[Document]] = {}
+    for row in rows:
+        metadata = {
+            key: value
+            for key, value in row["cmetadata"].items()
+            if key != DUPLICATE_OF_KEY
+        }
+        by_file.setdefault(metadata["file_id"], []).append(
+            Document(page_content=row["document"], metadata=metadata)
+        )
+    documents = []
+    for file_id, chunks in by_file.items():
+        chunks.sort(key=lambda chunk: chunk.metadata["ordinal"])
+        documents.extend(
+            split_documents(
+                source_documents(chunks), file_id, chunking=chunking, stats=stats
+            )
+        )
+    return documents
+
+
+async def _reindex_collection(
+    collection_id: str,
+    shadow_id: str,
+    owner_id: str,
+    chunking: ChunkingConfig | None,
+    job: Job,
+) -> None:
+    """Rebuild a collection into its shadow collection, then swap them.
+
+    Files are rebuilt from their stored chunks, re-chunked with `chunking`
+    (by default, the collection's current config) and re-embedded with the
+    current embedding model, `REINDEX_BATCH_SIZE` stored chunks at a time.
+    The job counts stored chunks; its details hold the phase and the
+    chunking and embedding statistics. The shadow collection is deleted in
+    the end, whether the swap happened or not. The job fails before building
+    anything if chunks lack the position metadata needed to rebuild files.
+    """
+    try:
+        async with get_db_connection() as conn:
+            metadata = await conn.fetchval(
+                "SELECT cmetadata FROM langchain_pg_collection WHERE uuid = $1",
+                collection_id,
+            )
+            deleted = await tombstones.deleted_files(conn, collection_id)
+            files = await reindex.source_files(conn, collection_id, deleted)
+        if any(row["file_id"] is None for row in files):
+            raise RuntimeError("Chunks without a file_id cannot be rebuilt.")
+        # Without offsets, overlapping chunks cannot be merged back in order.
+        legacy = [row["file_id"] for row in files if row["unpositioned"]]
+        if legacy:
+            raise RuntimeError(
+                f"{len(legacy)} files have chunks without position metadata "
+                "(ordinal, start_index) and cannot be rebuilt; upload them "
+                f"again: {', '.join(legacy[:10])}."
+            )
+        metadata = metadata or {}
+        target = chunking or ChunkingConfig.model_validate(
+            metadata.get("chunking") or {}
+        )
+        chunk_stats = ChunkStats(chunking=resolve_chunking(target))
+        embedding_stats = EmbeddingStats()
+        job.total = sum(row["chunks"] for row in files)
+        job.details.update(
+            phase="building", shadow_collection_id=shadow_id, files=len(files)
+        )
+        for batch in _file_batches(files, config.REINDEX_BATCH_SIZE):
+            async with get_db_connection() as conn:
+                rows = await reindex.source_chunks(
+                    conn, collection_id, [row["file_id"] for row in batch]
+                )
+            documents = await asyncio.to_thread(_rechunk, rows, target, chunk_stats)
+            await _store_chunks(
+                shadow_id,
+                documents,
+                resolve_near_duplicates(metadata.get("near_duplicates")),
+                stats=embedding_stats,
+                token_lengths=chunk_stats.token_lengths,
+            )
+            # Only the current batch's counts are needed.
+            chunk_stats.token_lengths.clear()
+            job.advance(sum(row["chunks"] for row in batch))
+            job.details.update(
+                chunks=chunk_stats.chunks, embedding=embedding_stats.as_dict()
+            )
+
+        job.details["phase"] = "swapping"
+        patch: dict[str, Any] = {}
+        if chunking is not None:
+            patch["chunking"] = chunking.model_dump(exclude_none=True)
+        async with get_db_connection() as conn:
+            swapped = await reindex.swap(
+                conn, collection_id, shadow_id, owner_id, patch
+            )
+        MEMORY_INDEX.invalidate(collection_id)
+        if not swapped:
+            raise RuntimeError("The collection was deleted during the reindex.")
+        job.details.update(phase="done", chunking=chunk_stats.as_dict())
+        logger.info(
+            f"Reindexed collection {collection_id}: {job.total} chunks rebuilt "
+            f"into {chunk_stats.chunks} in {embedding_stats.seconds:.1f}s of "
+            "embedding."
+        )
+    finally:
+        await _purge_collection(shadow_id)
+
 
 class CollectionDetails(TypedDict):
     """TypedDict for collection details."""
@@ -33,6 +424,23 @@ class CollectionDetails(TypedDict):
     table_id: NotRequired[str]
 
 
+async def _claimed_purge(
+    collection_id: str, file_id: str, job: Job | None = None
+) -> None:
+    """Run or resume a delete, unless another worker has claimed it."""
+    async with tombstones.claim(collection_id, file_id) as claimed:
+        if not claimed:
+            logger.info(
+                f"Delete of {file_id or 'collection'!r} in collection "
+                f"{collection_id} is run elsewhere or already done."
+            )
+            return
+        if file_id == tombstones.WHOLE_COLLECTION:
+            await _purge_collection(collection_id, job)
+        else:
+            await _purge_file(collection_id, file_id, job)
+
+
 class CollectionsManager:
     """Use to create, delete, update, and list document collections."""
 
@@ -48,36 +456,61 @@ class CollectionsManager:
         """
         logger.info("Starting database initialization...")
         get_vectorstore()
+        async with get_db_connection() as conn:
+            await partitioning.setup(conn)
+            await vector_table.setup(conn)
+            await maintenance.setup(conn)
+            # Sequence index used to fetch neighbouring chunks of search hits
+            # (and by deletes and listings keyed on file_id).
+            await conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS ix_embedding_file_ordinal
+                    ON langchain_pg_embedding
+                       (collection_id, (cmetadata->>'file_id'), (cmetadata->'ordinal'))
+                """
+            )
+            pending = await tombstones.pending(conn)
+        # Resume deletes interrupted by a restart.
+        for row in pending:
+            await JOBS.start(
+                "delete_collection"
+                if row["file_id"] == tombstones.WHOLE_COLLECTION
+                else "delete_file",
+                row["owner_id"],
+                partial(_claimed_purge, row["collection_id"], row["file_id"]),
+            )
+        if pending:
+            logger.info(f"Resumed {len(pending)} pending deletes.")
         logger.info("Database initialization complete.")
 
     async def list(
         self,
     ) -> list[CollectionDetails]:
-        """List all collections owned by the given user, ordered by logical name."""
+        """List all collections owned by the given user, ordered by logical name.
+
+        The response payload is assembled by Postgres with `json_agg`, so no
+        per-row work happens in Python.
+        """
         async with get_db_connection() as conn:
-            records = await conn.fetch(
+            return await conn.fetchval(
                 """
-                SELECT uuid, cmetadata
-                FROM langchain_pg_collection
-                WHERE cmetadata->>'owner_id' = $1
-                ORDER BY cmetadata->>'name';
+                SELECT COALESCE(
+                         json_agg(
+                           json_build_object(
+                             'uuid', uuid::text,
+                             'name', COALESCE(cmetadata->>'name', 'Unnamed'),
+                             'metadata', cmetadata::jsonb - 'name'
+                           )
+                           ORDER BY cmetadata->>'name'
+                         ),
+                         '[]'::json
+                       )
+                  FROM langchain_pg_collection
+                 WHERE cmetadata->>'owner_id' = $1;
                 """,
                 self.user_id,
             )
 
-        result: list[CollectionDetails] = []
-        for r in records:
-            metadata = json.loads(r["cmetadata"])
-            name = metadata.pop("name", "Unnamed")
-            result.append(
-                {
-                    "uuid": str(r["uuid"]),
-                    "name": name,
-                    "metadata": metadata,
-                }
-            )
-        return result
-
     async def get(
         self,
         collection_id: str,
@@ -98,7 +531,7 @@ class CollectionsManager:
         if not rec:
             return None
 
-        metadata = json.loads(rec["cmetadata"])
+        metadata = rec["cmetadata"]
         name = metadata.pop("name", "Unnamed")
         return {
             "uuid": str(rec["uuid"]),
@@ -107,6 +540,109 @@ class CollectionsManager:
             "table_id": rec["name"],
         }
 
+    async def get_many(
+        self, collection_ids: Iterable[str]
+    ) -> dict[str, CollectionDetails]:
+        """Fetch several collections in one query, keyed by UUID.
+
+        Collections that do not exist or are not owned by the user are left
+        out.
+        """
+        async with get_db_connection() as conn:
+            records = await conn.fetch(
+                """
+                SELECT uuid, name, cmetadata
+                  FROM langchain_pg_collection
+                 WHERE uuid = ANY($1::uuid[])
+                   AND cmetadata->>'owner_id' = $2;
+                """,
+                builtins.list(collection_ids),
+                self.user_id,
+            )
+        details = {}
+        for rec in records:
+            metadata = rec["cmetadata"]
+            name = metadata.pop("name", "Unnamed")
+            details[str(rec["uuid"])] = {
+                "uuid": str(rec["uuid"]),
+                "name": name,
+                "metadata": metadata,
+                "table_id": rec["name"],
+            }
+        return details
+
+    async def search(
+        self,
+        collection_ids: builtins.list[str],
+        query: str,
+        *,
+        limit: int = 10,
+        quota: int | None = None,
+        search_type: Literal["similarity", "mmr"] = "similarity",
+        fetch_k: int | None = None,
+        lambda_mult: float = 0.5,
+        window: int = 0,
+    ) -> builtins.list[dict[str, Any]]:
+        """Search several collections at once and merge the results by score.
+
+        Ownership of all collections is verified in one query, the query is
+        embedded once, and the collections are searched concurrently, each on
+        its own pooled connection. Scores are cosine similarities in every
+        collection, so they are comparable across collections.
+
+        Args:
+            collection_ids: Collections to search.
+            query: The search query.
+            limit: Number of results overall.
+            quota: Results per collection at most (default: `limit`).
+            search_type: "similarity" or "mmr", applied per collection.
+            fetch_k: Candidates considered by MMR in each collection.
+            lambda_mult: MMR trade-off; 1.0 is pure relevance.
+            window: Neighbouring chunks merged into each hit, on each side.
+
+        Returns:
+            The best `limit` results, ordered by score then id, each with the
+            `collection_id` it came from.
+
+        Raises:
+            HTTPException: 404 if a collection does not exist or is not owned
+                by the user.
+        """
+        collection_ids = builtins.list(dict.fromkeys(collection_ids))
+        with stage("search", "ownership"):
+            details = await self.get_many(collection_ids)
+        missing = [id_ for id_ in collection_ids if id_ not in details]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Collections not found: {', '.join(missing)}",
+            )
+        with stage("search", "embed"):
+            # Warms the query embedding cache for the per-collection searches.
+            await QUERY_EMBEDDINGS.embed(query)
+        per_collection = min(quota or limit, limit)
+
+        async def search_one(collection_id: str) -> builtins.list[dict[str, Any]]:
+            collection = Collection(
+                collection_id, self.user_id, details=details[collection_id]
+            )
+            results = await collection.search(
+                query,
+                limit=per_collection,
+                search_type=search_type,
+                fetch_k=fetch_k,
+                lambda_mult=lambda_mult,
+                window=window,
+            )
+            for result in results:
+                result["collection_id"] = collection_id
+            return results
+
+        pages = await asyncio.gather(*map(search_one, collection_ids))
+        merged = [result for page in pages for result in page]
+        merged.sort(key=lambda result: (-result["score"], result["id"]))
+        return merged[:limit]
+
     async def create(
         self,
         collection_name: str,
@@ -144,9 +680,11 @@ class CollectionsManager:
                 table_id,
                 self.user_id,
             )
+            if rec and await partitioning.is_partitioned(conn):
+                await partitioning.create_partition(conn, str(rec["uuid"]))
         if not rec:
             return None
-        metadata = json.loads(rec["cmetadata"])
+        metadata = rec["cmetadata"]
         name = metadata.pop("name")
         return {"uuid": str(rec["uuid"]), "name": name, "metadata": metadata}
 
@@ -191,8 +729,6 @@ class CollectionsManager:
                     )
                 merged["name"] = existing["name"]
 
-            metadata_json = json.dumps(merged)
-
             async with get_db_connection() as conn:
                 rec = await conn.fetchrow(
                     """
@@ -202,7 +738,7 @@ class CollectionsManager:
                        AND cmetadata->>'owner_id' = $3
                     RETURNING uuid, cmetadata;
                     """,
-                    metadata_json,
+                    merged,
                     collection_id,
                     self.user_id,
                 )
@@ -234,7 +770,7 @@ class CollectionsManager:
                 detail=f"Collection '{collection_id}' not found or not owned by you.",
             )
 
-        full_meta = json.loads(rec["cmetadata"])
+        full_meta = rec["cmetadata"]
         friendly_name = full_meta.pop("name", "Unnamed")
 
         return {
@@ -243,25 +779,63 @@ class CollectionsManager:
             "metadata": full_meta,
         }
 
-    async def delete(
-        self,
-        collection_id: str,
-    ) -> int:
-        """Delete a collection by UUID.
-        Returns number of rows deleted (1).
-        Raises 404 if no such collection.
+    async def _tombstone(self, collection_id: str) -> bool:
+        """Hide a collection the user owns and mark it for deletion.
+
+        The owner is moved from the collection metadata to the tombstone, so
+        every ownership check stops matching the collection at once.
+
+        Returns:
+            Whether the collection existed and was owned by the user.
         """
-        async with get_db_connection() as conn:
-            result = await conn.execute(
+        async with get_db_connection() as conn, conn.transaction():
+            owned = await conn.fetchval(
                 """
-                DELETE FROM langchain_pg_collection
+                UPDATE langchain_pg_collection
+                   SET cmetadata = cmetadata::jsonb - 'owner_id'
                  WHERE uuid = $1
-                   AND cmetadata->>'owner_id' = $2;
+                   AND cmetadata->>'owner_id' = $2
+                RETURNING uuid;
                 """,
                 collection_id,
                 self.user_id,
             )
-        return int(result.split()[-1])
+            if owned is None:
+                return False
+            await tombstones.add(conn, collection_id, self.user_id)
+        MEMORY_INDEX.invalidate(collection_id)
+        return True
+
+    async def delete(
+        self,
+        collection_id: str,
+    ) -> int:
+        """Delete a collection by UUID.
+
+        Chunks are deleted in batches rather than by cascade, so concurrent
+        writes are not blocked for the whole delete.
+
+        Returns number of collections deleted (0 if there is no such
+        collection owned by the user, otherwise 1).
+        """
+        if not await self._tombstone(collection_id):
+            return 0
+        await _claimed_purge(collection_id, tombstones.WHOLE_COLLECTION)
+        return 1
+
+    async def delete_in_background(self, collection_id: str) -> Job | None:
+        """Hide a collection at once and delete its contents in a background job.
+
+        Returns:
+            The job, or None if there is no such collection owned by the user.
+        """
+        if not await self._tombstone(collection_id):
+            return None
+        return await JOBS.start(
+            "delete_collection",
+            self.user_id,
+            partial(_claimed_purge, collection_id, tombstones.WHOLE_COLLECTION),
+        )
 
 
 class Collection:
@@ -270,63 +844,137 @@ class Collection:
     Use to add, delete, list, and search documents to a given collection.
     """
 
-    def __init__(self, collection_id: str, user_id: str) -> None:
-        """Initialize the collection by collection ID."""
+    def __init__(
+        self,
+        collection_id: str,
+        user_id: str,
+        *,
+        details: CollectionDetails | None = None,
+    ) -> None:
+        """Initialize the collection by collection ID.
+
+        `details`, if already fetched for this user, spare the lookup.
+        """
         self.collection_id = collection_id
         self.user_id = user_id
+        self._details = details
 
-    async def _get_details_or_raise(self) -> dict[str, Any]:
-        """Get collection details if it exists, otherwise raise an error."""
-        details = await CollectionsManager(self.user_id).get(self.collection_id)
-        if not details:
-            raise HTTPException(status_code=404, detail="Collection not found")
-        return details
+    async def _get_details_or_raise(self) -> CollectionDetails:
+        """Get collection details if it exists, otherwise raise an error.
+
+        Details are cached on the instance, which lives for a single request.
+        """
+        if self._details is None:
+            details = await CollectionsManager(self.user_id).get(self.collection_id)
+            if not details:
+                raise HTTPException(status_code=404, detail="Collection not found")
+            self._details = details
+        return self._details
 
-    async def upsert(self, documents: list[Document]) -> list[str]:
-        """Add one or more documents to the collection."""
+    async def get_chunking_config(self) -> ChunkingConfig:
+        """Return the chunking config stored in the collection metadata."""
         details = await self._get_details_or_raise()
-        store = get_vectorstore(collection_name=details["table_id"])
-        added_ids = store.add_documents(documents)
-        return added_ids
+        return ChunkingConfig.model_validate(details["metadata"].get("chunking") or {})
 
-    async def delete(
+    async def upsert(
         self,
+        documents: list[Document],
         *,
-        file_id: Optional[str] = None,
-    ) -> bool:
-        """Delete embeddings by file id.
+        stats: EmbeddingStats | None = None,
+        duplicate_stats: NearDuplicateStats | None = None,
+        token_lengths: Mapping[str, int] | None = None,
+    ) -> list[str]:
+        """Add one or more documents to the collection.
 
-        A file id identifies the original file from which the chunks were generated.
+        Documents with an id replace the stored chunk with the same id;
+        the others are assigned a new UUID. Chunks are embedded in batches of
+        similar length on a worker thread; `stats` accumulates the batching
+        statistics if given, and `token_lengths` (token counts by text, from
+        chunking) spares tokenizing the chunks again. Near-duplicates of
+        stored chunks are flagged or skipped as configured by the collection's
+        `near_duplicates` metadata (see `_store_chunks`).
+
+        Returns:
+            Ids of the stored chunks (skipped near-duplicates excluded).
+        """
+        with stage("upsert", "ownership"):
+            details = await self._get_details_or_raise()
+        return await _store_chunks(
+            self.collection_id,
+            documents,
+            resolve_near_duplicates(details["metadata"].get("near_duplicates")),
+            stats=stats,
+            duplicate_stats=duplicate_stats,
+            token_lengths=token_lengths,
+            guard=True,
+        )
+
+    async def reindex_in_background(
+        self, *, chunking: ChunkingConfig | None = None
+    ) -> Job:
+        """Rebuild the collection in a background job, then swap it in at once.
+
+        Stored chunks are merged back into their files (nothing is uploaded
+        again), re-chunked with `chunking` (saved to the metadata on success)
+        or the current config, and re-embedded with the current model into a
+        hidden shadow collection. Searches are served from the current chunks
+        until the swap; writes are rejected meanwhile. See
+        `langconnect.database.reindex`.
+
+        Raises:
+            HTTPException: 404 if the collection does not exist or is not
+                owned by the user, 409 if it is already being reindexed.
         """
         async with get_db_connection() as conn:
-            delete_sql = """
-                DELETE FROM langchain_pg_embedding AS lpe
-                USING langchain_pg_collection AS lpc
-                WHERE lpe.collection_id   = lpc.uuid
-                  AND lpc.uuid             = $1
-                  AND lpc.cmetadata->>'owner_id' = $2
-                  AND lpe.cmetadata->>'file_id'   = $3
-            """
-            # Params: collection UUID, user ID, file ID
-            result = await conn.execute(
-                delete_sql,
+            shadow_id = await reindex.create_shadow(
+                conn, self.collection_id, self.user_id
+            )
+        if shadow_id is None:
+            raise HTTPException(status_code=404, detail="Collection not found")
+        return await JOBS.start(
+            "reindex",
+            self.user_id,
+            partial(
+                _reindex_collection,
                 self.collection_id,
+                shadow_id,
                 self.user_id,
-                file_id,
-            )
-            # result is like "DELETE 3"
-            deleted_count = int(result.split()[-1])
-            logger.info(f"Deleted {deleted_count} embeddings for file {file_id!r}.")
+                chunking,
+            ),
+        )
 
-            # For now if deleted count is 0, let's verify that the collection exists.
-            if deleted_count == 0:
-                await self._get_details_or_raise()
+    async def _tombstone(self, file_id: str) -> None:
+        """Hide a file from searches and listings and mark it for deletion."""
+        await self._get_details_or_raise()
+        async with get_db_connection() as conn, conn.transaction():
+            await reindex.guard(conn, self.collection_id)
+            await tombstones.add(conn, self.collection_id, self.user_id, file_id)
+            await memory_index.bump_generation(conn, self.collection_id)
+        MEMORY_INDEX.invalidate(self.collection_id)
+
+    async def delete(self, *, file_id: str) -> bool:
+        """Delete embeddings by file id, in batches.
+
+        A file id identifies the original file from which the chunks were generated.
+        """
+        await self._tombstone(file_id)
+        await _claimed_purge(self.collection_id, file_id)
         return True
 
+    async def delete_in_background(self, *, file_id: str) -> Job:
+        """Hide a file at once and delete its chunks in a background job."""
+        await self._tombstone(file_id)
+        return await JOBS.start(
+            "delete_file",
+            self.user_id,
+            partial(_claimed_purge, self.collection_id, file_id),
+        )
+
     async def list(self, *, limit: int = 10, offset: int = 0) -> list[dict[str, Any]]:
         """List one representative chunk per file (unique file_id) in this collection."""
         async with get_db_connection() as conn:
-            rows = await conn.fetch(
+            deleted = await tombstones.deleted_files(conn, self.collection_id)
+            docs = await conn.fetchval(
                 """
                 WITH UniqueFileChunks AS (
                   SELECT DISTINCT ON (lpe.cmetadata->>'file_id')
@@ -338,34 +986,42 @@ class Collection:
                    WHERE lpc.uuid = $1
                      AND lpc.cmetadata->>'owner_id' = $2
                      AND lpe.cmetadata->>'file_id' IS NOT NULL
+                     AND lpe.cmetadata->>'file_id' <> ALL($5::text[])
                    ORDER BY lpe.cmetadata->>'file_id', lpe.id
                 )
-                SELECT emb.id,
-                       emb.document,
-                       emb.cmetadata
-                FROM langchain_pg_embedding AS emb
-                JOIN UniqueFileChunks AS ufc
-                  ON emb.id = ufc.id
-                ORDER BY ufc.file_id
-                LIMIT  $3
-                OFFSET $4
+                , Page AS (
+                  SELECT emb.id,
+                         emb.collection_id,
+                         emb.document,
+                         emb.cmetadata,
+                         ufc.file_id
+                    FROM langchain_pg_embedding AS emb
+                    JOIN UniqueFileChunks AS ufc
+                      ON emb.id = ufc.id
+                   WHERE emb.collection_id = $1
+                   ORDER BY ufc.file_id
+                   LIMIT  $3
+                  OFFSET $4
+                )
+                SELECT COALESCE(
+                         json_agg(
+                           json_build_object(
+                             'id', id,
+                             'content', document,
+                             'metadata', COALESCE(cmetadata, '{}'::jsonb),
+                             'collection_id', collection_id::text
+                           )
+                           ORDER BY file_id
+                         ),
+                         '[]'::json
+                       )
+                  FROM Page
                 """,
                 self.collection_id,
                 self.user_id,
                 limit,
                 offset,
-            )
-
-        docs: list[dict[str, Any]] = []
-        for r in rows:
-            metadata = json.loads(r["cmetadata"]) if r["cmetadata"] else {}
-            docs.append(
-                {
-                    "id": str(r["id"]),
-                    "content": r["document"],
-                    "metadata": metadata,
-                    "collection_id": str(self.collection_id),
-                }
+                deleted,
             )
 
         if not docs:
@@ -376,48 +1032,491 @@ class Collection:
             await self._get_details_or_raise()
         return docs
 
+    async def stats(self) -> dict[str, Any]:
+        """Row and file counts of the collection, and statistics of its storage.
+
+        Unless embeddings are partitioned, collections share their tables, so
+        the storage figures cover every collection (`shared_storage`). Files
+        being deleted are not counted.
+        """
+        await self._get_details_or_raise()
+        async with get_db_connection() as conn:
+            args: builtins.list[Any] = [self.collection_id]
+            conditions = ""
+            deleted = await tombstones.deleted_files(conn, self.collection_id)
+            if deleted:
+                args.append(deleted)
+                conditions = tombstones.exclusion_clause("$1", "$2")
+            counts = await conn.fetchrow(
+                f"""
+                SELECT count(*) AS rows,
+                       count(DISTINCT cmetadata->>'file_id') AS files
+                  FROM langchain_pg_embedding
+                 WHERE collection_id = $1
+                 {conditions}
+                """,
+                *args,
+            )
+            shared = not await partitioning.is_partitioned(conn)
+            if shared:
+                tables = await maintenance.embedding_tables(conn)
+            else:
+                tables = [partitioning.partition_name(self.collection_id)]
+            storage = await maintenance.table_stats(conn, tables)
+        return {
+            "collection_id": self.collection_id,
+            "rows": counts["rows"],
+            "files": counts["files"],
+            "shared_storage": shared,
+            "storage": storage,
+        }
+
     async def get(self, document_id: str) -> dict[str, Any]:
-        """Fetch a single chunk by its UUID, verifying collection ownership."""
+        """Fetch a single chunk by its UUID, verifying collection ownership.
+
+        Chunks of files being deleted are not found.
+        """
         async with get_db_connection() as conn:
+            args: builtins.list[Any] = [document_id, self.user_id, self.collection_id]
+            conditions = ""
+            deleted = await tombstones.deleted_files(conn, self.collection_id)
+            if deleted:
+                args.append(deleted)
+                conditions = tombstones.exclusion_clause("$3", "$4")
             row = await conn.fetchrow(
-                """
-                SELECT e.uuid, e.document, e.cmetadata
+                f"""
+                SELECT e.id, e.document, e.cmetadata
                   FROM langchain_pg_embedding e
                   JOIN langchain_pg_collection c
                     ON e.collection_id = c.uuid
-                 WHERE e.uuid = $1
+                 WHERE e.id = $1
                    AND c.cmetadata->>'owner_id' = $2
                    AND c.uuid = $3
+                 {conditions}
                 """,
-                document_id,
-                self.user_id,
-                self.collection_id,
+                *args,
             )
         if not row:
             raise HTTPException(status_code=404, detail="Document not found")
 
-        metadata = json.loads(row["cmetadata"]) if row["cmetadata"] else {}
         return {
-            "id": str(row["uuid"]),
+            "id": row["id"],
             "content": row["document"],
-            "metadata": metadata,
+            "metadata": row["cmetadata"] or {},
         }
 
     async def search(
-        self, query: str, *, limit: int = 4
+        self,
+        query: str,
+        *,
+        limit: int = 4,
+        search_type: Literal["similarity", "mmr"] = "similarity",
+        fetch_k: int | None = None,
+        lambda_mult: float = 0.5,
+        window: int = 0,
     ) -> builtins.list[dict[str, Any]]:
-        """Run a semantic similarity search in the vector store.
-        Note: offset is applied client-side after retrieval.
+        """Run a semantic similarity search; see `search_page` for arguments."""
+        results, _ = await self.search_page(
+            query,
+            limit=limit,
+            search_type=search_type,
+            fetch_k=fetch_k,
+            lambda_mult=lambda_mult,
+            window=window,
+        )
+        return results
+
+    async def search_page(
+        self,
+        query: str,
+        *,
+        limit: int = 4,
+        search_type: Literal["similarity", "mmr"] = "similarity",
+        fetch_k: int | None = None,
+        lambda_mult: float = 0.5,
+        window: int = 0,
+        after: SearchPosition | None = None,
+    ) -> tuple[builtins.list[dict[str, Any]], SearchPosition | None]:
+        """Run a semantic similarity search in the vector store, one page at a time.
+
+        Small collections are served by the in-process memory index; larger
+        ones by a pgvector scan. Results are ordered by similarity, then id.
+
+        Args:
+            query: The search query.
+            limit: Number of results.
+            search_type: "similarity" for the top `limit` chunks, or "mmr" to
+                re-rank the top `fetch_k` chunks by maximal marginal relevance
+                and return `limit` diverse ones.
+            fetch_k: Candidates considered by MMR (default: max(20, limit)).
+            lambda_mult: MMR trade-off; 1.0 is pure relevance, 0.0 pure
+                diversity.
+            window: Merge each hit with up to this many chunks before and
+                after it in the same file (small-to-big retrieval). The
+                merged ordinal range is reported as `metadata["window"]`.
+            after: Continue after this position, as returned for the previous
+                page. Not supported with MMR.
+
+        Returns:
+            Results with their cosine similarity to the query as `score`, and
+            the position to continue from, or None if this is the last page.
         """
-        details = await self._get_details_or_raise()
-        store = get_vectorstore(collection_name=details["table_id"])
-        results = store.similarity_search_with_relevance_scores(query, k=limit)
-        return [
-            {
-                "id": doc.id,
-                "page_content": doc.page_content,
-                "metadata": doc.metadata,
-                "score": score,
-            }
-            for doc, score in results
+        mmr = search_type == "mmr"
+        if mmr and after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor pagination is not supported with MMR.",
+            )
+        fetch_k = max(fetch_k or DEFAULT_MMR_FETCH_K, limit) if mmr else limit
+
+        with stage("search", "ownership"):
+            # A current memory index entry doubles as a verified ownership check.
+            entry = await MEMORY_INDEX.current(self.collection_id, self.user_id)
+            if entry is None:
+                await self._get_details_or_raise()
+            else:
+                record_cache("memory_index", hit=True)
+        if entry is None:
+            with stage("search", "memory_load"):
+                entry = await MEMORY_INDEX.load(self.collection_id, self.user_id)
+
+        with stage("search", "embed"):
+            embedding = await QUERY_EMBEDDINGS.embed(query)
+
+        if entry is not None:
+            with stage("search", "memory"):
+                if mmr:
+                    results = entry.mmr_search(
+                        embedding, limit, fetch_k=fetch_k, lambda_mult=lambda_mult
+                    )
+                else:
+                    results = entry.search(embedding, limit, after=after)
+                if window:
+                    for result in results:
+                        _apply_window(
+                            result, entry.neighbours(result["metadata"], window)
+                        )
+            position = None
+            if not mmr and results and len(results) == limit:
+                last = results[-1]
+                position = SearchPosition(last["score"], last["id"], in_memory=True)
+            return results, position
+
+        with stage("search", "sql"):
+            async with get_db_connection() as conn, conn.transaction():
+                args: builtins.list[Any] = [embedding, self.collection_id, fetch_k]
+                conditions = ""
+                # Files being deleted are hidden until their chunks are gone.
+                deleted = await tombstones.deleted_files(conn, self.collection_id)
+                if deleted:
+                    args.append(deleted)
+                    conditions += tombstones.exclusion_clause("$2", f"${len(args)}")
+                partitioned = await partitioning.is_partitioned(conn)
+                if partitioned:
+                    # Order by the expression of the partition's HNSW index,
+                    # and let the index return enough candidates.
+                    dimension = len(embedding)
+                    sort_key = (
+                        f"{partitioning.vector_order_expression(dimension)}"
+                        f" <=> $1::real[]::halfvec({dimension})"
+                    )
+                    await partitioning.set_ef_search(conn, fetch_k)
+                else:
+                    sort_key = "embedding <=> $1::real[]::vector"
+                if after is not None:
+                    args += [after.distance(), after.id]
+                    conditions += (
+                        f" AND ({sort_key}, id)"
+                        f" > (${len(args) - 1}::float8, ${len(args)}::text)"
+                    )
+                    if partitioned:
+                        await partitioning.set_iterative_scan(conn)
+                # MMR needs the stored vectors of the candidates.
+                vectors = ", embedding::real[] AS embedding" if mmr else ""
+                if await vector_table.is_split(conn):
+                    sql = vector_table.search_sql(
+                        with_vectors=mmr, conditions=conditions
+                    )
+                elif partitioned:
+                    # Index scans cannot break ties by id; pages of exactly
+                    # equidistant chunks may overlap or skip some of them.
+                    sql = f"""
+                        SELECT id, document, cmetadata,
+                               embedding <=> $1::real[]::vector AS distance,
+                               {sort_key} AS sort_key{vectors}
+                          FROM langchain_pg_embedding
+                         WHERE collection_id = $2
+                               {conditions}
+                         ORDER BY {sort_key}
+                         LIMIT $3
+                    """
+                else:
+                    sql = f"""
+                        SELECT id, document, cmetadata,
+                               {sort_key} AS distance{vectors}
+                          FROM langchain_pg_embedding
+                         WHERE collection_id = $2
+                               {conditions}
+                         ORDER BY {sort_key}, id
+                         LIMIT $3
+                    """
+                rows = await conn.fetch(sql, *args)
+                if mmr and rows:
+                    with stage("search", "mmr"):
+                        selected = maximal_marginal_relevance(
+                            np.asarray(embedding, dtype=np.float32),
+                            np.array(
+                                [row["embedding"] for row in rows], dtype=np.float32
+                            ),
+                            limit,
+                            lambda_mult,
+                        )
+                        rows = [rows[i] for i in selected]
+                neighbours = (
+                    await self._fetch_neighbours(conn, rows, window) if window else {}
+                )
+        with stage("search", "serialize"):
+            # Cosine distance; report relevance as 1 - distance, matching
+            # PGVector's `similarity_search_with_relevance_scores`.
+            results = [
+                {
+                    "id": row["id"],
+                    "page_content": row["document"],
+                    "metadata": row["cmetadata"] or {},
+                    "score": 1.0 - row["distance"],
+                }
+                for row in rows
+            ]
+            for result in results:
+                _apply_window(result, neighbours.get(result["id"], []))
+        position = None
+        if not mmr and rows and len(rows) == limit:
+            last = rows[-1]
+            key = last["sort_key"] if partitioned else last["distance"]
+            position = SearchPosition(key, last["id"], in_memory=False)
+        return results, position
+
+    async def _fetch_neighbours(
+        self, conn: asyncpg.Connection, rows: builtins.list[Any], window: int
+    ) -> dict[str, builtins.list[tuple[int, str, int | None]]]:
+        """Fetch the chunks within `window` ordinals of each hit, in one query.
+
+        Returns `(ordinal, text, start_index)` tuples in file order, keyed by
+        hit id. Hits without position information are left out.
+        """
+        hits = [
+            (row["id"], meta["file_id"], meta["ordinal"])
+            for row in rows
+            if "file_id" in (meta := row["cmetadata"] or {})
+            and isinstance(meta.get("ordinal"), int)
         ]
+        if not hits:
+            return {}
+        hit_ids, file_ids, ordinals = zip(*hits, strict=True)
+        neighbour_rows = await conn.fetch(
+            """
+            SELECT h.id AS hit_id,
+                   e.cmetadata->'ordinal' AS ordinal,
+                   e.cmetadata->'start_index' AS start_index,
+                   e.document
+              FROM unnest($2::text[], $3::text[], $4::int[])
+                   AS h(id, file_id, ordinal)
+              JOIN langchain_pg_embedding AS e
+                ON e.collection_id = $1
+               AND e.cmetadata->>'file_id' = h.file_id
+               AND e.cmetadata->'ordinal'
+                   BETWEEN to_jsonb(h.ordinal - $5) AND to_jsonb(h.ordinal + $5)
+             ORDER BY h.id, e.cmetadata->'ordinal'
+            """,
+            self.collection_id,
+            list(hit_ids),
+            list(file_ids),
+            list(ordinals),
+            window,
+        )
+        neighbours: dict[str, builtins.list[tuple[int, str, int | None]]] = {}
+        for row in neighbour_rows:
+            neighbours.setdefault(row["hit_id"], []).append(
+                (row["ordinal"], row["document"], row["start_index"])
+            )
+        return neighbours
+
+    async def iter_vectors(
+        self, *, batch_size: int = 1000
+    ) -> AsyncIterator[tuple[builtins.list[dict[str, Any]], np.ndarray]]:
+        """Stream every chunk of the collection with its stored vector.
+
+        Yields `(records, vectors)` batches in id order, where `records` hold
+        `id`, `document` and `metadata`, and `vectors` is a float32 matrix
+        with one row per record. Files being deleted are left out.
+        """
+        await self._get_details_or_raise()
+        async with get_db_connection() as conn, conn.transaction():
+            split = await vector_table.is_split(conn)
+            source = vector_table.embedding_source(split=split)
+            args: builtins.list[Any] = [self.collection_id]
+            conditions = ""
+            deleted = await tombstones.deleted_files(conn, self.collection_id)
+            if deleted:
+                args.append(deleted)
+                conditions = tombstones.exclusion_clause("$1", "$2")
+            cursor = await conn.cursor(
+                f"""
+                SELECT id, document, cmetadata, embedding::real[] AS embedding
+                  FROM {source} AS emb
+                 WHERE collection_id = $1
+                 {conditions}
+                 ORDER BY id
+                """,
+                *args,
+            )
+            while rows := await cursor.fetch(batch_size):
+                records = [
+                    {
+                        "id": row["id"],
+                        "document": row["document"],
+                        "metadata": row["cmetadata"] or {},
+                    }
+                    for row in rows
+                ]
+                vectors = np.array([row["embedding"] for row in rows], dtype=np.float32)
+                yield records, vectors
+
+    async def bulk_load(
+        self,
+        batches: Iterable[tuple[builtins.list[dict[str, Any]], np.ndarray]],
+        *,
+        dimension: int | None,
+    ) -> int:
+        """Bulk-load pre-embedded chunks with COPY, in a single transaction.
+
+        Chunks receive new ids; their metadata (including `file_id`) is kept,
+        with `duplicate_of` pointing at the new id of the canonical chunk (or
+        dropped if the canonical chunk was not loaded). With near-duplicate
+        detection on, the chunks are indexed for later uploads to match, but
+        not matched against each other or stored chunks (chunks flagged with
+        `duplicate_of` are not indexed).
+
+        Args:
+            batches: `(records, vectors)` batches, as produced by `iter_vectors`
+                or a snapshot reader.
+            dimension: Dimension of the incoming vectors.
+
+        Returns:
+            Number of chunks loaded.
+        """
+        details = await self._get_details_or_raise()
+        near_duplicate_config = resolve_near_duplicates(
+            details["metadata"].get("near_duplicates")
+        )
+        count = 0
+        # New ids by source id, and `(new id, canonical source id)` of the
+        # flagged chunks, whose canonical chunk may come in a later batch.
+        new_ids: dict[str, str] = {}
+        flagged: builtins.list[tuple[str, str]] = []
+        async with get_db_connection() as conn, conn.transaction():
+            await reindex.guard(conn, self.collection_id)
+            split = await vector_table.is_split(conn)
+            existing = await conn.fetchval(
+                f"""
+                SELECT vector_dims(embedding)
+                  FROM {vector_table.embedding_source(split=split)} AS emb
+                 WHERE collection_id = $1
+                 LIMIT 1
+                """,
+                self.collection_id,
+            )
+            if existing is not None and dimension is not None and existing != dimension:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Vector dimension {dimension} does not match the "
+                        f"collection's dimension {existing}."
+                    ),
+                )
+            # Stage rows with natively supported types (real[] for vectors)
+            # and convert them in a single INSERT ... SELECT.
+            await conn.execute(
+                """
+                CREATE TEMP TABLE langconnect_bulk_load (
+                  id text, document text, cmetadata text, embedding real[]
+                ) ON COMMIT DROP
+                """
+            )
+            with stage("bulk_load", "copy"):
+                for records, vectors in batches:
+                    ids = [str(uuid.uuid4()) for _ in records]
+                    for id_, record in zip(ids, records, strict=True):
+                        if "id" in record:
+                            new_ids[str(record["id"])] = id_
+                        metadata = record.get("metadata") or {}
+                        if DUPLICATE_OF_KEY in metadata:
+                            flagged.append((id_, str(metadata[DUPLICATE_OF_KEY])))
+                    await conn.copy_records_to_table(
+                        "langconnect_bulk_load",
+                        records=[
+                            (
+                                id_,
+                                record["document"],
+                                orjson.dumps(record.get("metadata") or {}).decode(),
+                                vector,
+                            )
+                            for id_, record, vector in zip(
+                                ids, records, vectors.tolist(), strict=True
+                            )
+                        ],
+                        columns=["id", "document", "cmetadata", "embedding"],
+                    )
+                    count += len(records)
+                    if near_duplicate_config.mode != "off":
+                        await near_duplicates.add_signatures(
+                            conn,
+                            self.collection_id,
+                            await asyncio.to_thread(_bulk_signatures, ids, records),
+                        )
+            if flagged:
+                await conn.execute(
+                    """
+                    UPDATE langconnect_bulk_load AS b
+                       SET cmetadata = CASE
+                             WHEN m.canonical_id IS NULL
+                             THEN b.cmetadata::jsonb - $3::text
+                             ELSE jsonb_set(b.cmetadata::jsonb, ARRAY[$3::text],
+                                            to_jsonb(m.canonical_id))
+                           END::text
+                      FROM unnest($1::text[], $2::text[]) AS m(id, canonical_id)
+                     WHERE b.id = m.id
+                    """,
+                    [id_ for id_, _ in flagged],
+                    [new_ids.get(canonical) for _, canonical in flagged],
+                    DUPLICATE_OF_KEY,
+                )
+            with stage("bulk_load", "insert"):
+                await conn.execute(
+                    f"""
+                    INSERT INTO langchain_pg_embedding
+                           (id, collection_id, embedding, document, cmetadata)
+                    SELECT id, $1, {"NULL" if split else "embedding::vector"},
+                           document, cmetadata::jsonb
+                      FROM langconnect_bulk_load
+                    """,
+                    self.collection_id,
+                )
+                if split:
+                    await conn.execute(
+                        f"""
+                        INSERT INTO {vector_table.VECTOR_TABLE}
+                               (id, collection_id, embedding)
+                        SELECT id, $1, embedding::vector
+                          FROM langconnect_bulk_load
+                        """,
+                        self.collection_id,
+                    )
+            if count and dimension and await partitioning.is_partitioned(conn):
+                await partitioning.ensure_vector_index(
+                    conn, self.collection_id, dimension
+                )
+            await memory_index.bump_generation(conn, self.collection_id)
+        MEMORY_INDEX.invalidate(self.collection_id)
+        logger.info(f"Bulk-loaded {count} chunks into collection {self.collection_id}.")
+        return count
@@ -1,9 +1,21 @@
+"""Database connections: the asyncpg pools and the PGVector store.
+
+With `POSTGRES_REPLICA_HOST` set, a second pool connects to a read replica.
+Connections come from the primary unless the caller is inside
+`replica_reads()`, which read-only endpoints enter so that searches and
+listings do not compete with ingestion. Replicas lag behind the primary, so
+those endpoints read from the primary when a request asks to see its own
+writes (`X-Read-Your-Writes: true`).
+"""
+
 import logging
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from typing import Any, Optional, Union
 
 import asyncpg
+import orjson
 import sqlalchemy
 from langchain_core.embeddings import Embeddings
 from langchain_postgres.vectorstores import PGVector
@@ -11,11 +23,34 @@ from sqlalchemy import Engine, create_engine
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from langconnect import config
+from langconnect.metrics import DB_POOL_CONNECTIONS, register_collector
 
 logger = logging.getLogger(__name__)
 
 
 _pool: asyncpg.Pool | None = None
+_replica_pool: asyncpg.Pool | None = None
+# Whether connections acquired in the current context may come from the replica.
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+def _json_dumps(value: object) -> str:
+    return orjson.dumps(value).decode()
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Decode json/jsonb columns with orjson so rows arrive as Python objects.
+
+    Queries that assemble their payload with `json_agg` therefore cost a single
+    `orjson.loads` call, instead of one `json.loads` per row.
+    """
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename,
+            encoder=_json_dumps,
+            decoder=orjson.loads,
+            schema="pg_catalog",
+        )
 
 
 async def get_db_pool() -> asyncpg.Pool:
@@ -29,28 +64,89 @@ async def get_db_pool() -> asyncpg.Pool:
             host=config.POSTGRES_HOST,
             port=config.POSTGRES_PORT,
             database=config.POSTGRES_DB,
+            init=_init_connection,
         )
         logger.info("Database connection pool created using parsed URL components.")
     return _pool
 
 
+async def get_replica_pool() -> asyncpg.Pool:
+    """Get the connection pool of the read replica."""
+    global _replica_pool
+    if _replica_pool is None:
+        _replica_pool = await asyncpg.create_pool(
+            user=config.POSTGRES_USER,
+            password=config.POSTGRES_PASSWORD,
+            host=config.POSTGRES_REPLICA_HOST,
+            port=config.POSTGRES_REPLICA_PORT,
+            database=config.POSTGRES_DB,
+            init=_init_connection,
+        )
+        logger.info("Read replica connection pool created.")
+    return _replica_pool
+
+
+async def close_replica_pool() -> None:
+    """Close the connection pool of the read replica, if it is open."""
+    global _replica_pool
+    if _replica_pool:
+        await _replica_pool.close()
+        _replica_pool = None
+
+
 async def close_db_pool():
-    """Close the pg connection pool."""
+    """Close the pg connection pools."""
     global _pool
     if _pool:
         await _pool.close()
         _pool = None
+    await close_replica_pool()
+
+
+def _collect_pool_metrics() -> None:
+    """Refresh pool usage gauges right before a metrics scrape."""
+    for name, pool in (("primary", _pool), ("replica", _replica_pool)):
+        if pool is None:
+            continue
+        DB_POOL_CONNECTIONS.set(pool.get_size(), pool=name, state="open")
+        DB_POOL_CONNECTIONS.set(pool.get_idle_size(), pool=name, state="idle")
+        DB_POOL_CONNECTIONS.set(pool.get_max_size(), pool=name, state="max")
+
+
+register_collector(_collect_pool_metrics)
+
+
+@contextmanager
+def replica_reads(*, enabled: bool = True) -> Iterator[None]:
+    """Let connections acquired in this context come from the read replica.
+
+    Only wrap work that does not write: on a replica, writes fail. Tasks
+    created inside the context (e.g. by `asyncio.gather`) inherit it.
+
+    Args:
+        enabled: False keeps reads on the primary, e.g. for a request that
+            must see its own writes.
+    """
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+async def get_routed_pool() -> asyncpg.Pool:
+    """The pool connections are acquired from in the current context."""
+    if config.POSTGRES_REPLICA_HOST and _replica_reads.get():
+        return await get_replica_pool()
+    return await get_db_pool()
 
 
 @asynccontextmanager
 async def get_db_connection() -> AsyncGenerator[asyncpg.Connection, None]:
-    """Get a connection from the pool."""
-    pool = await get_db_pool()
+    """Get a connection from the pool (the replica's within `replica_reads`)."""
+    pool = await get_routed_pool()
     async with pool.acquire() as conn:
-        try:
-            yield conn
-        finally:
-            await conn.close()
+        yield conn
 
 
 def get_vectorstore_engine(
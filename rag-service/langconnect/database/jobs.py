@@ -0,0 +1,95 @@
+"""Status and progress of background jobs, shared by every worker.
+
+Jobs run in the worker that started them (see `langconnect.services.jobs`),
+but a client polling `/jobs/{job_id}` may reach any worker. Each job is
+therefore saved as a row holding its serialized state: when it starts, as it
+advances and when it finishes.
+"""
+
+from contextlib import suppress
+from typing import Any
+
+import asyncpg
+
+from langconnect.database.connection import get_db_connection
+
+JOB_TABLE = "langconnect_job"
+
+# Whether the job table is known to exist, cached per process.
+_ready = False
+
+
+async def ensure_table(conn: asyncpg.Connection) -> None:
+    """Create the job table if it does not exist yet."""
+    global _ready
+    if _ready:
+        return
+    # Created concurrently by another connection.
+    with suppress(asyncpg.UniqueViolationError):
+        await conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {JOB_TABLE} (
+              id text PRIMARY KEY,
+              owner_id text NOT NULL,
+              status text NOT NULL,
+              state jsonb NOT NULL,
+              created_at timestamptz NOT NULL DEFAULT now()
+            )
+            """
+        )
+    _ready = True
+
+
+async def save(job_id: str, owner_id: str, state: dict[str, Any]) -> None:
+    """Insert or update a job's state.
+
+    Once a job has finished, its row is final: progress saved late (by a write
+    that was still in flight) does not overwrite it.
+    """
+    async with get_db_connection() as conn:
+        await ensure_table(conn)
+        await conn.execute(
+            f"""
+            INSERT INTO {JOB_TABLE} AS j (id, owner_id, status, state)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (id) DO UPDATE
+               SET status = excluded.status,
+                   state = excluded.state
+             WHERE j.status = 'running'
+            """,
+            job_id,
+            owner_id,
+            state["status"],
+            state,
+        )
+
+
+async def load(job_id: str, owner_id: str) -> dict[str, Any] | None:
+    """Return a job's state if it exists and belongs to `owner_id`."""
+    async with get_db_connection() as conn:
+        await ensure_table(conn)
+        return await conn.fetchval(
+            f"SELECT state FROM {JOB_TABLE} WHERE id = $1 AND owner_id = $2",
+            job_id,
+            owner_id,
+        )
+
+
+async def prune(keep: int) -> None:
+    """Delete finished jobs but the `keep` most recent ones."""
+    async with get_db_connection() as conn:
+        await ensure_table(conn)
+        await conn.execute(
+            f"""
+            DELETE FROM {JOB_TABLE}
+             WHERE status <> 'running'
+               AND id NOT IN (
+                 SELECT id
+                   FROM {JOB_TABLE}
+                  WHERE status <> 'running'
+                  ORDER BY created_at DESC
+                  LIMIT $1
+               )
+            """,
+            keep,
+        )
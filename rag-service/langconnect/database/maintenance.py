@@ -0,0 +1,233 @@
+"""Storage statistics and bloat-driven maintenance of the embedding tables.
+
+Wipe-and-reload cycles leave dead tuples in the embedding tables and
+half-empty pages in their indexes, which autovacuum does not always keep up
+with. `plan` compares every embedding table (and partition) with two
+thresholds:
+
+- `MAINTENANCE_DEAD_TUPLE_RATIO`: dead tuples over all tuples of a table,
+  above which the table gets `VACUUM (ANALYZE)`;
+- `MAINTENANCE_INDEX_BLOAT_RATIO`: the share of a B-tree index that is empty
+  space, above which it gets `REINDEX CONCURRENTLY`. Index bloat is measured
+  with `pgstatindex`, so it requires the `pgstattuple` extension; other index
+  types are left to VACUUM.
+
+`run` executes the planned actions one at a time. Maintenance runs on demand
+through the admin endpoint, or every `MAINTENANCE_INTERVAL_SECONDS` when the
+scheduler is enabled.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import math
+from typing import TYPE_CHECKING, Any
+
+import asyncpg
+
+from langconnect import config
+from langconnect.database import partitioning, vector_table
+from langconnect.database.connection import get_db_connection
+
+if TYPE_CHECKING:
+    from langconnect.services.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+# B-tree leaf pages are filled to 90% by default.
+BTREE_FILL_FACTOR = 90.0
+# Session-level advisory lock, so that one worker runs maintenance at a time.
+_LOCK_KEY = "langconnect_maintenance"
+
+
+async def embedding_tables(conn: asyncpg.Connection) -> list[str]:
+    """Tables holding embeddings: the table or its partitions, and vectors."""
+    if await partitioning.is_partitioned(conn):
+        return await conn.fetchval(
+            """
+            SELECT COALESCE(
+                     array_agg(inhrelid::regclass::text ORDER BY inhrelid), '{}'
+                   )
+              FROM pg_inherits
+             WHERE inhparent = $1::regclass
+            """,
+            partitioning.EMBEDDING_TABLE,
+        )
+    tables = [partitioning.EMBEDDING_TABLE]
+    if await vector_table.is_split(conn):
+        tables.append(vector_table.VECTOR_TABLE)
+    return tables
+
+
+async def table_stats(
+    conn: asyncpg.Connection, tables: list[str]
+) -> list[dict[str, Any]]:
+    """Size, tuple counts and last vacuum/analyze times of the given tables."""
+    rows = await conn.fetch(
+        """
+        SELECT s.relid::regclass::text AS table,
+               s.n_live_tup AS live_rows,
+               s.n_dead_tup AS dead_rows,
+               pg_table_size(s.relid) AS table_bytes,
+               pg_indexes_size(s.relid) AS index_bytes,
+               GREATEST(s.last_vacuum, s.last_autovacuum) AS last_vacuum,
+               GREATEST(s.last_analyze, s.last_autoanalyze) AS last_analyze
+          FROM pg_stat_user_tables AS s
+         WHERE s.relid = ANY($1::text[]::regclass[])
+         ORDER BY 1
+        """,
+        tables,
+    )
+    return [
+        {
+            **row,
+            "last_vacuum": _isoformat(row["last_vacuum"]),
+            "last_analyze": _isoformat(row["last_analyze"]),
+            "dead_tuple_ratio": dead_tuple_ratio(row),
+        }
+        for row in map(dict, rows)
+    ]
+
+
+def _isoformat(value: dt.datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def dead_tuple_ratio(stats: dict[str, Any]) -> float:
+    """Dead tuples over all tuples of a table (0 for empty tables)."""
+    total = stats["live_rows"] + stats["dead_rows"]
+    return stats["dead_rows"] / total if total else 0.0
+
+
+async def _has_pgstattuple(conn: asyncpg.Connection) -> bool:
+    return await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pgstattuple')"
+    )
+
+
+async def index_bloat(
+    conn: asyncpg.Connection, tables: list[str]
+) -> list[dict[str, Any]]:
+    """Size and estimated bloat of the B-tree indexes of the given tables.
+
+    Bloat is the empty share of the leaf pages relative to the default fill
+    factor. It is None when `pgstattuple` is not installed.
+    """
+    measure = await _has_pgstattuple(conn)
+    indexes = await conn.fetch(
+        """
+        SELECT i.indexrelid::regclass::text AS index,
+               i.indrelid::regclass::text AS table,
+               pg_relation_size(i.indexrelid) AS index_bytes
+          FROM pg_index AS i
+          JOIN pg_class AS c ON c.oid = i.indexrelid
+          JOIN pg_am AS am ON am.oid = c.relam
+         WHERE i.indrelid = ANY($1::text[]::regclass[])
+           AND am.amname = 'btree'
+         ORDER BY 1
+        """,
+        tables,
+    )
+    results = []
+    for row in indexes:
+        bloat = None
+        if measure and row["index_bytes"]:
+            density = await conn.fetchval(
+                "SELECT avg_leaf_density FROM pgstatindex($1)", row["index"]
+            )
+            # Empty indexes report NaN.
+            if not math.isnan(density):
+                bloat = max(0.0, 1.0 - density / BTREE_FILL_FACTOR)
+        results.append({**row, "bloat": bloat})
+    return results
+
+
+async def plan(
+    conn: asyncpg.Connection,
+    *,
+    dead_tuple_ratio_threshold: float | None = None,
+    index_bloat_threshold: float | None = None,
+) -> list[dict[str, Any]]:
+    """List the VACUUM and REINDEX actions the current bloat calls for.
+
+    Thresholds default to the configured ones.
+    """
+    if dead_tuple_ratio_threshold is None:
+        dead_tuple_ratio_threshold = config.MAINTENANCE_DEAD_TUPLE_RATIO
+    if index_bloat_threshold is None:
+        index_bloat_threshold = config.MAINTENANCE_INDEX_BLOAT_RATIO
+    tables = await embedding_tables(conn)
+    actions = []
+    for stats in await table_stats(conn, tables):
+        ratio = dead_tuple_ratio(stats)
+        if ratio >= dead_tuple_ratio_threshold:
+            actions.append(
+                {
+                    "action": "vacuum",
+                    "target": stats["table"],
+                    "reason": f"dead tuple ratio {ratio:.2f}",
+                }
+            )
+    actions.extend(
+        {
+            "action": "reindex",
+            "target": index["index"],
+            "reason": f"index bloat {index['bloat']:.2f}",
+        }
+        for index in await index_bloat(conn, tables)
+        if index["bloat"] is not None and index["bloat"] >= index_bloat_threshold
+    )
+    return actions
+
+
+def _statement(action: dict[str, Any]) -> str:
+    # Targets are relation names read from the catalog (quoted as needed).
+    if action["action"] == "vacuum":
+        return f"VACUUM (ANALYZE) {action['target']}"
+    return f"REINDEX INDEX CONCURRENTLY {action['target']}"
+
+
+async def run(actions: list[dict[str, Any]], *, job: "Job | None" = None) -> None:
+    """Execute planned actions one at a time, outside any transaction.
+
+    Raises:
+        RuntimeError: If another worker is running maintenance.
+    """
+    if job is not None:
+        job.total = len(actions)
+    async with get_db_connection() as conn:
+        if not await conn.fetchval(
+            "SELECT pg_try_advisory_lock(hashtext($1))", _LOCK_KEY
+        ):
+            raise RuntimeError("Maintenance is already running.")
+        try:
+            for action in actions:
+                logger.info(f"Maintenance: {_statement(action)} ({action['reason']}).")
+                await conn.execute(_statement(action))
+                if job is not None:
+                    job.advance(1)
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", _LOCK_KEY)
+
+
+async def run_scheduler(interval: float) -> None:
+    """Plan and run maintenance every `interval` seconds, until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with get_db_connection() as conn:
+                actions = await plan(conn)
+            if actions:
+                await run(actions)
+        except Exception:
+            logger.exception("Scheduled maintenance failed.")
+
+
+async def setup(conn: asyncpg.Connection) -> None:
+    """Install `pgstattuple` for index bloat estimates, if permitted."""
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+    except asyncpg.PostgresError:
+        logger.info(
+            "pgstattuple is not available; index bloat will not be measured."
+        )
@@ -0,0 +1,341 @@
+"""In-process exact vector search for small collections.
+
+Collections with at most `MEMORY_INDEX_MAX_ROWS` chunks are loaded lazily into
+a contiguous float32 matrix and scored with a single matrix-vector product,
+skipping the SQLAlchemy/PGVector setup and the pgvector scan on subsequent
+searches. Entries expire after `MEMORY_INDEX_TTL_SECONDS`.
+
+Writes must show up at once in every worker, though. Uploads, imports, deletes
+and reindex swaps therefore bump a per-collection generation in the database,
+and every hit is checked against it (together with the collection's ownership)
+with a single primary-key lookup before being served.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+import asyncpg
+import numpy as np
+
+from langconnect import config
+from langconnect.database import tombstones, vector_table
+from langconnect.database.connection import get_db_connection, replica_reads
+from langconnect.database.ranking import maximal_marginal_relevance, normalize_rows
+from langconnect.metrics import record_cache
+from langconnect.services.pagination import SearchPosition
+
+logger = logging.getLogger(__name__)
+
+GENERATION_TABLE = "langconnect_collection_generation"
+
+# Whether the generation table is known to exist, cached per process.
+_ready = False
+
+
+async def ensure_table(conn: asyncpg.Connection) -> None:
+    """Create the collection generation table if it does not exist yet."""
+    global _ready
+    if _ready:
+        return
+    # Created concurrently by another connection.
+    with suppress(asyncpg.UniqueViolationError):
+        await conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {GENERATION_TABLE} (
+              collection_id uuid PRIMARY KEY,
+              generation bigint NOT NULL
+            )
+            """
+        )
+    _ready = True
+
+
+async def bump_generation(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Make every worker drop its entry of a collection whose chunks changed.
+
+    Run it in the transaction that adds, removes (or hides) the chunks.
+    """
+    await ensure_table(conn)
+    await conn.execute(
+        f"""
+        INSERT INTO {GENERATION_TABLE} AS g (collection_id, generation)
+        VALUES ($1, 1)
+        ON CONFLICT (collection_id) DO UPDATE
+           SET generation = g.generation + 1
+        """,
+        collection_id,
+    )
+
+
+async def remove_generation(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Forget the generation of a deleted collection."""
+    await ensure_table(conn)
+    await conn.execute(
+        f"DELETE FROM {GENERATION_TABLE} WHERE collection_id = $1", collection_id
+    )
+
+
+async def _generation(conn: asyncpg.Connection, collection_id: str) -> int:
+    await ensure_table(conn)
+    return await conn.fetchval(
+        f"""
+        SELECT COALESCE(
+                 (SELECT generation FROM {GENERATION_TABLE} WHERE collection_id = $1),
+                 0
+               )
+        """,
+        collection_id,
+    )
+
+
+@dataclass
+class IndexEntry:
+    """Rows of one collection, with L2-normalized vectors."""
+
+    owner_id: str
+    ids: list[str]
+    documents: list[str]
+    metadatas: list[dict[str, Any]]
+    matrix: np.ndarray
+    loaded_at: float
+    # Collection generation the rows were loaded at.
+    generation: int
+    # (file_id, ordinal) -> row, built on first use by `neighbours`.
+    _positions: dict[tuple[str, int], int] | None = field(
+        default=None, init=False, repr=False
+    )
+    # `ids` as an array, built on first use by `_top_k`.
+    _id_array: np.ndarray | None = field(default=None, init=False, repr=False)
+
+    def _result(self, index: int, score: float) -> dict[str, Any]:
+        return {
+            "id": self.ids[index],
+            "page_content": self.documents[index],
+            "metadata": dict(self.metadatas[index]),
+            "score": float(score),
+        }
+
+    def _top_k(
+        self, query: np.ndarray, k: int, after: SearchPosition | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Indices and scores of the k most similar rows, best first.
+
+        Ties are broken by id. With `after`, only rows ranked strictly after
+        that position are considered.
+        """
+        if self._id_array is None:
+            self._id_array = np.array(self.ids)
+        scores = self.matrix @ query
+        candidates = np.arange(len(scores))
+        if after is not None:
+            last = np.float32(after.similarity())
+            candidates = np.flatnonzero(
+                (scores < last) | ((scores == last) & (self._id_array > after.id))
+            )
+        k = min(k, len(candidates))
+        if k == 0:
+            return candidates[:0], scores[:0]
+        candidate_scores = scores[candidates]
+        # Keep every row tied with the k-th score, so that ties are cut by id.
+        kth = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+        top = candidates[candidate_scores >= kth]
+        top = top[np.lexsort((self._id_array[top], -scores[top]))[:k]]
+        return top, scores[top]
+
+    def search(
+        self, embedding: list[float], k: int, *, after: SearchPosition | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the top-k rows by cosine similarity, best first.
+
+        With `after`, return the k rows that follow that position.
+        """
+        if not self.ids or k <= 0:
+            return []
+        top, scores = self._top_k(normalize_rows(embedding), k, after)
+        return [self._result(i, score) for i, score in zip(top, scores, strict=True)]
+
+    def mmr_search(
+        self, embedding: list[float], k: int, *, fetch_k: int, lambda_mult: float
+    ) -> list[dict[str, Any]]:
+        """Return k diverse rows among the fetch_k most similar ones (MMR)."""
+        if not self.ids or k <= 0:
+            return []
+        query = normalize_rows(embedding)
+        top, scores = self._top_k(query, max(k, fetch_k))
+        selected = maximal_marginal_relevance(
+            query, self.matrix[top], k, lambda_mult
+        )
+        return [self._result(top[i], scores[i]) for i in selected]
+
+    def neighbours(
+        self, metadata: dict[str, Any], window: int
+    ) -> list[tuple[int, str, int | None]]:
+        """Chunks of the same file within `window` ordinals of a hit.
+
+        Returns `(ordinal, text, start_index)` tuples in file order, or an
+        empty list if the hit has no position information.
+        """
+        file_id, ordinal = metadata.get("file_id"), metadata.get("ordinal")
+        if file_id is None or not isinstance(ordinal, int):
+            return []
+        if self._positions is None:
+            self._positions = {
+                (meta["file_id"], meta["ordinal"]): i
+                for i, meta in enumerate(self.metadatas)
+                if "file_id" in meta and isinstance(meta.get("ordinal"), int)
+            }
+        chunks = []
+        for position in range(ordinal - window, ordinal + window + 1):
+            i = self._positions.get((file_id, position))
+            if i is not None:
+                chunks.append(
+                    (position, self.documents[i], self.metadatas[i].get("start_index"))
+                )
+        return chunks
+
+
+class MemoryIndex:
+    """Per-process cache of small collections for in-memory search."""
+
+    def __init__(self, max_rows: int, ttl_seconds: float) -> None:
+        """Initialize an empty index.
+
+        Args:
+            max_rows: Largest collection (in chunks) served from memory;
+                0 disables the index.
+            ttl_seconds: Maximum age of a loaded entry.
+        """
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, IndexEntry] = {}
+        # Collections known to exceed `max_rows`, with the time of the check.
+        self._too_large: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the in-memory engine may be used at all."""
+        return self.max_rows > 0
+
+    def _fresh(self, checked_at: float) -> bool:
+        return time.monotonic() - checked_at < self.ttl_seconds
+
+    def lookup(self, collection_id: str, owner_id: str) -> IndexEntry | None:
+        """Return a loaded, fresh entry owned by `owner_id`, if any."""
+        entry = self._entries.get(collection_id)
+        if entry is None or not self._fresh(entry.loaded_at):
+            return None
+        if entry.owner_id != owner_id:
+            return None
+        return entry
+
+    async def current(self, collection_id: str, owner_id: str) -> IndexEntry | None:
+        """Return a loaded entry, if it is still owned by `owner_id` and current.
+
+        Unlike `lookup`, the entry is checked against the database, so that
+        writes made by other workers are seen at once. Stale entries are
+        dropped.
+        """
+        entry = self.lookup(collection_id, owner_id)
+        if entry is None:
+            return None
+        with replica_reads(enabled=False):
+            async with get_db_connection() as conn:
+                await ensure_table(conn)
+                row = await conn.fetchrow(
+                    f"""
+                    SELECT cmetadata->>'owner_id' = $2 AS owned,
+                           COALESCE(g.generation, 0) AS generation
+                      FROM langchain_pg_collection AS c
+                      LEFT JOIN {GENERATION_TABLE} AS g
+                        ON g.collection_id = c.uuid
+                     WHERE c.uuid = $1
+                    """,
+                    collection_id,
+                    owner_id,
+                )
+        if row is None or not row["owned"] or row["generation"] != entry.generation:
+            self.invalidate(collection_id)
+            return None
+        return entry
+
+    def is_too_large(self, collection_id: str) -> bool:
+        """Whether the collection was recently found to exceed `max_rows`."""
+        checked_at = self._too_large.get(collection_id)
+        return checked_at is not None and self._fresh(checked_at)
+
+    def invalidate(self, collection_id: str) -> None:
+        """Forget everything known about a collection after a write."""
+        self._entries.pop(collection_id, None)
+        self._too_large.pop(collection_id, None)
+
+    async def load(self, collection_id: str, owner_id: str) -> IndexEntry | None:
+        """Load a collection the caller has verified `owner_id` owns.
+
+        Returns None if the index is disabled or the collection is too large.
+        """
+        if not self.enabled or self.is_too_large(collection_id):
+            return None
+        lock = self._locks.setdefault(collection_id, asyncio.Lock())
+        async with lock:
+            entry = self.lookup(collection_id, owner_id)
+            if entry is not None:
+                record_cache("memory_index", hit=True)
+                return entry
+            record_cache("memory_index", hit=False)
+
+            # Entries are served for up to the TTL, so they are loaded from the
+            # primary: a lagging replica could return chunks from before the
+            # write that invalidated the previous entry.
+            with replica_reads(enabled=False):
+                async with get_db_connection() as conn:
+                    split = await vector_table.is_split(conn)
+                    # Read before the rows: a delete committed in between then
+                    # only causes a needless reload.
+                    generation = await _generation(conn, collection_id)
+                    deleted = await tombstones.deleted_files(conn, collection_id)
+                    exclusion = (
+                        tombstones.exclusion_clause("$1", "$3") if deleted else ""
+                    )
+                    rows = await conn.fetch(
+                        f"""
+                        SELECT id, document, cmetadata, embedding::real[] AS embedding
+                          FROM {vector_table.embedding_source(split=split)} AS emb
+                         WHERE collection_id = $1
+                               {exclusion}
+                         LIMIT $2
+                        """,
+                        collection_id,
+                        self.max_rows + 1,
+                        *([deleted] if deleted else []),
+                    )
+            if len(rows) > self.max_rows:
+                self._too_large[collection_id] = time.monotonic()
+                return None
+
+            matrix = normalize_rows([row["embedding"] for row in rows])
+            entry = IndexEntry(
+                owner_id=owner_id,
+                ids=[row["id"] for row in rows],
+                documents=[row["document"] for row in rows],
+                metadatas=[row["cmetadata"] or {} for row in rows],
+                matrix=np.ascontiguousarray(matrix),
+                loaded_at=time.monotonic(),
+                generation=generation,
+            )
+            self._entries[collection_id] = entry
+            logger.info(
+                f"Loaded {len(rows)} chunks of collection {collection_id} "
+                "into the memory index."
+            )
+            return entry
+
+
+MEMORY_INDEX = MemoryIndex(
+    max_rows=config.MEMORY_INDEX_MAX_ROWS,
+    ttl_seconds=config.MEMORY_INDEX_TTL_SECONDS,
+)
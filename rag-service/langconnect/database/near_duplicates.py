@@ -0,0 +1,258 @@
+"""Per-collection LSH index of chunk signatures, and chunk aliases.
+
+Alongside the embeddings of a collection live:
+
+- `langconnect_minhash`: the MinHash signature of every canonical chunk;
+- `langconnect_minhash_band`: its LSH band keys, looked up at ingestion to
+  find candidate near-duplicates;
+- `langconnect_chunk_alias`: chunks found to be near-duplicates of a stored
+  (canonical) chunk, with their text and metadata. In `skip` mode this is the
+  only place they are stored.
+
+See `langconnect.services.minhash` for signatures and banding. Tables are
+created on first use.
+"""
+
+import logging
+from contextlib import suppress
+from typing import Any
+
+import asyncpg
+import numpy as np
+
+from langconnect.services import minhash
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_TABLE = "langconnect_minhash"
+BAND_TABLE = "langconnect_minhash_band"
+ALIAS_TABLE = "langconnect_chunk_alias"
+
+# Whether the tables are known to exist, cached per process.
+_ready = False
+
+
+async def ensure_tables(conn: asyncpg.Connection) -> None:
+    """Create the signature, band and alias tables if they do not exist yet."""
+    global _ready
+    if _ready:
+        return
+    # Created concurrently by another connection.
+    with suppress(asyncpg.UniqueViolationError):
+        await conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {SIGNATURE_TABLE} (
+              collection_id uuid NOT NULL,
+              chunk_id text NOT NULL,
+              file_id text,
+              signature bytea NOT NULL,
+              PRIMARY KEY (collection_id, chunk_id)
+            );
+            CREATE TABLE IF NOT EXISTS {BAND_TABLE} (
+              collection_id uuid NOT NULL,
+              band_key bigint NOT NULL,
+              chunk_id text NOT NULL,
+              PRIMARY KEY (collection_id, band_key, chunk_id)
+            );
+            CREATE TABLE IF NOT EXISTS {ALIAS_TABLE} (
+              collection_id uuid NOT NULL,
+              alias_id text NOT NULL,
+              canonical_id text NOT NULL,
+              file_id text,
+              similarity real NOT NULL,
+              document text NOT NULL,
+              cmetadata jsonb NOT NULL,
+              created_at timestamptz NOT NULL DEFAULT now(),
+              PRIMARY KEY (collection_id, alias_id)
+            );
+            CREATE INDEX IF NOT EXISTS ix_chunk_alias_canonical
+                ON {ALIAS_TABLE} (collection_id, canonical_id);
+            """
+        )
+    _ready = True
+
+
+async def candidates(
+    conn: asyncpg.Connection,
+    collection_id: str,
+    band_keys: list[int],
+    deleted_files: list[str],
+) -> minhash.LSHIndex:
+    """Index of the stored chunks sharing a band key with the given ones.
+
+    Chunks of files being deleted are left out.
+    """
+    await ensure_tables(conn)
+    rows = await conn.fetch(
+        f"""
+        SELECT DISTINCT s.chunk_id, s.signature
+          FROM {BAND_TABLE} AS b
+          JOIN {SIGNATURE_TABLE} AS s USING (collection_id, chunk_id)
+         WHERE b.collection_id = $1
+           AND b.band_key = ANY($2::bigint[])
+           AND COALESCE(s.file_id, '') <> ALL($3::text[])
+        """,
+        collection_id,
+        band_keys,
+        deleted_files,
+    )
+    index = minhash.LSHIndex()
+    for row in rows:
+        index.add(row["chunk_id"], minhash.from_bytes(row["signature"]))
+    return index
+
+
+async def add_signatures(
+    conn: asyncpg.Connection,
+    collection_id: str,
+    entries: list[tuple[str, str | None, np.ndarray]],
+) -> None:
+    """Index `(chunk id, file id, signature)` of canonical chunks.
+
+    Chunks indexed before under the same id are re-indexed.
+    """
+    if not entries:
+        return
+    await ensure_tables(conn)
+    chunk_ids = [chunk_id for chunk_id, _, _ in entries]
+    await conn.execute(
+        f"DELETE FROM {BAND_TABLE} WHERE collection_id = $1 AND chunk_id = ANY($2)",
+        collection_id,
+        chunk_ids,
+    )
+    await conn.executemany(
+        f"""
+        INSERT INTO {SIGNATURE_TABLE} (collection_id, chunk_id, file_id, signature)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (collection_id, chunk_id)
+        DO UPDATE SET file_id = EXCLUDED.file_id, signature = EXCLUDED.signature
+        """,
+        [
+            (collection_id, chunk_id, file_id, minhash.to_bytes(sig))
+            for chunk_id, file_id, sig in entries
+        ],
+    )
+    await conn.executemany(
+        f"""
+        INSERT INTO {BAND_TABLE} (collection_id, band_key, chunk_id)
+        VALUES ($1, $2, $3)
+        ON CONFLICT DO NOTHING
+        """,
+        [
+            (collection_id, key, chunk_id)
+            for chunk_id, _, sig in entries
+            for key in minhash.band_keys(sig)
+        ],
+    )
+
+
+async def add_aliases(
+    conn: asyncpg.Connection,
+    collection_id: str,
+    aliases: list[tuple[str, str, float, str, dict[str, Any]]],
+) -> None:
+    """Record `(alias id, canonical id, similarity, text, metadata)` rows."""
+    if not aliases:
+        return
+    await ensure_tables(conn)
+    await conn.executemany(
+        f"""
+        INSERT INTO {ALIAS_TABLE}
+               (collection_id, alias_id, canonical_id, file_id, similarity,
+                document, cmetadata)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        ON CONFLICT (collection_id, alias_id)
+        DO UPDATE SET canonical_id = EXCLUDED.canonical_id,
+                      file_id = EXCLUDED.file_id,
+                      similarity = EXCLUDED.similarity,
+                      document = EXCLUDED.document,
+                      cmetadata = EXCLUDED.cmetadata
+        """,
+        [
+            (
+                collection_id,
+                alias_id,
+                canonical_id,
+                metadata.get("file_id"),
+                score,
+                text,
+                metadata,
+            )
+            for alias_id, canonical_id, score, text, metadata in aliases
+        ],
+    )
+
+
+async def remove_file(
+    conn: asyncpg.Connection, collection_id: str, file_id: str
+) -> list[asyncpg.Record]:
+    """Drop a file's signatures and aliases; return the aliases it orphans.
+
+    Orphans are aliases of other files whose canonical chunk belonged to the
+    file, as `(alias_id, canonical_id, document, cmetadata)` records, oldest
+    first. Their rows are deleted too; the caller stores them again.
+    """
+    await ensure_tables(conn)
+    await conn.execute(
+        f"""
+        DELETE FROM {BAND_TABLE}
+         WHERE collection_id = $1
+           AND chunk_id IN (
+             SELECT chunk_id
+               FROM {SIGNATURE_TABLE}
+              WHERE collection_id = $1 AND file_id = $2
+           )
+        """,
+        collection_id,
+        file_id,
+    )
+    await conn.execute(
+        f"DELETE FROM {SIGNATURE_TABLE} WHERE collection_id = $1 AND file_id = $2",
+        collection_id,
+        file_id,
+    )
+    await conn.execute(
+        f"DELETE FROM {ALIAS_TABLE} WHERE collection_id = $1 AND file_id = $2",
+        collection_id,
+        file_id,
+    )
+    orphans = await conn.fetch(
+        f"""
+        DELETE FROM {ALIAS_TABLE} AS a
+         WHERE a.collection_id = $1
+           AND NOT EXISTS (
+             SELECT 1
+               FROM langchain_pg_embedding AS e
+              WHERE e.collection_id = $1
+                AND e.id = a.canonical_id
+           )
+        RETURNING a.alias_id, a.canonical_id, a.document, a.cmetadata, a.created_at
+        """,
+        collection_id,
+    )
+    return sorted(orphans, key=lambda row: (row["created_at"], row["alias_id"]))
+
+
+async def remove_collection(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Drop every signature, band key and alias of a collection."""
+    await ensure_tables(conn)
+    for table in (BAND_TABLE, SIGNATURE_TABLE, ALIAS_TABLE):
+        await conn.execute(
+            f"DELETE FROM {table} WHERE collection_id = $1", collection_id
+        )
+
+
+async def replace_collection(
+    conn: asyncpg.Connection, collection_id: str, source_id: str
+) -> None:
+    """Replace a collection's signatures, band keys and aliases with another's."""
+    await ensure_tables(conn)
+    for table in (BAND_TABLE, SIGNATURE_TABLE, ALIAS_TABLE):
+        await conn.execute(
+            f"DELETE FROM {table} WHERE collection_id = $1", collection_id
+        )
+        await conn.execute(
+            f"UPDATE {table} SET collection_id = $1 WHERE collection_id = $2",
+            collection_id,
+            source_id,
+        )
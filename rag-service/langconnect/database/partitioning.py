@@ -0,0 +1,269 @@
+"""Opt-in storage layout that list-partitions embeddings by collection.
+
+With `EMBEDDING_PARTITIONING=true`, `langchain_pg_embedding` becomes a table
+partitioned by `collection_id`, with one partition per collection:
+
+- searches, listings and deletes by `file_id` only touch the partition of the
+  collection they target, so their cost no longer grows with the corpus;
+- each partition gets its own HNSW index, built when the first vectors arrive
+  (the vector dimension is not known before that);
+- deleting a collection drops its partition instead of deleting row by row.
+
+Partitioned tables require the partition key in every unique constraint, so
+the primary key becomes `(collection_id, id)`. Writes therefore go through
+`upsert_sql` rather than PGVector, whose upsert targets `ON CONFLICT (id)`.
+"""
+
+import logging
+import uuid
+
+import asyncpg
+
+from langconnect import config
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_TABLE = "langchain_pg_embedding"
+DEFAULT_PARTITION = f"{EMBEDDING_TABLE}_default"
+HNSW_DEFAULT_EF_SEARCH = 40
+# First pgvector release with `hnsw.iterative_scan`.
+ITERATIVE_SCAN_VERSION = (0, 8)
+
+# Detected layout of the embedding table, cached per process.
+_partitioned: bool | None = None
+# Partitions known to have their vector index.
+_indexed: set[str] = set()
+# Whether the installed pgvector supports iterative scans, cached per process.
+_iterative_scan: bool | None = None
+
+
+def partition_name(collection_id: str) -> str:
+    """Name of the partition holding a collection's embeddings."""
+    return f"{EMBEDDING_TABLE}_{collection_id.replace('-', '')}"
+
+
+def vector_order_expression(dimension: int) -> str:
+    """Distance expression served by the per-partition HNSW index.
+
+    pgvector cannot index `vector` columns above 2000 dimensions, so partitions
+    index (and searches order by) a `halfvec` cast of the embedding. Scores are
+    still computed on the full-precision vectors.
+    """
+    return f"embedding::halfvec({int(dimension)})"
+
+
+async def is_partitioned(conn: asyncpg.Connection) -> bool:
+    """Whether the embedding table uses the partitioned layout."""
+    global _partitioned
+    if _partitioned is None:
+        relkind = await conn.fetchval(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass($1)",
+            EMBEDDING_TABLE,
+        )
+        _partitioned = relkind == "p"
+    return _partitioned
+
+
+async def create_partition(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Create the partition for a new collection."""
+    # DDL cannot take bind parameters, so the id is normalized as a UUID
+    # before being interpolated.
+    value = str(uuid.UUID(collection_id))
+    await conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {partition_name(value)}
+          PARTITION OF {EMBEDDING_TABLE} FOR VALUES IN ('{value}')
+        """
+    )
+
+
+async def drop_partition(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Drop a collection's partition together with its rows and indexes."""
+    name = partition_name(collection_id)
+    await conn.execute(f"DROP TABLE IF EXISTS {name}")
+    _indexed.discard(name)
+
+
+async def ensure_vector_index(
+    conn: asyncpg.Connection, collection_id: str, dimension: int
+) -> None:
+    """Create the HNSW index of a collection's partition if it is missing."""
+    name = partition_name(collection_id)
+    if name in _indexed:
+        return
+    exists = await conn.fetchval("SELECT to_regclass($1)", f"{name}_hnsw")
+    if exists is None:
+        await conn.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {name}_hnsw ON {name}
+             USING hnsw (({vector_order_expression(dimension)}) halfvec_cosine_ops)
+            """
+        )
+        logger.info(f"Created vector index on partition {name}.")
+    _indexed.add(name)
+
+
+async def drop_vector_index(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Drop the HNSW index of a collection's partition, e.g. to change dimension."""
+    name = partition_name(collection_id)
+    await conn.execute(f"DROP INDEX IF EXISTS {name}_hnsw")
+    _indexed.discard(name)
+
+
+async def set_ef_search(conn: asyncpg.Connection, limit: int) -> None:
+    """Let HNSW scans in the current transaction return at least `limit` rows.
+
+    An HNSW scan yields at most `hnsw.ef_search` rows (40 by default), which
+    would silently truncate larger result sets.
+    """
+    if limit > HNSW_DEFAULT_EF_SEARCH:
+        await conn.execute(
+            "SELECT set_config('hnsw.ef_search', $1, true)", str(limit)
+        )
+
+
+async def supports_iterative_scan(conn: asyncpg.Connection) -> bool:
+    """Whether the installed pgvector has `hnsw.iterative_scan` (0.8 or later)."""
+    global _iterative_scan
+    if _iterative_scan is None:
+        version = await conn.fetchval(
+            "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+        )
+        try:
+            release = tuple(int(part) for part in version.split(".")[:2])
+        except (AttributeError, ValueError):
+            release = ()
+        _iterative_scan = release >= ITERATIVE_SCAN_VERSION
+        if not _iterative_scan:
+            logger.info(
+                f"pgvector {version} has no iterative HNSW scans; later cursor "
+                "pages of partitioned searches may come back short."
+            )
+    return _iterative_scan
+
+
+async def set_iterative_scan(conn: asyncpg.Connection) -> None:
+    """Let HNSW scans in the current transaction continue past `ef_search`.
+
+    Cursor pages filter out everything up to the previous page, which a plain
+    HNSW scan would count against its `ef_search` candidates. Requires
+    pgvector 0.8: `hnsw.` is a reserved prefix, so older versions reject the
+    setting, and it is skipped there.
+    """
+    if await supports_iterative_scan(conn):
+        await conn.execute(
+            "SELECT set_config('hnsw.iterative_scan', 'strict_order', true)"
+        )
+
+
+def upsert_sql(*, partitioned: bool) -> str:
+    """INSERT statement for `(id, collection_id, embedding, document, cmetadata)`.
+
+    The embedding is passed as `real[]`.
+    """
+    conflict = "(collection_id, id)" if partitioned else "(id)"
+    return f"""
+        INSERT INTO {EMBEDDING_TABLE}
+               (id, collection_id, embedding, document, cmetadata)
+        VALUES ($1, $2, $3::real[]::vector, $4, $5::jsonb)
+        ON CONFLICT {conflict} DO UPDATE
+           SET embedding = EXCLUDED.embedding,
+               document  = EXCLUDED.document,
+               cmetadata = EXCLUDED.cmetadata
+    """
+
+
+async def migrate(conn: asyncpg.Connection) -> None:
+    """Convert the embedding table to the partitioned layout, in place.
+
+    Runs in one transaction: a partition is created for every collection, the
+    rows are copied over, and each non-empty partition gets its vector index.
+    Does nothing if the table is already partitioned.
+    """
+    global _partitioned
+    if await is_partitioned(conn):
+        return
+    staging = f"{EMBEDDING_TABLE}_partitioned"
+    async with conn.transaction():
+        # Serialize concurrent startups (e.g. several workers).
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", staging)
+        relkind = await conn.fetchval(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass($1)",
+            EMBEDDING_TABLE,
+        )
+        if relkind == "p":
+            _partitioned = True
+            return
+        if await conn.fetchval("SELECT to_regclass($1)", f"{EMBEDDING_TABLE}_vector"):
+            raise RuntimeError(
+                "EMBEDDING_PARTITIONING cannot be combined with the separate "
+                "vector table layout."
+            )
+        logger.info("Migrating embeddings to the partitioned layout...")
+        await conn.execute(
+            f"""
+            CREATE TABLE {staging} (
+              id varchar NOT NULL,
+              collection_id uuid
+                REFERENCES langchain_pg_collection (uuid) ON DELETE CASCADE,
+              embedding vector,
+              document varchar,
+              cmetadata jsonb,
+              PRIMARY KEY (collection_id, id)
+            ) PARTITION BY LIST (collection_id);
+            CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {staging} DEFAULT;
+            """
+        )
+        collection_ids = [
+            str(row["uuid"])
+            for row in await conn.fetch("SELECT uuid FROM langchain_pg_collection")
+        ]
+        for collection_id in collection_ids:
+            await conn.execute(
+                f"""
+                CREATE TABLE {partition_name(collection_id)}
+                  PARTITION OF {staging} FOR VALUES IN ('{collection_id}')
+                """
+            )
+        # Rows without a collection are unreachable through the API, and the
+        # primary key does not allow them.
+        moved = await conn.execute(
+            f"""
+            INSERT INTO {staging} (id, collection_id, embedding, document, cmetadata)
+            SELECT id, collection_id, embedding, document, cmetadata
+              FROM {EMBEDDING_TABLE}
+             WHERE collection_id IS NOT NULL
+            """
+        )
+        await conn.execute(
+            f"""
+            DROP TABLE {EMBEDDING_TABLE};
+            ALTER TABLE {staging} RENAME TO {EMBEDDING_TABLE};
+            CREATE INDEX ix_cmetadata_gin
+                ON {EMBEDDING_TABLE} USING gin (cmetadata jsonb_path_ops);
+            """
+        )
+        _partitioned = True
+        for collection_id in collection_ids:
+            dimension = await conn.fetchval(
+                f"SELECT vector_dims(embedding) FROM {partition_name(collection_id)}"
+                " LIMIT 1"
+            )
+            if dimension is not None:
+                await ensure_vector_index(conn, collection_id, dimension)
+    logger.info(
+        f"Migrated {moved.split()[-1]} embeddings into "
+        f"{len(collection_ids)} partitions."
+    )
+
+
+async def setup(conn: asyncpg.Connection) -> None:
+    """Apply the configured layout at startup."""
+    global _partitioned
+    _partitioned = None
+    if config.EMBEDDING_PARTITIONING:
+        await migrate(conn)
+    elif await is_partitioned(conn):
+        logger.info(
+            "The embedding table is partitioned; keeping the partitioned layout."
+        )
@@ -0,0 +1,56 @@
+"""Vectorized re-ranking of search candidates."""
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a float32 matrix (zero rows are left as is)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def maximal_marginal_relevance(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+) -> list[int]:
+    """Select k diverse candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    `lambda_mult * sim(query, c) - (1 - lambda_mult) * max(sim(c, selected))`,
+    using cosine similarity. Pairwise similarities are computed once as a
+    matrix product; each step then costs one vectorized update over the
+    candidates.
+
+    Args:
+        query: Query vector, shape `(dimension,)`.
+        candidates: Candidate vectors, shape `(n, dimension)`.
+        k: Number of candidates to select.
+        lambda_mult: 1.0 ranks by relevance only; 0.0 by diversity only.
+
+    Returns:
+        Indices into `candidates`, in selection order.
+    """
+    count = len(candidates)
+    k = min(k, count)
+    if k <= 0:
+        return []
+    candidates = normalize_rows(candidates)
+    relevance = candidates @ normalize_rows(query)
+    similarity = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of each candidate to anything selected so far.
+    redundancy = similarity[selected[0]].copy()
+    available = np.ones(count, dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
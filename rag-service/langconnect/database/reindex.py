@@ -0,0 +1,292 @@
+"""Blue/green reindexing of a collection.
+
+Changing the chunking or the embedding model of a collection means re-chunking
+and re-embedding all of it. Rather than emptying the collection and ingesting
+again, which leaves searches with partial results for the whole rebuild:
+
+1. a hidden shadow collection is created, marked with `reindex_of` in its
+   metadata (it has no owner, so no request can reach it);
+2. the files of the collection are rebuilt from their stored chunks, then
+   re-chunked and re-embedded into the shadow collection in the background;
+3. in one transaction, the chunks of the collection are deleted and those of
+   the shadow collection are moved under the collection's uuid.
+
+Searches read the old chunks until the swap commits and the new ones after,
+never a mix. Chunks are keyed by their collection's uuid throughout (and the
+embedding table references it), so the swap re-keys rows rather than
+re-pointing the uuid. Large vectors are stored out of line, so re-keying a row
+does not rewrite its vector (except across partitions, which copies rows).
+Writes to the collection are rejected while a shadow exists, since they would
+be lost in the swap.
+
+The shadow collection carries a tombstone, so one left behind by a restart is
+deleted at startup like any interrupted delete.
+"""
+
+import uuid
+from typing import Any
+
+import asyncpg
+from fastapi import status
+from fastapi.exceptions import HTTPException
+
+from langconnect.database import (
+    memory_index,
+    near_duplicates,
+    partitioning,
+    tombstones,
+    vector_table,
+)
+
+# Metadata key of a shadow collection, holding the uuid of the one it replaces.
+SHADOW_KEY = "reindex_of"
+
+
+async def shadow_of(conn: asyncpg.Connection, collection_id: str) -> str | None:
+    """The shadow collection of a collection being reindexed, if any."""
+    shadow_id = await conn.fetchval(
+        f"""
+        SELECT uuid
+          FROM langchain_pg_collection
+         WHERE cmetadata->>'{SHADOW_KEY}' = $1
+        """,
+        collection_id,
+    )
+    return None if shadow_id is None else str(shadow_id)
+
+
+async def guard(conn: asyncpg.Connection, collection_id: str) -> None:
+    """Reject a write to a collection that is being reindexed.
+
+    Must run inside the writing transaction: the collection row is locked in
+    share mode, so a reindex cannot start until the write has committed (and
+    its chunks are part of the rebuild).
+
+    Raises:
+        HTTPException: 409 if the collection is being reindexed.
+    """
+    await conn.execute(
+        "SELECT 1 FROM langchain_pg_collection WHERE uuid = $1 FOR SHARE",
+        collection_id,
+    )
+    if await shadow_of(conn, collection_id) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Collection is being reindexed; retry once the reindex is done.",
+        )
+
+
+async def create_shadow(
+    conn: asyncpg.Connection, collection_id: str, owner_id: str
+) -> str | None:
+    """Create the shadow collection of a collection about to be reindexed.
+
+    Returns:
+        The shadow collection uuid, or None if the collection does not exist
+        or is not owned by `owner_id`.
+
+    Raises:
+        HTTPException: 409 if the collection is already being reindexed.
+    """
+    async with conn.transaction():
+        owned = await conn.fetchval(
+            """
+            SELECT uuid
+              FROM langchain_pg_collection
+             WHERE uuid = $1
+               AND cmetadata->>'owner_id' = $2
+               FOR UPDATE
+            """,
+            collection_id,
+            owner_id,
+        )
+        if owned is None:
+            return None
+        if await shadow_of(conn, collection_id) is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Collection is already being reindexed.",
+            )
+        shadow_id = str(uuid.uuid4())
+        await conn.execute(
+            """
+            INSERT INTO langchain_pg_collection (uuid, name, cmetadata)
+            VALUES ($1, $2, $3::jsonb)
+            """,
+            shadow_id,
+            f"reindex-{shadow_id}",
+            {SHADOW_KEY: collection_id},
+        )
+        await tombstones.add(conn, shadow_id, owner_id)
+        if await partitioning.is_partitioned(conn):
+            await partitioning.create_partition(conn, shadow_id)
+    return shadow_id
+
+
+async def source_files(
+    conn: asyncpg.Connection, collection_id: str, deleted_files: list[str]
+) -> list[asyncpg.Record]:
+    """Files of a collection and their chunk counts.
+
+    Records are `(file_id, chunks, unpositioned)`, the last counting chunks
+    without the position metadata (`ordinal`, and `start_index` unless kept
+    whole) needed to rebuild the file, as stored by older versions.
+
+    Chunks stored only as near-duplicate aliases count too; files being
+    deleted are left out. Chunks without a `file_id` are counted under None.
+    """
+    await near_duplicates.ensure_tables(conn)
+    return await conn.fetch(
+        f"""
+        SELECT file_id,
+               count(DISTINCT id) AS chunks,
+               count(DISTINCT id) FILTER (
+                 WHERE NOT (cmetadata ? 'ordinal'
+                            AND (cmetadata ? 'start_index'
+                                 OR cmetadata ? 'chunk_type'))
+               ) AS unpositioned
+          FROM (
+            SELECT id, cmetadata->>'file_id' AS file_id, cmetadata
+              FROM langchain_pg_embedding
+             WHERE collection_id = $1
+            UNION ALL
+            SELECT alias_id, file_id, cmetadata
+              FROM {near_duplicates.ALIAS_TABLE}
+             WHERE collection_id = $1
+          ) AS chunks
+         WHERE COALESCE(file_id, '') <> ALL($2::text[])
+         GROUP BY file_id
+         ORDER BY file_id
+        """,
+        collection_id,
+        deleted_files,
+    )
+
+
+async def source_chunks(
+    conn: asyncpg.Connection, collection_id: str, file_ids: list[str]
+) -> list[asyncpg.Record]:
+    """Stored chunks of the given files, as `(id, document, cmetadata)`.
+
+    Includes chunks stored only as near-duplicate aliases; every chunk is
+    returned once.
+    """
+    await near_duplicates.ensure_tables(conn)
+    return await conn.fetch(
+        f"""
+        SELECT DISTINCT ON (id) id, document, cmetadata
+          FROM (
+            SELECT id, document, cmetadata
+              FROM langchain_pg_embedding
+             WHERE collection_id = $1
+               AND cmetadata->>'file_id' = ANY($2::text[])
+            UNION ALL
+            SELECT alias_id, document, cmetadata
+              FROM {near_duplicates.ALIAS_TABLE}
+             WHERE collection_id = $1
+               AND file_id = ANY($2::text[])
+          ) AS chunks
+         ORDER BY id
+        """,
+        collection_id,
+        file_ids,
+    )
+
+
+async def _dimension(
+    conn: asyncpg.Connection, collection_id: str, *, split: bool
+) -> int | None:
+    """Dimension of a collection's vectors, or None if it is empty."""
+    return await conn.fetchval(
+        f"""
+        SELECT vector_dims(embedding)
+          FROM {vector_table.embedding_source(split=split)} AS emb
+         WHERE collection_id = $1
+         LIMIT 1
+        """,
+        collection_id,
+    )
+
+
+async def swap(
+    conn: asyncpg.Connection,
+    collection_id: str,
+    shadow_id: str,
+    owner_id: str,
+    metadata: dict[str, Any],
+) -> bool:
+    """Replace a collection's chunks with its shadow's, in one transaction.
+
+    Args:
+        conn: Connection to run the swap on.
+        collection_id: The collection being reindexed.
+        shadow_id: Its shadow collection, left empty.
+        owner_id: Owner of the collection.
+        metadata: Keys merged into the collection metadata (e.g. `chunking`).
+
+    Returns:
+        False if the collection was deleted (or its shadow removed) meanwhile,
+        in which case nothing changes.
+    """
+    async with conn.transaction():
+        locked = await conn.fetch(
+            """
+            SELECT uuid
+              FROM langchain_pg_collection
+             WHERE (uuid = $1 AND cmetadata->>'owner_id' = $3)
+                OR uuid = $2
+               FOR UPDATE
+            """,
+            collection_id,
+            shadow_id,
+            owner_id,
+        )
+        # Both the collection and its shadow must still exist.
+        if {str(row["uuid"]) for row in locked} != {collection_id, shadow_id}:
+            return False
+        partitioned = await partitioning.is_partitioned(conn)
+        split = await vector_table.is_split(conn)
+        old = await _dimension(conn, collection_id, split=split)
+        new = await _dimension(conn, shadow_id, split=split)
+        if partitioned and old is not None and new is not None and old != new:
+            # The partition's HNSW index is built for the old dimension.
+            await partitioning.drop_vector_index(conn, collection_id)
+        # Vectors of the split layout are deleted by cascade.
+        await conn.execute(
+            "DELETE FROM langchain_pg_embedding WHERE collection_id = $1",
+            collection_id,
+        )
+        await conn.execute(
+            """
+            UPDATE langchain_pg_embedding
+               SET collection_id = $1
+             WHERE collection_id = $2
+            """,
+            collection_id,
+            shadow_id,
+        )
+        if split:
+            await conn.execute(
+                f"""
+                UPDATE {vector_table.VECTOR_TABLE}
+                   SET collection_id = $1
+                 WHERE collection_id = $2
+                """,
+                collection_id,
+                shadow_id,
+            )
+        if partitioned and new is not None:
+            await partitioning.ensure_vector_index(conn, collection_id, new)
+        await near_duplicates.replace_collection(conn, collection_id, shadow_id)
+        await memory_index.bump_generation(conn, collection_id)
+        if metadata:
+            await conn.execute(
+                """
+                UPDATE langchain_pg_collection
+                   SET cmetadata = cmetadata::jsonb || $2::jsonb
+                 WHERE uuid = $1
+                """,
+                collection_id,
+                metadata,
+            )
+    return True
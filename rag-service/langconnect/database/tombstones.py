@@ -0,0 +1,219 @@
+"""Tombstones for deletes that are carried out in batches.
+
+Deleting a large file or collection in one statement locks every one of its
+rows until commit, stalls concurrent ingestion and produces a burst of WAL.
+Deletes therefore happen in two steps:
+
+1. a tombstone is recorded for the file (or the whole collection), which hides
+   it from searches and listings right away;
+2. its chunks are deleted in batches of `DELETE_BATCH_SIZE`, each committed on
+   its own, and the tombstone is removed once nothing is left.
+
+Tombstones outlive restarts, so interrupted deletes are resumed at startup.
+Every worker sees every pending tombstone then, and one may be resumed while
+its delete is still running; step 2 therefore always runs under an advisory
+lock (`claim`), so that a delete is carried out by one worker only.
+"""
+
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+from typing import TYPE_CHECKING
+
+import asyncpg
+
+from langconnect import config
+from langconnect.database.connection import get_db_connection
+
+if TYPE_CHECKING:
+    from langconnect.services.jobs import Job
+
+logger = logging.getLogger(__name__)
+
+TOMBSTONE_TABLE = "langconnect_tombstone"
+# `file_id` of a tombstone covering a whole collection.
+WHOLE_COLLECTION = ""
+
+# Whether the tombstone table is known to exist, cached per process.
+_ready = False
+
+
+async def ensure_table(conn: asyncpg.Connection) -> None:
+    """Create the tombstone table if it does not exist yet."""
+    global _ready
+    if _ready:
+        return
+    # Created concurrently by another connection.
+    with suppress(asyncpg.UniqueViolationError):
+        await conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {TOMBSTONE_TABLE} (
+              collection_id uuid NOT NULL,
+              file_id text NOT NULL,
+              owner_id text NOT NULL,
+              created_at timestamptz NOT NULL DEFAULT now(),
+              PRIMARY KEY (collection_id, file_id)
+            )
+            """
+        )
+    _ready = True
+
+
+async def add(
+    conn: asyncpg.Connection,
+    collection_id: str,
+    owner_id: str,
+    file_id: str = WHOLE_COLLECTION,
+) -> None:
+    """Record a tombstone for a file, or for a whole collection."""
+    await ensure_table(conn)
+    await conn.execute(
+        f"""
+        INSERT INTO {TOMBSTONE_TABLE} (collection_id, file_id, owner_id)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (collection_id, file_id) DO NOTHING
+        """,
+        collection_id,
+        file_id,
+        owner_id,
+    )
+
+
+async def remove(
+    conn: asyncpg.Connection, collection_id: str, file_id: str | None = None
+) -> None:
+    """Remove a file's tombstone, or all tombstones of a collection."""
+    if file_id is None:
+        await conn.execute(
+            f"DELETE FROM {TOMBSTONE_TABLE} WHERE collection_id = $1", collection_id
+        )
+    else:
+        await conn.execute(
+            f"DELETE FROM {TOMBSTONE_TABLE} WHERE collection_id = $1 AND file_id = $2",
+            collection_id,
+            file_id,
+        )
+
+
+async def pending(conn: asyncpg.Connection) -> list[asyncpg.Record]:
+    """All tombstones, as `(collection_id, file_id, owner_id)` records."""
+    await ensure_table(conn)
+    return await conn.fetch(
+        f"""
+        SELECT collection_id::text, file_id, owner_id
+          FROM {TOMBSTONE_TABLE}
+         ORDER BY created_at
+        """
+    )
+
+
+@asynccontextmanager
+async def claim(collection_id: str, file_id: str) -> AsyncGenerator[bool, None]:
+    """Hold a session-level advisory lock on a tombstone while it is purged.
+
+    Yields whether the caller should run the delete: `False` if another
+    worker holds the lock, or if the tombstone was removed in the meantime
+    (the delete was finished by whoever held it before).
+    """
+    key = f"{TOMBSTONE_TABLE}:{collection_id}:{file_id}"
+    async with get_db_connection() as conn:
+        if not await conn.fetchval("SELECT pg_try_advisory_lock(hashtext($1))", key):
+            yield False
+            return
+        try:
+            yield await conn.fetchval(
+                f"""
+                SELECT EXISTS (
+                  SELECT 1
+                    FROM {TOMBSTONE_TABLE}
+                   WHERE collection_id = $1
+                     AND file_id = $2
+                )
+                """,
+                collection_id,
+                file_id,
+            )
+        finally:
+            await conn.execute("SELECT pg_advisory_unlock(hashtext($1))", key)
+
+
+async def deleted_files(conn: asyncpg.Connection, collection_id: str) -> list[str]:
+    """Ids of the files of a collection that are being deleted."""
+    await ensure_table(conn)
+    return await conn.fetchval(
+        f"""
+        SELECT COALESCE(array_agg(file_id), '{{}}')
+          FROM {TOMBSTONE_TABLE}
+         WHERE collection_id = $1
+           AND file_id <> ''
+        """,
+        collection_id,
+    )
+
+
+def exclusion_clause(collection_param: str, files_param: str) -> str:
+    """`AND` clause excluding the chunks of deleted files by `id`.
+
+    Usable on any relation with an `id` column (including the vector table),
+    given the placeholders of the collection id and of the `text[]` of file
+    ids returned by `deleted_files`.
+    """
+    return f"""
+        AND id NOT IN (
+          SELECT id
+            FROM langchain_pg_embedding
+           WHERE collection_id = {collection_param}
+             AND cmetadata->>'file_id' = ANY({files_param}::text[])
+        )
+    """
+
+
+async def delete_chunks(
+    collection_id: str, file_id: str | None = None, *, job: "Job | None" = None
+) -> int:
+    """Delete the chunks of a file (or of a whole collection) in batches.
+
+    Every batch runs in its own transaction on a freshly acquired connection,
+    so locks are held on at most `DELETE_BATCH_SIZE` rows at a time.
+
+    Returns:
+        Number of chunks deleted.
+    """
+    params: list[str] = [collection_id]
+    where = "collection_id = $1"
+    if file_id is not None:
+        params.append(file_id)
+        where += " AND cmetadata->>'file_id' = $2"
+    if job is not None:
+        async with get_db_connection() as conn:
+            job.total = await conn.fetchval(
+                f"SELECT count(*) FROM langchain_pg_embedding WHERE {where}", *params
+            )
+
+    batch_size = config.DELETE_BATCH_SIZE
+    deleted = 0
+    while True:
+        async with get_db_connection() as conn:
+            result = await conn.execute(
+                f"""
+                DELETE FROM langchain_pg_embedding
+                 WHERE collection_id = $1
+                   AND id IN (
+                     SELECT id
+                       FROM langchain_pg_embedding
+                      WHERE {where}
+                      LIMIT ${len(params) + 1}
+                   )
+                """,
+                *params,
+                batch_size,
+            )
+        count = int(result.split()[-1])
+        deleted += count
+        if job is not None:
+            job.advance(count)
+        if count < batch_size:
+            break
+    target = f"file {file_id!r}" if file_id is not None else "collection"
+    logger.info(f"Deleted {deleted} chunks of {target} in collection {collection_id}.")
+    return deleted
@@ -0,0 +1,147 @@
+"""Opt-in storage layout that keeps vectors apart from chunk text.
+
+With `EMBEDDING_VECTOR_TABLE=true`, vectors move to a narrow table
+`langchain_pg_embedding_vector (id, collection_id, embedding)`, while
+`langchain_pg_embedding` keeps the text and metadata (its `embedding` column is
+left NULL). Similarity scans then only read vectors; text and metadata are
+fetched for the final top-k rows alone.
+
+The vector table references `langchain_pg_embedding (id)` with ON DELETE
+CASCADE, so deleting chunks or collections needs no extra statements. This
+layout relies on `id` being unique across collections and cannot be combined
+with `EMBEDDING_PARTITIONING`.
+"""
+
+import logging
+
+import asyncpg
+
+from langconnect import config
+from langconnect.database import partitioning
+
+logger = logging.getLogger(__name__)
+
+VECTOR_TABLE = "langchain_pg_embedding_vector"
+
+# Detected layout, cached per process.
+_split: bool | None = None
+
+
+async def is_split(conn: asyncpg.Connection) -> bool:
+    """Whether vectors are stored in the separate vector table."""
+    global _split
+    if _split is None:
+        table = await conn.fetchval("SELECT to_regclass($1)", VECTOR_TABLE)
+        _split = table is not None
+    return _split
+
+
+def embedding_source(*, split: bool) -> str:
+    """A FROM item exposing `id, collection_id, document, cmetadata, embedding`.
+
+    Filtering it on `collection_id` restricts both tables of the split layout.
+    """
+    if not split:
+        return "langchain_pg_embedding"
+    return f"""(
+        SELECT e.id, e.collection_id, e.document, e.cmetadata, v.embedding
+          FROM langchain_pg_embedding AS e
+          JOIN {VECTOR_TABLE} AS v
+            ON v.id = e.id
+           AND v.collection_id = e.collection_id
+    )"""
+
+
+def search_sql(*, with_vectors: bool, conditions: str = "") -> str:
+    """Top-k query of the split layout: scan vectors, then join text and metadata.
+
+    Parameters: `$1` query vector (`real[]`), `$2` collection id, `$3` k.
+    `conditions` are extra `AND` clauses on the vector rows. Ties in distance
+    are broken by id.
+    """
+    vectors = ", embedding::real[] AS embedding" if with_vectors else ""
+    return f"""
+        WITH top AS MATERIALIZED (
+          SELECT id, embedding <=> $1::real[]::vector AS distance{vectors}
+            FROM {VECTOR_TABLE}
+           WHERE collection_id = $2
+                 {conditions}
+           ORDER BY embedding <=> $1::real[]::vector, id
+           LIMIT $3
+        )
+        SELECT top.*, e.document, e.cmetadata
+          FROM top
+          JOIN langchain_pg_embedding AS e
+            ON e.id = top.id
+         ORDER BY top.distance, top.id
+    """
+
+
+UPSERT_VECTOR_SQL = f"""
+    INSERT INTO {VECTOR_TABLE} (id, collection_id, embedding)
+    VALUES ($1, $2, $3::real[]::vector)
+    ON CONFLICT (id) DO UPDATE
+       SET collection_id = EXCLUDED.collection_id,
+           embedding     = EXCLUDED.embedding
+"""
+
+
+async def migrate(conn: asyncpg.Connection) -> None:
+    """Move vectors into the vector table, in one transaction.
+
+    Does nothing if the vector table already exists. Clearing the old column
+    rewrites every row of `langchain_pg_embedding`; run `VACUUM FULL` on it
+    afterwards to reclaim the space.
+    """
+    global _split
+    async with conn.transaction():
+        # Serialize concurrent startups (e.g. several workers).
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", VECTOR_TABLE)
+        if await conn.fetchval("SELECT to_regclass($1)", VECTOR_TABLE) is not None:
+            _split = True
+            return
+        logger.info("Moving vectors to the separate vector table...")
+        await conn.execute(
+            f"""
+            CREATE TABLE {VECTOR_TABLE} (
+              id varchar PRIMARY KEY
+                REFERENCES langchain_pg_embedding (id) ON DELETE CASCADE,
+              collection_id uuid NOT NULL,
+              embedding vector NOT NULL
+            );
+            -- Vectors do not compress; store them out of line uncompressed.
+            ALTER TABLE {VECTOR_TABLE} ALTER COLUMN embedding SET STORAGE EXTERNAL;
+            CREATE INDEX ix_embedding_vector_collection
+                ON {VECTOR_TABLE} (collection_id);
+            """
+        )
+        moved = await conn.execute(
+            f"""
+            INSERT INTO {VECTOR_TABLE} (id, collection_id, embedding)
+            SELECT id, collection_id, embedding
+              FROM langchain_pg_embedding
+             WHERE embedding IS NOT NULL
+               AND collection_id IS NOT NULL
+            """
+        )
+        await conn.execute(
+            "UPDATE langchain_pg_embedding SET embedding = NULL"
+            " WHERE embedding IS NOT NULL"
+        )
+        _split = True
+    logger.info(f"Moved {moved.split()[-1]} vectors to {VECTOR_TABLE}.")
+
+
+async def setup(conn: asyncpg.Connection) -> None:
+    """Apply the configured layout at startup."""
+    global _split
+    _split = None
+    if config.EMBEDDING_VECTOR_TABLE:
+        if await partitioning.is_partitioned(conn):
+            raise RuntimeError(
+                "EMBEDDING_VECTOR_TABLE cannot be combined with a partitioned "
+                "embedding table."
+            )
+        await migrate(conn)
+    elif await is_split(conn):
+        logger.info("Vectors are stored in a separate table; keeping that layout.")
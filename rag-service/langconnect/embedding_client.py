@@ -0,0 +1,108 @@
+"""Client of the shared embedding server.
+
+Every API worker that loads the embedding model pays its memory again (about
+8 GB for Qwen3-Embedding-4B). With `EMBEDDING_SERVER_SOCKET` set, the workers
+embed through `RemoteEmbeddings` instead, and the model is loaded once by
+`python -m langconnect.embedding_server` listening on that Unix socket.
+
+Wire format, in both directions: frames made of a 4-byte big-endian length
+and a payload. A request is one JSON frame `{"texts": [...]}`. A response is a
+JSON frame `{"count": n, "dimension": d}` followed by a frame of `n * d`
+little-endian float32 values, or a single JSON frame `{"error": "..."}`.
+"""
+
+import socket
+import struct
+import time
+
+import numpy as np
+import orjson
+from langchain_core.embeddings import Embeddings
+
+_LENGTH = struct.Struct(">I")
+
+
+class EmbeddingServerError(RuntimeError):
+    """The embedding server is unreachable or failed to embed a request."""
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Prefix a payload with its length."""
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise EmbeddingServerError("The embedding server closed the connection.")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    return _recv_exactly(sock, size)
+
+
+class RemoteEmbeddings(Embeddings):
+    """Embeddings computed by the embedding server behind a Unix socket."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        *,
+        timeout: float = 60.0,
+        timeout_per_text: float = 0.0,
+        connect_timeout: float = 30.0,
+    ) -> None:
+        """Create a client.
+
+        Args:
+            socket_path: Path of the server's Unix socket.
+            timeout: Seconds to wait for a response.
+            timeout_per_text: Seconds added to `timeout` for every text of a
+                request, since a batch is embedded in one forward pass.
+            connect_timeout: Seconds to keep retrying while the server is not
+                listening yet (e.g. still loading the model).
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.timeout_per_text = timeout_per_text
+        self.connect_timeout = connect_timeout
+
+    def _connect(self, timeout: float) -> socket.socket:
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self.socket_path)
+            except (FileNotFoundError, ConnectionRefusedError) as e:
+                sock.close()
+                if time.monotonic() >= deadline:
+                    raise EmbeddingServerError(
+                        f"No embedding server is listening on {self.socket_path}."
+                    ) from e
+                time.sleep(0.1)
+                continue
+            sock.settimeout(timeout)
+            return sock
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed a list of texts on the server."""
+        if not texts:
+            return []
+        timeout = self.timeout + self.timeout_per_text * len(texts)
+        with self._connect(timeout) as sock:
+            sock.sendall(encode_frame(orjson.dumps({"texts": texts})))
+            header = orjson.loads(_recv_frame(sock))
+            if "error" in header:
+                raise EmbeddingServerError(header["error"])
+            data = _recv_frame(sock)
+        vectors = np.frombuffer(data, dtype="<f4")
+        return vectors.reshape(header["count"], header["dimension"]).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed one query on the server."""
+        return self.embed_documents([text])[0]
@@ -0,0 +1,104 @@
+"""Shared embedding server for API workers on the same host.
+
+Loads the embedding model once and serves embeddings on the Unix socket at
+`EMBEDDING_SERVER_SOCKET` (see `langconnect.embedding_client` for the wire
+format). Requests from all workers go through one `EmbeddingBatcher`, so
+concurrent queries from different workers share forward passes. A request of
+several texts (an ingestion batch, already length-bucketed and sized by the
+worker) is embedded as submitted, in one forward pass, and queries waiting
+meanwhile go before the next one.
+
+Run it next to the workers, with the same environment:
+
+    EMBEDDING_SERVER_SOCKET=/tmp/langconnect-embeddings.sock \
+        python -m langconnect.embedding_server
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import orjson
+
+from langconnect import config
+from langconnect.embedding_client import encode_frame
+from langconnect.services.embedding_batcher import EmbeddingBatcher
+
+logger = logging.getLogger(__name__)
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> bytes | None:
+    try:
+        header = await reader.readexactly(4)
+    except asyncio.IncompleteReadError:
+        return None
+    return await reader.readexactly(int.from_bytes(header, "big"))
+
+
+async def _handle(
+    batcher: EmbeddingBatcher,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Answer the requests of one connection until the client closes it."""
+    try:
+        while (payload := await _read_frame(reader)) is not None:
+            try:
+                texts = orjson.loads(payload)["texts"]
+                vectors = await batcher.embed_many(texts)
+                array = np.asarray(vectors, dtype="<f4").reshape(len(texts), -1)
+            except Exception as e:
+                logger.exception("Embedding request failed.")
+                writer.write(encode_frame(orjson.dumps({"error": str(e)})))
+            else:
+                header = {"count": array.shape[0], "dimension": array.shape[1]}
+                writer.write(encode_frame(orjson.dumps(header)))
+                writer.write(encode_frame(array.tobytes()))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(
+    socket_path: str,
+    embed_batch: Callable[[list[str]], list[list[float]]],
+    *,
+    max_batch_size: int = config.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_seconds: float = config.EMBEDDING_BATCH_MAX_WAIT_MS / 1000,
+) -> asyncio.Server:
+    """Listen on a Unix socket, embedding requests with `embed_batch`.
+
+    A stale socket file left by a previous server is replaced.
+    """
+    batcher = EmbeddingBatcher(
+        max_batch_size=max_batch_size,
+        max_wait_seconds=max_wait_seconds,
+        embed_batch=embed_batch,
+    )
+    await asyncio.to_thread(Path(socket_path).unlink, missing_ok=True)
+    return await asyncio.start_unix_server(
+        lambda reader, writer: _handle(batcher, reader, writer), path=socket_path
+    )
+
+
+async def main() -> None:
+    """Load the embedding model and serve it until interrupted."""
+    if not config.EMBEDDING_SERVER_SOCKET:
+        raise SystemExit("Set EMBEDDING_SERVER_SOCKET to the socket to listen on.")
+    # Loaded before listening, so that workers wait for the model to be ready.
+    model = config.load_embedding_model()
+    server = await start_server(config.EMBEDDING_SERVER_SOCKET, model.embed_documents)
+    logger.info(
+        f"Serving {config.EMBEDDING_MODEL_NAME} embeddings on "
+        f"{config.EMBEDDING_SERVER_SOCKET}."
+    )
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
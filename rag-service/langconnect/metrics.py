@@ -0,0 +1,349 @@
+"""Lightweight Prometheus-style metrics for the RAG service.
+
+Metrics are kept in process memory and rendered in the Prometheus text
+exposition format by the `/metrics` endpoint. Recording is a dictionary update
+and a `time.perf_counter()` call, and becomes a no-op when `METRICS_ENABLED`
+is turned off.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from langconnect import config
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+LabelValues = tuple[str, ...]
+MetricT = TypeVar("MetricT", bound="_Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, **extra: str) -> str:
+    pairs = [*zip(names, values, strict=True), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+    _values: dict[LabelValues, Any]
+
+    def __init__(
+        self, name: str, documentation: str, labels: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _snapshot(self) -> list[tuple[LabelValues, Any]]:
+        with self._lock:
+            return sorted(
+                (key, value.copy() if isinstance(value, list) else value)
+                for key, value in self._values.items()
+            )
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Iterable[str] = ()
+    ) -> None:
+        """Create a metric named `name`, with one series per label values."""
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the counter for the given label values."""
+        if not config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> Iterator[str]:
+        for key, value in self._snapshot():
+            yield f"{self.name}{_format_labels(self.label_names, key)} {value}"
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Iterable[str] = ()
+    ) -> None:
+        """Create a metric named `name`, with one series per label values."""
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge for the given label values."""
+        if not config.METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increment the gauge for the given label values."""
+        if not config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrement the gauge for the given label values."""
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels: str) -> Iterator[None]:
+        """Increment the gauge while the block runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def _samples(self) -> Iterator[str]:
+        for key, value in self._snapshot():
+            yield f"{self.name}{_format_labels(self.label_names, key)} {value}"
+
+
+class Histogram(_Metric):
+    """Bucketed observations with a running sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Create a histogram counting observations up to each bucket bound."""
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., sum, count]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label values."""
+        if not config.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the block in seconds."""
+        if not config.METRICS_ENABLED:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> Iterator[str]:
+        for key, state in self._snapshot():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state, strict=False):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, le=str(bound))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.label_names, key, le="+Inf")
+            yield f"{self.name}_bucket{labels} {state[-1]}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {state[-2]}"
+            yield f"{self.name}_count{labels} {state[-1]}"
+
+
+_REGISTRY: list[_Metric] = []
+_COLLECTORS: list[Callable[[], None]] = []
+
+
+def _register(metric: MetricT) -> MetricT:
+    _REGISTRY.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """Register a callback that refreshes gauges right before each scrape."""
+    _COLLECTORS.append(collector)
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    for collector in _COLLECTORS:
+        collector()
+    lines: list[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# =====================
+# Service metrics
+# =====================
+
+REQUEST_LATENCY = _register(
+    Histogram(
+        "langconnect_http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        labels=("method", "route", "status"),
+    )
+)
+
+STAGE_LATENCY = _register(
+    Histogram(
+        "langconnect_stage_duration_seconds",
+        "Latency of individual stages inside search and upsert operations.",
+        labels=("operation", "stage"),
+    )
+)
+
+CACHE_REQUESTS = _register(
+    Counter(
+        "langconnect_cache_requests_total",
+        "Cache lookups by cache name and result (hit or miss).",
+        labels=("cache", "result"),
+    )
+)
+
+INGESTION_IN_FLIGHT = _register(
+    Gauge(
+        "langconnect_ingestion_jobs_in_flight",
+        "Document ingestion requests currently being processed.",
+    )
+)
+
+CHUNK_LENGTH = _register(
+    Histogram(
+        "langconnect_chunk_length",
+        "Length of ingested chunks, in the unit of the collection's strategy.",
+        labels=("unit",),
+        buckets=(32, 64, 128, 256, 512, 768, 1024, 1536, 2048, 4096),
+    )
+)
+
+EMBEDDING_BATCH_SIZE = _register(
+    Histogram(
+        "langconnect_embedding_batch_size",
+        "Distinct queries embedded per batched forward pass.",
+        buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+    )
+)
+
+EMBEDDING_QUEUE_WAIT = _register(
+    Histogram(
+        "langconnect_embedding_queue_wait_seconds",
+        "Time query-embedding requests wait for their batch to start.",
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    )
+)
+
+DB_POOL_CONNECTIONS = _register(
+    Gauge(
+        "langconnect_db_pool_connections",
+        "asyncpg pool connections by pool (primary, replica) and state (open, "
+        "idle, max).",
+        labels=("pool", "state"),
+    )
+)
+
+
+def stage(operation: str, name: str):
+    """Time one stage of an operation, e.g. `stage("search", "embed")`."""
+    return STAGE_LATENCY.time(operation=operation, stage=name)
+
+
+def record_cache(cache: str, *, hit: bool) -> None:
+    """Count a cache lookup so hit rates can be derived from `/metrics`."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request latency.
+
+    Routes are labelled by their path template (e.g.
+    `/collections/{collection_id}/documents/search`) so that label cardinality
+    stays bounded.
+    """
+
+    def __init__(self, app) -> None:
+        """Wrap the given ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Handle one ASGI call, timing HTTP requests only."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            )
@@ -1,23 +1,31 @@
 from langconnect.models.collection import (
+    ChunkingConfig,
     CollectionCreate,
+    CollectionReindex,
     CollectionResponse,
     CollectionUpdate,
+    NearDuplicateConfig,
 )
 from langconnect.models.document import (
     DocumentCreate,
     DocumentResponse,
     DocumentUpdate,
+    FederatedSearchQuery,
     SearchQuery,
     SearchResult,
 )
 
 __all__ = [
+    "ChunkingConfig",
     "CollectionCreate",
+    "CollectionReindex",
     "CollectionResponse",
     "CollectionUpdate",
     "DocumentCreate",
     "DocumentResponse",
     "DocumentUpdate",
+    "FederatedSearchQuery",
+    "NearDuplicateConfig",
     "SearchQuery",
     "SearchResult",
 ]
@@ -1,13 +1,67 @@
 import datetime
-from typing import Any
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # =====================
 # Collection Schemas
 # =====================
 
 
+class ChunkingConfig(BaseModel):
+    """Chunking strategy stored under the `chunking` key of collection metadata.
+
+    Unset fields fall back to the service-wide defaults (`CHUNK_*` settings).
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    strategy: Literal["recursive", "structure"] | None = Field(
+        None,
+        description=(
+            "'recursive' splits on paragraphs, lines and words; 'structure' "
+            "prefers headings, articles and sentence boundaries."
+        ),
+    )
+    unit: Literal["characters", "tokens"] | None = Field(
+        None,
+        description="Measure chunk size in characters or embedding-model tokens.",
+    )
+    chunk_size: int | None = Field(
+        None, gt=0, description="Maximum chunk length, in `unit`."
+    )
+    chunk_overlap_ratio: float | None = Field(
+        None, ge=0.0, lt=1.0, description="Overlap between chunks, as a ratio."
+    )
+
+
+class NearDuplicateConfig(BaseModel):
+    """Near-duplicate detection stored under the `near_duplicates` metadata key.
+
+    Unset fields fall back to the service-wide defaults (`NEAR_DUPLICATE_*`
+    settings).
+    """
+
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+    mode: Literal["off", "flag", "skip"] | None = Field(
+        None,
+        description=(
+            "'flag' stores near-duplicate chunks marked with `duplicate_of`; "
+            "'skip' stores them only as aliases of the canonical chunk."
+        ),
+    )
+    threshold: float | None = Field(
+        None,
+        gt=0.0,
+        le=1.0,
+        description=(
+            "Estimated Jaccard similarity of shingles from which chunks are "
+            "near-duplicates."
+        ),
+    )
+
+
 class CollectionCreate(BaseModel):
     """Schema for creating a new collection."""
 
@@ -26,6 +80,18 @@ class CollectionUpdate(BaseModel):
     )
 
 
+class CollectionReindex(BaseModel):
+    """Schema for reindexing a collection."""
+
+    chunking: ChunkingConfig | None = Field(
+        None,
+        description=(
+            "New chunking config, saved to the collection metadata once the "
+            "reindex succeeds. Defaults to the current one."
+        ),
+    )
+
+
 class CollectionResponse(BaseModel):
     """Schema for representing a collection from PGVector."""
 
@@ -1,6 +1,7 @@
-from typing import Any
+from typing import Any, Literal
+from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import AliasChoices, BaseModel, Field
 
 
 class DocumentCreate(BaseModel):
@@ -26,10 +27,44 @@ class SearchQuery(BaseModel):
     query: str
     limit: int | None = 10
     filter: dict[str, Any] | None = None
+    # "mmr" returns `limit` diverse results among the `fetch_k` most similar.
+    search_type: Literal["similarity", "mmr"] = "similarity"
+    fetch_k: int | None = Field(default=None, gt=0, le=1000)
+    # MMR diversity knob, sent as `lambda`: 1.0 is relevance only, 0.0 diversity only.
+    lambda_mult: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        validation_alias=AliasChoices("lambda", "lambda_mult"),
+    )
+    # Merge each hit with this many neighbouring chunks on each side.
+    window: int = Field(default=0, ge=0, le=10)
+    # Response shape, sent as `return`: "full" content, a query-centred
+    # "snippet" of `snippet_chars` characters, or "ids" without any text.
+    return_mode: Literal["full", "snippet", "ids"] = Field(
+        default="full",
+        validation_alias=AliasChoices("return", "return_mode"),
+    )
+    snippet_chars: int = Field(default=300, gt=0, le=4000)
+    # Only return these metadata keys (all of them if unset).
+    metadata_fields: list[str] | None = None
+    # `X-Next-Cursor` of the previous page, to fetch the next one.
+    cursor: str | None = None
+
+
+class FederatedSearchQuery(SearchQuery):
+    # Collections to search; results are merged by score.
+    collection_ids: list[UUID] = Field(min_length=1, max_length=50)
+    # Results per collection at most (default: `limit`).
+    quota: int | None = Field(default=None, gt=0)
 
 
 class SearchResult(BaseModel):
     id: str
-    page_content: str
+    page_content: str | None = None
     metadata: dict[str, Any] | None = None
     score: float
+    # Collection of the hit, set by federated search.
+    collection_id: str | None = None
+    # `(start, end)` offsets of query terms in a snippet.
+    highlights: list[tuple[int, int]] | None = None
@@ -1,13 +1,27 @@
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-
-from langconnect.api import collections_router, documents_router
-from langconnect.config import ALLOWED_ORIGINS
+from fastapi.responses import PlainTextResponse
+
+from langconnect.api import (
+    collections_router,
+    documents_router,
+    jobs_router,
+    maintenance_router,
+    search_router,
+)
+from langconnect.config import (
+    ALLOWED_ORIGINS,
+    MAINTENANCE_INTERVAL_SECONDS,
+    METRICS_ENABLED,
+)
+from langconnect.database import maintenance
 from langconnect.database.collections import CollectionsManager
+from langconnect.metrics import MetricsMiddleware, render_metrics
 
 # Configure logging
 logging.basicConfig(
@@ -26,8 +40,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Lifespan context manager for FastAPI application."""
     logger.info("App is starting up. Creating background worker...")
     await CollectionsManager.setup()
+    scheduler = None
+    if MAINTENANCE_INTERVAL_SECONDS > 0:
+        scheduler = asyncio.create_task(
+            maintenance.run_scheduler(MAINTENANCE_INTERVAL_SECONDS)
+        )
     yield
     logger.info("App is shutting down. Stopping background worker...")
+    if scheduler is not None:
+        scheduler.cancel()
 
 
 APP = FastAPI(
@@ -44,11 +65,19 @@ APP.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browsers read the cursor of the next page of search results.
+    expose_headers=["X-Next-Cursor"],
 )
 
+if METRICS_ENABLED:
+    APP.add_middleware(MetricsMiddleware)
+
 # Include API routers
 APP.include_router(collections_router)
 APP.include_router(documents_router)
+APP.include_router(jobs_router)
+APP.include_router(maintenance_router)
+APP.include_router(search_router)
 
 
 @APP.get("/health")
@@ -57,6 +86,16 @@ async def health_check() -> dict:
     return {"status": "ok"}
 
 
+if METRICS_ENABLED:
+
+    @APP.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        """Expose service metrics in the Prometheus text format."""
+        return PlainTextResponse(
+            render_metrics(), media_type="text/plain; version=0.0.4"
+        )
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,6 +1,28 @@
+from langconnect.services.chunking import (
+    ChunkStats,
+    get_text_splitter,
+    resolve_chunking,
+)
 from langconnect.services.document_processor import (
     SUPPORTED_MIMETYPES,
     process_document,
 )
+from langconnect.services.embedding_buckets import EmbeddingStats, embed_by_length
+from langconnect.services.minhash import NearDuplicateStats, resolve_near_duplicates
+from langconnect.services.parse_cache import ParseCacheStats
+from langconnect.services.snippets import make_snippet, shape_results
 
-__all__ = ["SUPPORTED_MIMETYPES", "process_document"]
+__all__ = [
+    "SUPPORTED_MIMETYPES",
+    "ChunkStats",
+    "EmbeddingStats",
+    "NearDuplicateStats",
+    "ParseCacheStats",
+    "embed_by_length",
+    "get_text_splitter",
+    "make_snippet",
+    "process_document",
+    "resolve_chunking",
+    "resolve_near_duplicates",
+    "shape_results",
+]
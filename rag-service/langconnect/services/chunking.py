@@ -0,0 +1,219 @@
+"""Configurable chunking strategies.
+
+A collection selects its strategy through the `chunking` key of its metadata
+(see `ChunkingConfig`); unset fields fall back to the `CHUNK_*` settings.
+"""
+
+import functools
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+
+from langconnect import config
+from langconnect.metrics import CHUNK_LENGTH
+from langconnect.models import ChunkingConfig
+
+# Separators (regular expressions) for the "structure" strategy, from the
+# coarsest boundary to the finest.
+STRUCTURE_SEPARATORS = [
+    r"\n(?=#{1,6} )",  # Markdown headings
+    r"\n(?=제\s*\d+\s*조)",  # Korean article headings (제 N 조)
+    r"\n\s*\n",  # Paragraphs
+    r"\n",
+    r"(?<=[.?!。])\s+",  # Sentence ends
+    r" ",
+    r"",
+]
+
+
+def resolve_chunking(
+    chunking: ChunkingConfig | dict[str, Any] | None,
+) -> ChunkingConfig:
+    """Fill unset fields of a chunking config with the service defaults."""
+    if not isinstance(chunking, ChunkingConfig):
+        chunking = ChunkingConfig.model_validate(chunking or {})
+    return ChunkingConfig(
+        strategy=chunking.strategy or config.CHUNK_STRATEGY,
+        unit=chunking.unit or config.CHUNK_UNIT,
+        chunk_size=chunking.chunk_size or config.CHUNK_SIZE,
+        chunk_overlap_ratio=(
+            config.CHUNK_OVERLAP_RATIO
+            if chunking.chunk_overlap_ratio is None
+            else chunking.chunk_overlap_ratio
+        ),
+    )
+
+
+@functools.cache
+def get_tokenizer():
+    """Load (once) the tokenizer of the embedding model."""
+    from transformers import AutoTokenizer
+
+    return AutoTokenizer.from_pretrained(config.EMBEDDING_MODEL_NAME)
+
+
+def count_tokens(text: str) -> int:
+    """Count embedding-model tokens in the text."""
+    return len(get_tokenizer().encode(text, add_special_tokens=False))
+
+
+@functools.lru_cache(maxsize=32)
+def _build_text_splitter(chunking: ChunkingConfig) -> TextSplitter:
+    chunk_overlap = int(chunking.chunk_size * chunking.chunk_overlap_ratio)
+    kwargs: dict[str, Any] = {
+        "chunk_size": chunking.chunk_size,
+        "chunk_overlap": chunk_overlap,
+        # Offsets let neighbouring chunks be merged without repeating overlap.
+        "add_start_index": True,
+    }
+    if chunking.strategy == "structure":
+        kwargs["separators"] = STRUCTURE_SEPARATORS
+        kwargs["is_separator_regex"] = True
+    if chunking.unit == "tokens":
+        return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+            get_tokenizer(), **kwargs
+        )
+    return RecursiveCharacterTextSplitter(**kwargs)
+
+
+def get_text_splitter(
+    chunking: ChunkingConfig | dict[str, Any] | None = None,
+) -> TextSplitter:
+    """Return a (cached) text splitter for the given chunking config."""
+    return _build_text_splitter(resolve_chunking(chunking))
+
+
+def merge_chunks(chunks: list[tuple[str, int | None]]) -> str:
+    """Merge consecutive chunks of one file back into a single passage.
+
+    Args:
+        chunks: `(text, start_index)` pairs in file order. Where offsets show
+            that a chunk overlaps the previous one, the repeated text is kept
+            once; other chunks are joined with a blank line. Offsets restart
+            for every parsed document (e.g. per page), so a chunk starting
+            before its predecessor is treated as a new document.
+    """
+    parts: list[str] = []
+    previous_start: int | None = None
+    end: int | None = None
+    for text, start in chunks:
+        if (
+            start is not None
+            and previous_start is not None
+            and previous_start < start <= end
+        ):
+            parts.append(text[end - start :])
+            end = max(end, start + len(text))
+        else:
+            if parts:
+                parts.append("\n\n")
+            parts.append(text)
+            end = None if start is None else start + len(text)
+        previous_start = start
+    return "".join(parts)
+
+
+# Metadata set per chunk by ingestion, rather than carried over from parsing.
+_POSITION_KEYS = ("file_id", "ordinal", "start_index")
+
+
+def source_documents(chunks: list[Document]) -> list[Document]:
+    """Rebuild the parsed documents of one file from its stored chunks.
+
+    Consecutive chunks are merged back into one document (see `merge_chunks`)
+    as long as their metadata, positions aside, is the same and their offsets
+    keep increasing; offsets restarting mark the next parsed document (e.g.
+    the next page). Chunks with a `chunk_type` were never split and are kept
+    as they are.
+
+    Args:
+        chunks: The file's chunks, in `ordinal` order. Chunks without a
+            `start_index` are not merged, so their overlap would be repeated;
+            callers refuse such chunks.
+
+    Returns:
+        Documents without the position metadata of the chunks.
+    """
+    documents: list[Document] = []
+    group: list[tuple[str, int | None]] = []
+    group_metadata: dict[str, Any] = {}
+
+    def flush() -> None:
+        if group:
+            documents.append(
+                Document(page_content=merge_chunks(group), metadata=group_metadata)
+            )
+
+    for chunk in chunks:
+        metadata = {
+            key: value
+            for key, value in chunk.metadata.items()
+            if key not in _POSITION_KEYS
+        }
+        start = chunk.metadata.get("start_index")
+        previous_start = group[-1][1] if group else None
+        if (
+            not group
+            or metadata != group_metadata
+            or metadata.get("chunk_type")
+            or start is None
+            or previous_start is None
+            or start <= previous_start
+        ):
+            flush()
+            group, group_metadata = [], metadata
+        group.append((chunk.page_content, start))
+    flush()
+    return documents
+
+
+@dataclass
+class ChunkStats:
+    """Chunk statistics accumulated over one ingestion request."""
+
+    chunking: ChunkingConfig
+    files: int = 0
+    source_chars: int = 0
+    chunks: int = 0
+    chunk_chars: int = 0
+    chunk_lengths: list[int] = field(default_factory=list)
+    # Token counts by chunk text, when chunking by tokens, so that embedding
+    # does not tokenize the chunks again (see `embed_by_length`).
+    token_lengths: dict[str, int] = field(default_factory=dict)
+
+    def record(self, source_docs: list[Document], chunks: list[Document]) -> None:
+        """Account for one file's parsed documents and resulting chunks."""
+        self.files += 1
+        self.source_chars += sum(len(doc.page_content) for doc in source_docs)
+        self.chunks += len(chunks)
+        for chunk in chunks:
+            self.chunk_chars += len(chunk.page_content)
+            if self.chunking.unit == "tokens":
+                length = count_tokens(chunk.page_content)
+                self.token_lengths[chunk.page_content] = length
+            else:
+                length = len(chunk.page_content)
+            self.chunk_lengths.append(length)
+            CHUNK_LENGTH.observe(length, unit=self.chunking.unit)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the statistics for API responses and logs."""
+        lengths = self.chunk_lengths
+        return {
+            **self.chunking.model_dump(),
+            "files": self.files,
+            "chunks": self.chunks,
+            "source_chars": self.source_chars,
+            "chunk_chars": self.chunk_chars,
+            # Stored text relative to source text; > 1.0 is the cost of overlap.
+            "storage_factor": (
+                round(self.chunk_chars / self.source_chars, 3)
+                if self.source_chars
+                else None
+            ),
+            "min_length": min(lengths, default=0),
+            "mean_length": round(sum(lengths) / len(lengths), 1) if lengths else 0,
+            "max_length": max(lengths, default=0),
+        }
@@ -0,0 +1,266 @@
+"""Schema-aware parser for SQL DDL files.
+
+Emits exactly one document per `CREATE TABLE` statement, so a table schema is
+never cut mid-column list and a search hit always returns a whole table. The
+table name, columns (with types and comments), primary key and foreign keys are
+attached as metadata.
+"""
+
+import re
+from collections.abc import Iterator
+from itertools import pairwise
+from typing import Any
+
+from langchain_core.document_loaders import BaseBlobParser
+from langchain_core.documents.base import Blob, Document
+
+# Value of the `chunk_type` metadata key on emitted table documents. Documents
+# carrying a `chunk_type` are complete chunks and are not split any further.
+TABLE_SCHEMA_CHUNK_TYPE = "table_schema"
+
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:GLOBAL|LOCAL)\s+)?"
+    r"(?:TEMP(?:ORARY)?\s+|EXTERNAL\s+|UNLOGGED\s+)?TABLE\s+"
+    r"(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>[^\s(]+)\s*\(",
+    re.IGNORECASE,
+)
+_IDENTIFIER_LIST_RE = re.compile(r"\(([^)]*)\)")
+_REFERENCES_RE = re.compile(
+    r"REFERENCES\s+(?P<table>[^\s(]+)\s*(?:\((?P<columns>[^)]*)\))?", re.IGNORECASE
+)
+_COMMENT_RE = re.compile(r"COMMENT\s*(?:=\s*)?'((?:[^']|'')*)'", re.IGNORECASE)
+_COLUMN_KEYWORDS = {
+    "NOT",
+    "NULL",
+    "DEFAULT",
+    "COMMENT",
+    "PRIMARY",
+    "REFERENCES",
+    "UNIQUE",
+    "CHECK",
+    "CONSTRAINT",
+    "COLLATE",
+    "GENERATED",
+    "AUTO_INCREMENT",
+    "AUTOINCREMENT",
+    "IDENTITY",
+}
+_PARAMETERIZED_TYPES = {"ARRAY", "MAP", "STRUCT", "UNIONTYPE"}
+# Table constraints and indexes, as opposed to column definitions. The keyword
+# must be a whole word: `key_name` or `check_date` are columns.
+_CONSTRAINT_RE = re.compile(
+    r"(?:CONSTRAINT|PRIMARY\s+KEY|FOREIGN\s+KEY|UNIQUE|CHECK|KEY|INDEX|EXCLUDE)\b"
+)
+
+
+def _unquote(identifier: str) -> str:
+    """Strip quoting (`"x"`, `` `x` ``, `[x]`) from each part of an identifier."""
+    parts = [part.strip().strip('"`[]') for part in identifier.split(".")]
+    return ".".join(parts)
+
+
+def _identifiers(text: str) -> list[str]:
+    return [_unquote(part) for part in text.split(",") if part.strip()]
+
+
+def _scan(text: str, start: int = 0) -> Iterator[tuple[int, str, int]]:
+    """Yield `(index, char, depth)` for characters outside quotes and comments.
+
+    `depth` counts the parentheses, and the angle brackets of types such as
+    `STRUCT<a: INT, b: STRING>`, that are open before the character.
+    """
+    stack: list[str] = []
+    i = start
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char in "'\"`":
+            end = i + 1
+            while end < length:
+                if text[end] == char:
+                    if end + 1 < length and text[end + 1] == char:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            i = end + 1
+            continue
+        if text.startswith("--", i):
+            newline = text.find("\n", i)
+            i = length if newline == -1 else newline + 1
+            continue
+        if text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            i = length if close == -1 else close + 2
+            continue
+        yield i, char, len(stack)
+        if char == "(" or (char == "<" and _opens_type_parameters(text, i)):
+            stack.append(char)
+        elif stack and (char, stack[-1]) in {(")", "("), (">", "<")}:
+            stack.pop()
+        i += 1
+
+
+def _opens_type_parameters(text: str, index: int) -> bool:
+    """Whether the `<` at `index` opens type parameters, as in `ARRAY<INT>`."""
+    match = re.search(r"(\w+)\s*$", text[max(0, index - 16) : index])
+    return bool(match) and match.group(1).upper() in _PARAMETERIZED_TYPES
+
+
+def _split_top_level(body: str) -> list[str]:
+    """Split a column list on commas that are not nested in parens/brackets."""
+    parts: list[str] = []
+    last = 0
+    for index, char, depth in _scan(body):
+        if char == "," and depth == 0:
+            parts.append(body[last:index])
+            last = index + 1
+    parts.append(body[last:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _comment(text: str) -> str | None:
+    match = _COMMENT_RE.search(text)
+    return match.group(1).replace("''", "'") if match else None
+
+
+def _parse_column(definition: str) -> dict[str, Any]:
+    name, *rest = definition.split(None, 1)
+    type_tokens: list[str] = []
+    for token in rest[0].split() if rest else []:
+        if token.upper() in _COLUMN_KEYWORDS:
+            break
+        type_tokens.append(token)
+    return {
+        "name": _unquote(name),
+        "type": " ".join(type_tokens) or None,
+        "comment": _comment(definition),
+    }
+
+
+def parse_create_table(statement: str) -> dict[str, Any] | None:
+    """Parse one `CREATE TABLE` statement into schema metadata.
+
+    Returns None if the statement is not a well-formed `CREATE TABLE`.
+    """
+    header = _CREATE_TABLE_RE.search(statement)
+    if not header:
+        return None
+
+    body_start = header.end()
+    body_end = None
+    for index, char, depth in _scan(statement, body_start):
+        if char == ")" and depth == 0:
+            body_end = index
+            break
+    if body_end is None:
+        return None
+
+    columns: list[dict[str, Any]] = []
+    primary_key: list[str] = []
+    foreign_keys: list[dict[str, Any]] = []
+    for element in _split_top_level(statement[body_start:body_end]):
+        # Look for keywords outside of comment strings only.
+        bare = _COMMENT_RE.sub("", element)
+        upper = bare.upper()
+        if _CONSTRAINT_RE.match(upper):
+            if "PRIMARY KEY" in upper:
+                match = _IDENTIFIER_LIST_RE.search(bare)
+                primary_key.extend(_identifiers(match.group(1)) if match else [])
+            if "FOREIGN KEY" in upper:
+                match = _IDENTIFIER_LIST_RE.search(bare)
+                references = _REFERENCES_RE.search(bare)
+                if match and references:
+                    foreign_keys.append(
+                        {
+                            "columns": _identifiers(match.group(1)),
+                            "references_table": _unquote(references["table"]),
+                            "references_columns": _identifiers(
+                                references["columns"] or ""
+                            ),
+                        }
+                    )
+            continue
+
+        column = _parse_column(element)
+        columns.append(column)
+        if "PRIMARY KEY" in upper:
+            primary_key.append(column["name"])
+        references = _REFERENCES_RE.search(bare)
+        if references:
+            foreign_keys.append(
+                {
+                    "columns": [column["name"]],
+                    "references_table": _unquote(references["table"]),
+                    "references_columns": _identifiers(references["columns"] or ""),
+                }
+            )
+
+    return {
+        "table_name": _unquote(header["name"]),
+        "table_comment": _comment(statement[body_end + 1 :]),
+        "columns": columns,
+        "primary_key": primary_key,
+        "foreign_keys": foreign_keys,
+    }
+
+
+def split_statements(text: str) -> list[str]:
+    """Split SQL text into statements.
+
+    Statements end at a top-level `;`. A `CREATE` keyword at the top level also
+    starts a new statement, since schema dumps often omit semicolons.
+    """
+    boundaries = {0}
+    for index, char, depth in _scan(text):
+        if depth:
+            continue
+        if char == ";":
+            boundaries.add(index + 1)
+        elif (
+            char in "cC"
+            and text[index : index + 6].upper() == "CREATE"
+            and not (index and (text[index - 1].isalnum() or text[index - 1] == "_"))
+        ):
+            boundaries.add(index)
+    cuts = [*sorted(boundaries), len(text)]
+    statements = (
+        text[start:end].strip().rstrip(";").strip() for start, end in pairwise(cuts)
+    )
+    # Drop fragments made only of comments and whitespace.
+    return [
+        statement
+        for statement in statements
+        if any(not char.isspace() for _, char, _ in _scan(statement))
+    ]
+
+
+class SQLDDLParser(BaseBlobParser):
+    """Parse SQL DDL into one document per table.
+
+    Statements other than `CREATE TABLE` are kept together in a single
+    document without a `chunk_type`, so they are split like plain text.
+    """
+
+    def lazy_parse(self, blob: Blob) -> Iterator[Document]:
+        """Lazily parse the blob."""
+        text = blob.as_string()
+        other: list[str] = []
+        for statement in split_statements(text):
+            schema = parse_create_table(statement)
+            if schema is None:
+                other.append(statement)
+                continue
+            yield Document(
+                page_content=statement,
+                metadata={
+                    "source": blob.source,
+                    "chunk_type": TABLE_SCHEMA_CHUNK_TYPE,
+                    **schema,
+                },
+            )
+        if other:
+            yield Document(
+                page_content=";\n\n".join(other),
+                metadata={"source": blob.source},
+            )
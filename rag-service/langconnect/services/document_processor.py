@@ -1,5 +1,6 @@
 import logging
 import uuid
+from pathlib import Path
 
 from fastapi import UploadFile
 from langchain_community.document_loaders.parsers import BS4HTMLParser, PDFMinerParser
@@ -7,7 +8,16 @@ from langchain_community.document_loaders.parsers.generic import MimeTypeBasedPa
 from langchain_community.document_loaders.parsers.msword import MsWordParser
 from langchain_community.document_loaders.parsers.txt import TextParser
 from langchain_core.documents.base import Blob, Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from langconnect.models import ChunkingConfig
+from langconnect.services.chunking import ChunkStats, get_text_splitter
+from langconnect.services.ddl_parser import SQLDDLParser
+from langconnect.services.parse_cache import (
+    PARSE_CACHE,
+    ParseCacheStats,
+    cache_key,
+    parser_version,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,8 +30,15 @@ HANDLERS = {
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document": (
         MsWordParser()
     ),
+    "application/sql": SQLDDLParser(),
+    "text/x-sql": SQLDDLParser(),
 }
 
+# Generic content types are refined by file extension, so that e.g. `.sql`
+# files uploaded as `text/plain` still reach the DDL parser.
+GENERIC_MIMETYPES = {"text/plain", "application/octet-stream"}
+EXTENSION_MIMETYPES = {".sql": "application/sql"}
+
 SUPPORTED_MIMETYPES = sorted(HANDLERS.keys())
 
 MIMETYPE_BASED_PARSER = MimeTypeBasedParser(
@@ -29,22 +46,63 @@ MIMETYPE_BASED_PARSER = MimeTypeBasedParser(
     fallback_parser=None,
 )
 
-# Text Splitter
-# TODO: Refactor to use configurable variables
-TEXT_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+def resolve_mimetype(file: UploadFile) -> str:
+    """Return the mimetype used to pick a parser for the uploaded file."""
+    mimetype = file.content_type or "text/plain"
+    if mimetype in GENERIC_MIMETYPES and file.filename:
+        extension = Path(file.filename).suffix.lower()
+        mimetype = EXTENSION_MIMETYPES.get(extension, mimetype)
+    return mimetype
+
+
+def parse_contents(
+    contents: bytes, mimetype: str, *, parse_stats: ParseCacheStats | None = None
+) -> list[Document]:
+    """Parse file contents, reusing the cached output of an identical file."""
+    parser = HANDLERS.get(mimetype)
+    key = None
+    if parser is not None and PARSE_CACHE.enabled:
+        key = cache_key(contents, mimetype, parser_version(parser))
+        docs = PARSE_CACHE.get(key)
+        if docs is not None:
+            if parse_stats is not None:
+                parse_stats.hits += 1
+                parse_stats.bytes_saved += len(contents)
+            return docs
+    docs = MIMETYPE_BASED_PARSER.parse(Blob(data=contents, mimetype=mimetype))
+    if key is not None:
+        if parse_stats is not None:
+            parse_stats.misses += 1
+        PARSE_CACHE.put(key, docs)
+    return docs
 
 
 async def process_document(
-    file: UploadFile, metadata: dict | None = None
+    file: UploadFile,
+    metadata: dict | None = None,
+    *,
+    chunking: ChunkingConfig | dict | None = None,
+    stats: ChunkStats | None = None,
+    parse_stats: ParseCacheStats | None = None,
 ) -> list[Document]:
-    """Process an uploaded file into LangChain documents."""
+    """Process an uploaded file into LangChain documents.
+
+    Files parsed before with the same parser are read from the parse cache.
+
+    Args:
+        file: The uploaded file.
+        metadata: Optional metadata added to every resulting chunk.
+        chunking: Chunking config of the target collection; service defaults
+            are used when omitted.
+        stats: Optional accumulator for chunk statistics.
+        parse_stats: Optional accumulator for parse cache hits and misses.
+    """
     # Generate a unique ID for this file processing instance
     file_id = uuid.uuid4()
 
     contents = await file.read()
-    blob = Blob(data=contents, mimetype=file.content_type or "text/plain")
-
-    docs = MIMETYPE_BASED_PARSER.parse(blob)
+    docs = parse_contents(contents, resolve_mimetype(file), parse_stats=parse_stats)
 
     # Add provided metadata to each document
     if metadata:
@@ -55,17 +113,45 @@ async def process_document(
             # Update with provided metadata, preserving existing keys if not overridden
             doc.metadata.update(metadata)
 
-    # Split documents
-    split_docs = TEXT_SPLITTER.split_documents(docs)
+    return split_documents(docs, str(file_id), chunking=chunking, stats=stats)
+
+
+def split_documents(
+    docs: list[Document],
+    file_id: str,
+    *,
+    chunking: ChunkingConfig | dict | None = None,
+    stats: ChunkStats | None = None,
+) -> list[Document]:
+    """Split the parsed documents of one file into chunks.
+
+    Args:
+        docs: Parsed documents of the file.
+        file_id: Id of the file, stored in every chunk's metadata.
+        chunking: Chunking config of the target collection; service defaults
+            are used when omitted.
+        stats: Optional accumulator for chunk statistics.
+    """
+    # Parsers that emit self-contained chunks (e.g. one per table for SQL DDL)
+    # mark them with a `chunk_type`; those are kept whole.
+    text_splitter = get_text_splitter(chunking)
+    split_docs: list[Document] = []
+    for doc in docs:
+        if doc.metadata.get("chunk_type"):
+            split_docs.append(doc)
+        else:
+            split_docs.extend(text_splitter.split_documents([doc]))
+    if stats is not None:
+        stats.record(docs, split_docs)
 
-    # Add the generated file_id to all split documents' metadata
-    for split_doc in split_docs:
+    # Add the file_id and the chunk's position within the file (`ordinal`,
+    # used to fetch neighbouring chunks at search time).
+    for ordinal, split_doc in enumerate(split_docs):
         if not hasattr(split_doc, "metadata") or not isinstance(
             split_doc.metadata, dict
         ):
             split_doc.metadata = {}  # Initialize if it doesn't exist
-        split_doc.metadata["file_id"] = str(
-            file_id
-        )  # Store as string for compatibility
+        split_doc.metadata["file_id"] = file_id
+        split_doc.metadata["ordinal"] = ordinal
 
     return split_docs
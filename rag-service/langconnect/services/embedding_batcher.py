@@ -0,0 +1,139 @@
+"""Dynamic micro-batching of concurrent query embeddings.
+
+A single-sentence forward pass through the embedding model leaves most of the
+CPU idle. `EmbeddingBatcher` collects query-embedding requests for up to
+`EMBEDDING_BATCH_MAX_WAIT_MS` milliseconds, or until `EMBEDDING_BATCH_MAX_SIZE`
+are waiting, and embeds them in one batched forward pass on a worker thread,
+keeping the event loop free. One pass runs at a time; requests arriving
+meanwhile form the next batch, which starts as soon as the pass finishes.
+Identical queries in a batch are embedded once.
+
+A request of several texts (`embed_many`, e.g. an ingestion batch already
+sized by its caller) is embedded as submitted, in a pass of its own. While
+both are waiting, passes alternate between a batch of single texts and one
+such request, so queries wait for one ingestion batch at most and ingestion
+is not starved by queries.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+from langconnect import config
+from langconnect.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_QUEUE_WAIT
+
+
+def _embed_with_default_model(texts: list[str]) -> list[list[float]]:
+    # The configured model encodes queries and documents alike (no query
+    # instruction), so a batch of queries is embedded as documents.
+    return config.DEFAULT_EMBEDDINGS.embed_documents(texts)
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embedding requests into batched forward passes."""
+
+    def __init__(
+        self,
+        *,
+        max_batch_size: int,
+        max_wait_seconds: float,
+        embed_batch: Callable[[list[str]], list[list[float]]] = (
+            _embed_with_default_model
+        ),
+    ) -> None:
+        """Create a batcher.
+
+        Args:
+            max_batch_size: Texts embedded per forward pass at most.
+            max_wait_seconds: How long the first request of a batch waits for
+                others before the batch is embedded.
+            embed_batch: Blocking function embedding a list of texts.
+        """
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self.embed_batch = embed_batch
+        # (texts, future, enqueue time) of requests not yet in a batch.
+        self._pending: list[tuple[list[str], asyncio.Future, float]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._worker: asyncio.Task | None = None
+        # Whether the last pass embedded single texts.
+        self._singles_last = False
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed one text as part of the next batch."""
+        [vector] = await self.embed_many([text])
+        return vector
+
+    async def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed a request's texts, together and in order.
+
+        A single text is batched with other requests; several texts are
+        embedded as one batch of their own, whatever `max_batch_size`.
+        """
+        if not texts:
+            return []
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((list(texts), future, time.perf_counter()))
+        if self._worker is None:
+            if len(texts) > 1 or len(self._pending) >= self.max_batch_size:
+                self._start()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.max_wait_seconds, self._start
+                )
+        return await future
+
+    def _start(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._worker is None and self._pending:
+            self._worker = asyncio.create_task(self._drain())
+
+    def _next_batch(self) -> list[tuple[list[str], asyncio.Future, float]]:
+        """Take the oldest single texts or the oldest multi-text request."""
+        singles = [request for request in self._pending if len(request[0]) == 1]
+        several = [request for request in self._pending if len(request[0]) > 1]
+        if singles and not (several and self._singles_last):
+            batch = singles[: self.max_batch_size]
+        else:
+            batch = several[:1]
+        self._singles_last = len(batch[0][0]) == 1
+        taken = {id(request) for request in batch}
+        self._pending = [
+            request for request in self._pending if id(request) not in taken
+        ]
+        return batch
+
+    async def _drain(self) -> None:
+        """Embed pending requests batch by batch until none are left."""
+        try:
+            while self._pending:
+                await self._run(self._next_batch())
+        finally:
+            self._worker = None
+
+    async def _run(self, batch: list[tuple[list[str], asyncio.Future, float]]) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            EMBEDDING_QUEUE_WAIT.observe(started - enqueued)
+        texts = list(dict.fromkeys(text for request, _, _ in batch for text in request))
+        EMBEDDING_BATCH_SIZE.observe(len(texts))
+        try:
+            vectors = await asyncio.to_thread(self.embed_batch, texts)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_text = dict(zip(texts, vectors, strict=True))
+        for request, future, _ in batch:
+            # Callers may have been cancelled while waiting.
+            if not future.done():
+                future.set_result([by_text[text] for text in request])
+
+
+EMBEDDING_BATCHER = EmbeddingBatcher(
+    max_batch_size=config.EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_seconds=config.EMBEDDING_BATCH_MAX_WAIT_MS / 1000,
+)
@@ -0,0 +1,129 @@
+"""Length-bucketed embedding of ingested chunks.
+
+A forward pass pads every text of a batch to the longest one, so a single long
+chunk in a batch of short ones (DDL files, snippets) multiplies the work of
+the batch. `embed_by_length` sorts the chunks by token count, cuts the sorted
+list into batches of similar length whose padded size stays within
+`INGESTION_EMBEDDING_TOKEN_BUDGET` tokens (short chunks get large batches, long
+chunks small ones), and returns the vectors in the original order.
+
+`scripts/bench_embedding_buckets.py` measures the throughput of bucketed
+batches against batches in upload order with the configured model.
+"""
+
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from langconnect import config
+from langconnect.services.chunking import count_tokens
+
+
+@dataclass
+class EmbeddingStats:
+    """Embedding statistics accumulated over one ingestion request."""
+
+    texts: int = 0
+    batches: int = 0
+    tokens: int = 0
+    # Tokens of the batches as sent, each padded to its longest text.
+    padded_tokens: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the statistics for API responses and logs."""
+        return {
+            "texts": self.texts,
+            "batches": self.batches,
+            "tokens": self.tokens,
+            "padded_tokens": self.padded_tokens,
+            "seconds": round(self.seconds, 3),
+            "texts_per_second": (
+                round(self.texts / self.seconds, 1) if self.seconds else None
+            ),
+            "tokens_per_second": (
+                round(self.tokens / self.seconds, 1) if self.seconds else None
+            ),
+        }
+
+
+def plan_batches(
+    lengths: list[int], *, token_budget: int, max_batch_size: int
+) -> list[list[int]]:
+    """Group text indices into batches of similar length.
+
+    Indices are sorted by length, and a batch is closed when one more text
+    would exceed `max_batch_size` or pad the batch beyond `token_budget`.
+    A text longer than the budget gets a batch of its own.
+    """
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        # Lengths are ascending, so this text sets the batch's padded length.
+        padded = (len(batch) + 1) * max(lengths[index], 1)
+        if batch and (len(batch) >= max_batch_size or padded > token_budget):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def padded_tokens(lengths: list[int], batches: list[list[int]]) -> int:
+    """Tokens processed by the batches once padded to their longest text."""
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+
+
+def embed_by_length(
+    texts: list[str],
+    embed_batch: Callable[[list[str]], list[list[float]]],
+    *,
+    lengths: list[int] | None = None,
+    known_lengths: Mapping[str, int] | None = None,
+    token_budget: int | None = None,
+    max_batch_size: int | None = None,
+    stats: EmbeddingStats | None = None,
+) -> list[list[float]]:
+    """Embed texts in length-sorted batches, returning vectors in input order.
+
+    Args:
+        texts: Texts to embed.
+        embed_batch: Blocking function embedding a list of texts.
+        lengths: Token counts of the texts; counted with the embedding
+            model's tokenizer when omitted.
+        known_lengths: Token counts already known by text (e.g. from
+            chunking by tokens), used instead of counting those texts again.
+        token_budget: Padded tokens per batch at most (defaults to
+            `INGESTION_EMBEDDING_TOKEN_BUDGET`).
+        max_batch_size: Texts per batch at most (defaults to
+            `INGESTION_EMBEDDING_MAX_BATCH_SIZE`).
+        stats: Accumulates batch counts, padding and throughput if given.
+    """
+    if token_budget is None:
+        token_budget = config.INGESTION_EMBEDDING_TOKEN_BUDGET
+    if max_batch_size is None:
+        max_batch_size = config.INGESTION_EMBEDDING_MAX_BATCH_SIZE
+    max_batch_size = max(1, max_batch_size)
+    if lengths is None:
+        known = known_lengths or {}
+        lengths = [
+            known[text] if text in known else count_tokens(text) for text in texts
+        ]
+    batches = plan_batches(
+        lengths, token_budget=token_budget, max_batch_size=max_batch_size
+    )
+    started = time.perf_counter()
+    vectors: list[list[float]] = [[] for _ in texts]
+    for batch in batches:
+        embedded = embed_batch([texts[i] for i in batch])
+        for index, vector in zip(batch, embedded, strict=True):
+            vectors[index] = vector
+    if stats is not None:
+        stats.texts += len(texts)
+        stats.batches += len(batches)
+        stats.tokens += sum(lengths)
+        stats.padded_tokens += padded_tokens(lengths, batches)
+        stats.seconds += time.perf_counter() - started
+    return vectors
@@ -0,0 +1,139 @@
+"""Registry of background jobs with progress reporting.
+
+Jobs run as asyncio tasks on the event loop of the worker that started them.
+Their state is saved to Postgres (`langconnect.database.jobs`) as they start,
+advance and finish, so any worker can report it. A job whose worker stops is
+not resumed; work that must survive a restart (such as tombstoned deletes) is
+resumed by its owner at startup.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from langconnect.database import jobs as job_store
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["running", "succeeded", "failed"]
+
+# Minimum number of seconds between two progress saves of a job.
+PROGRESS_SAVE_INTERVAL = 1.0
+
+
+@dataclass
+class Job:
+    """A unit of background work and its progress."""
+
+    kind: str
+    owner_id: str
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: JobStatus = "running"
+    # Units of work (e.g. chunks) done so far, out of `total` if known.
+    done: int = 0
+    total: int | None = None
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    # Progress specific to the kind of job (e.g. its current phase).
+    details: dict[str, Any] = field(default_factory=dict)
+    # Called with the job as it advances, to save its progress.
+    on_progress: Callable[["Job"], None] | None = field(default=None, repr=False)
+
+    def advance(self, count: int) -> None:
+        """Record `count` more units of work done."""
+        self.done += count
+        if self.on_progress is not None:
+            self.on_progress(self)
+
+    def throughput(self) -> float:
+        """Units of work done per second since the job started."""
+        elapsed = (self.finished_at or time.time()) - self.created_at
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the job for API responses."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "done": self.done,
+            "total": self.total,
+            "throughput": round(self.throughput(), 2),
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "details": self.details,
+        }
+
+
+class JobRegistry:
+    """Start background jobs and keep the most recent ones for inspection."""
+
+    def __init__(self, *, max_jobs: int = 1000) -> None:
+        """Keep up to `max_jobs` finished jobs; older ones are deleted."""
+        self.max_jobs = max_jobs
+        # Strong references, so running tasks are not garbage collected.
+        self._tasks: set[asyncio.Task] = set()
+        # Jobs with a progress save in flight, and when each was last saved.
+        self._saving: set[str] = set()
+        self._saved_at: dict[str, float] = {}
+
+    async def start(
+        self, kind: str, owner_id: str, run: Callable[[Job], Awaitable[None]]
+    ) -> Job:
+        """Run `run(job)` in the background and return the job once saved."""
+        job = Job(kind=kind, owner_id=owner_id, on_progress=self._progress)
+        await job_store.prune(self.max_jobs)
+        await job_store.save(job.id, owner_id, job.to_dict())
+        self._saved_at[job.id] = time.monotonic()
+        self._spawn(self._run(job, run))
+        return job
+
+    async def _run(self, job: Job, run: Callable[[Job], Awaitable[None]]) -> None:
+        try:
+            await run(job)
+        except Exception as e:
+            job.status, job.error = "failed", str(e)
+            logger.exception(f"Job {job.id} ({job.kind}) failed.")
+        else:
+            job.status = "succeeded"
+        finally:
+            job.finished_at = time.time()
+            self._saved_at.pop(job.id, None)
+            await self._save(job)
+
+    async def get(self, job_id: str, owner_id: str) -> dict[str, Any] | None:
+        """Return the saved state of a job, if it belongs to `owner_id`."""
+        return await job_store.load(job_id, owner_id)
+
+    def _progress(self, job: Job) -> None:
+        """Save a job's progress, at most every `PROGRESS_SAVE_INTERVAL`."""
+        if job.id in self._saving or job.id not in self._saved_at:
+            return
+        if time.monotonic() - self._saved_at[job.id] < PROGRESS_SAVE_INTERVAL:
+            return
+        self._saved_at[job.id] = time.monotonic()
+        self._saving.add(job.id)
+        task = self._spawn(self._save(job))
+        task.add_done_callback(lambda _: self._saving.discard(job.id))
+
+    async def _save(self, job: Job) -> None:
+        try:
+            await job_store.save(job.id, job.owner_id, job.to_dict())
+        except Exception:
+            # Progress is best effort; the job itself carries on.
+            logger.exception(f"Could not save the state of job {job.id}.")
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+
+JOBS = JobRegistry()
@@ -0,0 +1,168 @@
+"""MinHash signatures and LSH banding for near-duplicate chunk detection.
+
+Revised copies of the same policy produce chunks that differ in a few words.
+A chunk's text is reduced to the set of its character shingles (`SHINGLE_SIZE`
+characters, after lowercasing and collapsing whitespace), and the set to a
+MinHash signature of `NUM_PERMUTATIONS` 32-bit values; the share of equal
+values between two signatures estimates the Jaccard similarity of their sets.
+
+To find candidates without comparing every pair, signatures are cut into
+`NUM_BANDS` bands of `ROWS_PER_BAND` values, each hashed to a 64-bit band key:
+chunks sharing a band key are candidates, and are confirmed by their estimated
+similarity. With 16 bands of 8 rows, pairs of similarity 0.9 are candidates
+with probability > 0.999, pairs of 0.8 with 0.95, and pairs below 0.5 with
+less than 0.07.
+
+Signatures are persisted, so every hash is seeded and stable across processes.
+Shingles compare characters, so translations of a text are not near-duplicates
+of it.
+"""
+
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from langconnect import config
+from langconnect.models import NearDuplicateConfig
+
+SHINGLE_SIZE = 5
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+
+# Multiply-shift hash functions h(x) = (a * x + b) mod 2^64 >> 32, a odd.
+_rng = np.random.default_rng(20250101)
+_A = _rng.integers(1, 2**63, NUM_PERMUTATIONS, dtype=np.uint64) * 2 + 1
+_B = _rng.integers(0, 2**63, NUM_PERMUTATIONS, dtype=np.uint64)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def resolve_near_duplicates(
+    near_duplicates: NearDuplicateConfig | dict[str, Any] | None,
+) -> NearDuplicateConfig:
+    """Fill unset fields of a near-duplicate config with the service defaults."""
+    if not isinstance(near_duplicates, NearDuplicateConfig):
+        near_duplicates = NearDuplicateConfig.model_validate(near_duplicates or {})
+    return NearDuplicateConfig(
+        mode=near_duplicates.mode or config.NEAR_DUPLICATE_MODE,
+        threshold=near_duplicates.threshold or config.NEAR_DUPLICATE_THRESHOLD,
+    )
+
+
+def shingles(text: str) -> set[str]:
+    """Character shingles of the normalized text."""
+    text = _WHITESPACE_RE.sub(" ", text.lower()).strip()
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> np.ndarray | None:
+    """MinHash signature (uint32) of the text, or None for blank text."""
+    tokens = shingles(text)
+    if not tokens:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode()) for token in tokens),
+        dtype=np.uint64,
+        count=len(tokens),
+    )
+    # uint64 arithmetic wraps around, which is the `mod 2^64`.
+    permuted = (np.outer(_A, hashes) + _B[:, None]) >> np.uint64(32)
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(sig: np.ndarray) -> list[int]:
+    """LSH band keys of a signature, as signed 64-bit integers."""
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = sig[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            band.to_bytes(2, "little") + rows.astype("<u4").tobytes(), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERMUTATIONS
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    """Serialize a signature for storage."""
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    """Deserialize a stored signature."""
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+class LSHIndex:
+    """In-memory LSH index of signatures, keyed by chunk id."""
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: dict[int, list[str]] = {}
+
+    def add(
+        self, chunk_id: str, sig: np.ndarray, keys: list[int] | None = None
+    ) -> None:
+        """Index a signature; `keys` are its band keys if already computed."""
+        if chunk_id in self._signatures:
+            return
+        self._signatures[chunk_id] = sig
+        for key in keys if keys is not None else band_keys(sig):
+            self._buckets.setdefault(key, []).append(chunk_id)
+
+    def best_match(
+        self,
+        sig: np.ndarray,
+        threshold: float,
+        *,
+        keys: list[int] | None = None,
+    ) -> tuple[str, float] | None:
+        """The most similar indexed chunk at or above the threshold, if any.
+
+        Ties are broken by chunk id, so the result does not depend on the
+        order in which candidates were indexed.
+        """
+        candidates = {
+            chunk_id
+            for key in (keys if keys is not None else band_keys(sig))
+            for chunk_id in self._buckets.get(key, ())
+        }
+        best = None
+        for chunk_id in sorted(candidates):
+            score = similarity(sig, self._signatures[chunk_id])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (chunk_id, score)
+        return best
+
+
+@dataclass
+class NearDuplicateStats:
+    """Near-duplicate detection results over one ingestion request."""
+
+    mode: str = "off"
+    checked: int = 0
+    # (alias chunk id, canonical chunk id, estimated similarity)
+    aliases: list[tuple[str, str, float]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the results for API responses and logs."""
+        return {
+            "mode": self.mode,
+            "checked": self.checked,
+            "duplicates": len(self.aliases),
+            "aliases": [
+                {"id": alias, "canonical_id": canonical, "similarity": score}
+                for alias, canonical, score in self.aliases
+            ],
+        }
@@ -0,0 +1,77 @@
+"""Opaque cursors for paging through search results.
+
+A cursor records where a page ended: the sort key and id of its last result.
+The next page continues the ordered scan strictly after that position, so
+earlier pages are never re-scored. Results are ordered by sort key, then by
+id, which keeps the order total when scores tie.
+
+The sort key depends on the path that served the page: the cosine similarity
+(descending) for the in-memory index, the vector distance (ascending) for SQL
+scans. A cursor created by one path and read by the other is converted as
+`similarity = 1 - distance`, which is exact up to float rounding.
+"""
+
+import base64
+import binascii
+from dataclasses import dataclass
+
+import orjson
+
+from langconnect.services.query_embeddings import query_key
+
+# Characters of the query key stored in the cursor.
+_QUERY_KEY_LENGTH = 16
+
+
+class CursorError(ValueError):
+    """The cursor is malformed or belongs to a different query."""
+
+
+@dataclass(frozen=True)
+class SearchPosition:
+    """The position of the last result of a page."""
+
+    # Similarity for the memory index, distance for SQL scans.
+    key: float
+    id: str
+    in_memory: bool
+
+    def similarity(self) -> float:
+        """The position's sort key as a similarity (higher is better)."""
+        return self.key if self.in_memory else 1.0 - self.key
+
+    def distance(self) -> float:
+        """The position's sort key as a distance (lower is better)."""
+        return 1.0 - self.key if self.in_memory else self.key
+
+
+def encode_cursor(position: SearchPosition, query: str) -> str:
+    """Encode a position as an opaque, URL-safe cursor bound to the query."""
+    payload = {
+        "q": query_key(query)[:_QUERY_KEY_LENGTH],
+        "k": position.key,
+        "i": position.id,
+        "m": position.in_memory,
+    }
+    return base64.urlsafe_b64encode(orjson.dumps(payload)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, query: str) -> SearchPosition:
+    """Decode a cursor created for the same query.
+
+    Raises:
+        CursorError: If the cursor is malformed or was created for another
+            query.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = orjson.loads(base64.urlsafe_b64decode(padded))
+        position = SearchPosition(
+            key=float(payload["k"]), id=str(payload["i"]), in_memory=bool(payload["m"])
+        )
+        query_prefix = payload["q"]
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise CursorError("Invalid cursor.") from None
+    if query_prefix != query_key(query)[:_QUERY_KEY_LENGTH]:
+        raise CursorError("The cursor was created for a different query.")
+    return position
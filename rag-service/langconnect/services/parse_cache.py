@@ -0,0 +1,193 @@
+"""Disk cache of parsed documents.
+
+Content refresh runs re-upload the same PDF and Word files over and over, and
+parsing them dominates ingestion. Parse output is stored on disk under
+`PARSE_CACHE_DIR`, keyed by the SHA-256 of the file, its mimetype and the
+parser version, so `process_document` can go straight to splitting when a file
+was parsed before. The parser version covers the parser class, the versions of
+the parsing libraries and, for parsers of this package, their source, so
+upgrades never serve stale output.
+
+The cache is bounded by `PARSE_CACHE_MAX_BYTES`: entries are touched when read,
+and the least recently used ones are deleted once the directory outgrows the
+limit. Workers may share the directory; entries are written atomically.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import tempfile
+from contextlib import suppress
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Any
+
+import orjson
+from langchain_core.document_loaders import BaseBlobParser
+from langchain_core.documents import Document
+
+from langconnect import config
+from langconnect.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Libraries whose upgrades may change parse output.
+_PARSING_DISTRIBUTIONS = (
+    "langchain-community",
+    "pdfminer.six",
+    "unstructured",
+    "beautifulsoup4",
+)
+_SUFFIX = ".json"
+
+
+@functools.cache
+def _class_version(cls: type) -> str:
+    parts = [f"{cls.__module__}.{cls.__qualname__}"]
+    if cls.__module__.startswith("langconnect."):
+        source = Path(inspect.getsourcefile(cls)).read_bytes()
+        parts.append(hashlib.sha256(source).hexdigest()[:16])
+    for distribution in _PARSING_DISTRIBUTIONS:
+        try:
+            parts.append(f"{distribution}=={metadata.version(distribution)}")
+        except metadata.PackageNotFoundError:
+            parts.append(f"{distribution}==none")
+    return ";".join(parts)
+
+
+def parser_version(parser: BaseBlobParser) -> str:
+    """Identify the parser and everything its output depends on."""
+    return _class_version(type(parser))
+
+
+def cache_key(content: bytes, mimetype: str, version: str) -> str:
+    """Key of the parse output of a file under a given parser version."""
+    digest = hashlib.sha256(content).hexdigest()
+    return hashlib.sha256(f"{digest}\0{mimetype}\0{version}".encode()).hexdigest()
+
+
+@dataclass
+class ParseCacheStats:
+    """Parse cache usage over one ingestion request."""
+
+    hits: int = 0
+    misses: int = 0
+    # Size of the files whose parsing was skipped.
+    bytes_saved: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the statistics for logs."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+        }
+
+
+class ParseCache:
+    """Size-bounded LRU cache of parsed documents in a directory."""
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """Create a cache; `max_bytes=0` disables it."""
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Bytes in the directory, as last scanned plus writes since.
+        self._bytes: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether lookups and writes go to disk."""
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / (key + _SUFFIX)
+
+    def get(self, key: str) -> list[Document] | None:
+        """Return the cached documents, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            entries = orjson.loads(path.read_bytes())
+            # The modification time orders entries for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            record_cache("parse", hit=False)
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable parse cache entry {path}: {e}")
+            record_cache("parse", hit=False)
+            return None
+        record_cache("parse", hit=True)
+        return [
+            Document(page_content=entry["page_content"], metadata=entry["metadata"])
+            for entry in entries
+        ]
+
+    def put(self, key: str, documents: list[Document]) -> None:
+        """Store parse output, evicting old entries beyond the size limit."""
+        if not self.enabled:
+            return
+        data = orjson.dumps(
+            [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in documents
+            ],
+            default=str,
+        )
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            Path(tmp_path).replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write parse cache entry {path}: {e}")
+            return
+        if self._bytes is None:
+            self._bytes = self._scan_size()
+        else:
+            self._bytes += len(data)
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        """(modification time, size, path) of every entry."""
+        entries = []
+        for path in self.directory.rglob(f"*{_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker.
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits its limit."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            # Evicted by another worker already.
+            with suppress(FileNotFoundError):
+                path.unlink()
+            total -= size
+        self._bytes = total
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for _, _, path in self._entries():
+            with suppress(FileNotFoundError):
+                path.unlink()
+        self._bytes = 0
+
+
+PARSE_CACHE = ParseCache(config.PARSE_CACHE_DIR, config.PARSE_CACHE_MAX_BYTES)
@@ -0,0 +1,56 @@
+"""LRU cache of query embeddings.
+
+Follow-up pages of a search, and repeated queries in general, reuse the
+embedding of the query instead of running the model again. Vectors are kept as
+float32 arrays (10 KiB for 2560 dimensions).
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from langconnect import config
+from langconnect.metrics import record_cache
+from langconnect.services.embedding_batcher import EMBEDDING_BATCHER
+
+
+def query_key(query: str) -> str:
+    """Stable key of a query under the configured embedding model."""
+    text = f"{config.EMBEDDING_MODEL_NAME}\0{query}"
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class QueryEmbeddingCache:
+    """Embed queries, remembering the `max_entries` most recently used."""
+
+    def __init__(self, max_entries: int) -> None:
+        """Create an empty cache; `max_entries=0` disables caching."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    async def embed(self, query: str) -> list[float]:
+        """Return the embedding of a query, computing it on a cache miss.
+
+        Misses are embedded in batches with concurrent ones.
+        """
+        key = query_key(query)
+        vector = self._entries.get(key)
+        if vector is not None:
+            self._entries.move_to_end(key)
+            record_cache("query_embedding", hit=True)
+            return vector.tolist()
+        record_cache("query_embedding", hit=False)
+        vector = np.asarray(await EMBEDDING_BATCHER.embed(query), dtype=np.float32)
+        if self.max_entries > 0:
+            self._entries[key] = vector
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return vector.tolist()
+
+    def clear(self) -> None:
+        """Drop every cached embedding."""
+        self._entries.clear()
+
+
+QUERY_EMBEDDINGS = QueryEmbeddingCache(config.QUERY_EMBEDDING_CACHE_SIZE)
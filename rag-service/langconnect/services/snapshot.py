@@ -0,0 +1,198 @@
+"""Portable collection snapshots.
+
+A snapshot is an uncompressed tar archive with three members, in order:
+
+- `manifest.json`: format version, embedding model name, vector dimension,
+  dtype, row count and the source collection's name and metadata.
+- `records.ndjson`: one JSON object per chunk (`id`, `document`, `metadata`).
+- `vectors.f32`: the embeddings as one contiguous little-endian float32 array
+  of shape `(count, dimension)`; row `i` belongs to line `i` of the records.
+
+Because the archive is not compressed, `vectors.f32` is stored contiguously in
+the tar file and can be memory-mapped in place (see `open_vectors`).
+"""
+
+import datetime as dt
+import os
+import tarfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+import numpy as np
+import orjson
+
+SNAPSHOT_FORMAT = "langconnect-snapshot"
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+RECORDS_NAME = "records.ndjson"
+VECTORS_NAME = "vectors.f32"
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is malformed or incompatible."""
+
+
+class SnapshotWriter:
+    """Write a snapshot incrementally, batch by batch."""
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """Create the snapshot's working files in the given directory."""
+        self.directory = Path(directory)
+        self._records = (self.directory / RECORDS_NAME).open("wb")
+        self._vectors = (self.directory / VECTORS_NAME).open("wb")
+        self.count = 0
+        self.dimension: int | None = None
+
+    def write(self, records: list[dict[str, Any]], vectors: np.ndarray) -> None:
+        """Append chunk records and their vectors (one row per record)."""
+        if len(records) != len(vectors):
+            raise SnapshotError("Each record needs exactly one vector.")
+        if not records:
+            return
+        if self.dimension is None:
+            self.dimension = int(vectors.shape[1])
+        elif vectors.shape[1] != self.dimension:
+            raise SnapshotError("All vectors in a snapshot must share a dimension.")
+        self._records.write(
+            b"".join(orjson.dumps(record) + b"\n" for record in records)
+        )
+        self._vectors.write(np.ascontiguousarray(vectors, dtype=VECTOR_DTYPE).data)
+        self.count += len(records)
+
+    def finish(self, *, model: str, collection: dict[str, Any]) -> Path:
+        """Close the working files and assemble the snapshot archive."""
+        self._records.close()
+        self._vectors.close()
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "model": model,
+            "dimension": self.dimension,
+            "dtype": VECTOR_DTYPE.str,
+            "count": self.count,
+            "collection": collection,
+            "created_at": dt.datetime.now(dt.UTC).isoformat(),
+        }
+        manifest_path = self.directory / MANIFEST_NAME
+        manifest_path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+        archive_path = self.directory / "snapshot.tar"
+        with tarfile.open(archive_path, "w", format=tarfile.PAX_FORMAT) as tar:
+            for name in (MANIFEST_NAME, RECORDS_NAME, VECTORS_NAME):
+                tar.add(self.directory / name, arcname=name)
+        for name in (MANIFEST_NAME, RECORDS_NAME, VECTORS_NAME):
+            (self.directory / name).unlink()
+        return archive_path
+
+
+class SnapshotReader:
+    """Read a snapshot archive sequentially, batch by batch."""
+
+    def __init__(self, fileobj: IO[bytes]) -> None:
+        """Open the snapshot from a seekable binary file object."""
+        try:
+            # Kept open while batches are read; the caller owns `fileobj`.
+            self._tar = tarfile.TarFile(fileobj=fileobj, mode="r")
+            members = {member.name: member for member in self._tar.getmembers()}
+        except tarfile.TarError as e:
+            raise SnapshotError(f"Not a snapshot archive: {e}")
+        missing = {MANIFEST_NAME, RECORDS_NAME, VECTORS_NAME} - members.keys()
+        if missing:
+            raise SnapshotError(f"Snapshot is missing {', '.join(sorted(missing))}.")
+        self._members = members
+        try:
+            self.manifest = orjson.loads(self._read(MANIFEST_NAME).read())
+        except (orjson.JSONDecodeError, tarfile.TarError) as e:
+            raise SnapshotError(f"Unreadable manifest: {e}")
+        if not isinstance(self.manifest, dict):
+            raise SnapshotError("Unreadable manifest: not a JSON object.")
+        if self.manifest.get("format") != SNAPSHOT_FORMAT:
+            raise SnapshotError("Unknown snapshot format.")
+        if self.manifest.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"Unsupported snapshot version {self.manifest.get('version')}."
+            )
+        count, dimension = self.manifest.get("count"), self.dimension
+        if not isinstance(count, int) or count < 0:
+            raise SnapshotError("Manifest has no valid chunk count.")
+        if count and (not isinstance(dimension, int) or dimension <= 0):
+            raise SnapshotError("Manifest has no valid vector dimension.")
+        expected = self.count * (self.dimension or 0) * VECTOR_DTYPE.itemsize
+        if members[VECTORS_NAME].size != expected:
+            raise SnapshotError("Vector data does not match the manifest.")
+
+    def _read(self, name: str) -> IO[bytes]:
+        stream = self._tar.extractfile(self._members[name])
+        if stream is None:
+            raise SnapshotError(f"{name} is not a regular file.")
+        return stream
+
+    @property
+    def count(self) -> int:
+        """Number of chunks in the snapshot."""
+        return int(self.manifest["count"])
+
+    @property
+    def dimension(self) -> int | None:
+        """Vector dimension, or None for an empty snapshot."""
+        return self.manifest.get("dimension")
+
+    def iter_batches(
+        self, batch_size: int = 1000
+    ) -> Iterator[tuple[list[dict[str, Any]], np.ndarray]]:
+        """Yield `(records, vectors)` batches in snapshot order.
+
+        Raises:
+            SnapshotError: If the records are fewer than the manifest's count,
+                not JSON objects with a `document`, or the archive is cut short.
+        """
+        if not self.count:
+            return
+        records = self._read(RECORDS_NAME)
+        vectors = self._read(VECTORS_NAME)
+        row_bytes = self.dimension * VECTOR_DTYPE.itemsize
+        remaining = self.count
+        while remaining:
+            size = min(batch_size, remaining)
+            try:
+                batch = [orjson.loads(records.readline()) for _ in range(size)]
+                data = vectors.read(size * row_bytes)
+            except (orjson.JSONDecodeError, tarfile.TarError) as e:
+                line = self.count - remaining + 1
+                raise SnapshotError(
+                    f"Snapshot records are truncated or invalid near line {line}: {e}"
+                )
+            if not all(
+                isinstance(record, dict) and isinstance(record.get("document"), str)
+                for record in batch
+            ):
+                raise SnapshotError("Snapshot records need a `document` text.")
+            if len(data) != size * row_bytes:
+                raise SnapshotError("Snapshot vectors are truncated.")
+            yield batch, np.frombuffer(data, dtype=VECTOR_DTYPE).reshape(
+                size, self.dimension
+            )
+            remaining -= size
+
+
+def open_vectors(path: str | os.PathLike) -> tuple[dict[str, Any], np.memmap]:
+    """Memory-map the vectors of a snapshot archive without extracting it.
+
+    Intended for offline tools (analysis, re-ranking experiments, migrations).
+
+    Returns:
+        The manifest and a read-only `(count, dimension)` float32 memmap.
+    """
+    with tarfile.open(path, mode="r:") as tar:
+        manifest_file = tar.extractfile(MANIFEST_NAME)
+        if manifest_file is None:
+            raise SnapshotError("Snapshot is missing its manifest.")
+        manifest = orjson.loads(manifest_file.read())
+        offset = tar.getmember(VECTORS_NAME).offset_data
+    shape = (int(manifest["count"]), int(manifest["dimension"] or 0))
+    if not shape[0]:
+        return manifest, np.zeros(shape, dtype=VECTOR_DTYPE)
+    vectors = np.memmap(path, dtype=VECTOR_DTYPE, mode="r", offset=offset, shape=shape)
+    return manifest, vectors
@@ -0,0 +1,120 @@
+"""Query-centred snippets for compact search responses."""
+
+import re
+from typing import Any, Literal
+
+ReturnMode = Literal["full", "snippet", "ids"]
+
+ELLIPSIS = "…"
+_TERM_RE = re.compile(r"\w{2,}")
+
+
+def query_terms(query: str) -> list[str]:
+    """Distinct, case-folded words of at least two characters, longest first."""
+    terms = {term.casefold() for term in _TERM_RE.findall(query)}
+    return sorted(terms, key=len, reverse=True)
+
+
+def _matches(text: str, terms: list[str]) -> list[tuple[int, int]]:
+    """Non-overlapping `(start, end)` spans of the terms in the text."""
+    if not terms:
+        return []
+    pattern = re.compile("|".join(re.escape(term) for term in terms))
+    return [match.span() for match in pattern.finditer(text.casefold())]
+
+
+def make_snippet(
+    text: str, query: str, budget: int
+) -> tuple[str, list[tuple[int, int]]]:
+    """Cut the `budget`-character window of the text that best matches the query.
+
+    The window covering the most query-term occurrences is centred on them and
+    widened to word boundaries where possible. Text cut off at either end is
+    marked with an ellipsis. Texts within the budget are returned whole.
+
+    Returns:
+        The snippet and the `(start, end)` offsets of the query terms in it.
+    """
+    spans = _matches(text, query_terms(query))
+    if len(text) <= budget:
+        return text, spans
+
+    start = 0
+    if spans:
+        # Densest run of matches that fits in the budget (two pointers).
+        best, best_count, first = (0, 0), 0, 0
+        for last in range(len(spans)):
+            while spans[last][1] - spans[first][0] > budget:
+                first += 1
+            if last - first + 1 > best_count:
+                best, best_count = (first, last), last - first + 1
+        covered_start, covered_end = spans[best[0]][0], spans[best[1]][1]
+        slack = budget - (covered_end - covered_start)
+        start = max(0, min(covered_start - slack // 2, len(text) - budget))
+        # Prefer to start on a word boundary, without dropping a match.
+        boundary = text.rfind(" ", max(0, start - 20), start)
+        if boundary != -1 and start - boundary <= slack // 2:
+            start = boundary + 1
+    end = min(len(text), start + budget)
+    if end < len(text):
+        boundary = text.rfind(" ", start, end)
+        if boundary > start and (not spans or boundary >= _last_end(spans, end)):
+            end = boundary
+
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(text) else ""
+    offset = len(prefix) - start
+    highlights = [
+        (s + offset, e + offset) for s, e in spans if s >= start and e <= end
+    ]
+    return f"{prefix}{text[start:end]}{suffix}", highlights
+
+
+def _last_end(spans: list[tuple[int, int]], limit: int) -> int:
+    """End of the last match that finishes before `limit`."""
+    return max((e for _, e in spans if e <= limit), default=0)
+
+
+def shape_results(
+    results: list[dict[str, Any]],
+    query: str,
+    *,
+    mode: ReturnMode = "full",
+    snippet_chars: int = 300,
+    metadata_fields: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Trim search results to what the caller asked for.
+
+    Args:
+        results: Search results (`id`, `page_content`, `metadata`, `score`,
+            and `collection_id` for federated searches, which is kept).
+        query: The search query, used to centre snippets.
+        mode: "full" keeps the content, "snippet" replaces it with a
+            query-centred excerpt of at most `snippet_chars` characters (plus
+            ellipses) and its `highlights`, and "ids" drops it.
+        snippet_chars: Character budget of a snippet.
+        metadata_fields: If given, only these metadata keys are returned. In
+            "ids" mode metadata is omitted unless fields are requested.
+    """
+    shaped = []
+    for result in results:
+        item: dict[str, Any] = {"id": result["id"], "score": result["score"]}
+        if "collection_id" in result:
+            item["collection_id"] = result["collection_id"]
+        metadata = result.get("metadata") or {}
+        if metadata_fields is not None:
+            item["metadata"] = {
+                key: metadata[key] for key in metadata_fields if key in metadata
+            }
+        elif mode != "ids":
+            item["metadata"] = metadata
+        if mode == "full":
+            item["page_content"] = result["page_content"]
+        elif mode == "snippet":
+            snippet, highlights = make_snippet(
+                result["page_content"], query, snippet_chars
+            )
+            item["page_content"] = snippet
+            item["highlights"] = highlights
+        shaped.append(item)
+    return shaped
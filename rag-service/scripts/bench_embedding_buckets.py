@@ -0,0 +1,105 @@
+"""Benchmark ingestion embedding: length-bucketed vs. upload-order batches.
+
+Embeds the same chunks with the configured embedding model
+(`EMBEDDING_MODEL_NAME`, or the embedding server) twice per repeat:
+
+- `upload order`: consecutive batches of `INGESTION_EMBEDDING_MAX_BATCH_SIZE`
+  chunks, as ingestion sent them before bucketing;
+- `bucketed`: `embed_by_length`, batches of similar token length within
+  `INGESTION_EMBEDDING_TOKEN_BUDGET`.
+
+Both are measured end to end, so sorting done by the model itself (as
+sentence-transformers does within a call) is part of both timings. Reports the
+median texts and tokens per second.
+
+Usage:
+    uv run python scripts/bench_embedding_buckets.py
+    uv run python scripts/bench_embedding_buckets.py --chunks 2000 --long-share 0.05
+
+Chunks are synthetic: mostly short snippets and a share of long passages,
+shuffled as a mixed upload (DDL files, notes and documents) would be.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from langconnect import config
+from langconnect.services.chunking import count_tokens
+from langconnect.services.embedding_buckets import embed_by_length
+
+WORDS = [
+    "연차",
+    "휴가",
+    "규정",
+    "사내",
+    "employee",
+    "leave",
+    "policy",
+    "approval",
+    "manager",
+    "access",
+]
+
+
+def make_chunks(count: int, long_share: float, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(count):
+        long = rng.random() < long_share
+        words = rng.randint(150, 300) if long else rng.randint(3, 20)
+        chunks.append(" ".join(rng.choice(WORDS) for _ in range(words)))
+    return chunks
+
+
+def embed_in_upload_order(texts: list[str], embed_batch, max_batch_size: int) -> None:
+    for start in range(0, len(texts), max_batch_size):
+        embed_batch(texts[start : start + max_batch_size])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--long-share", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    texts = make_chunks(args.chunks, args.long_share, args.seed)
+    lengths = [count_tokens(text) for text in texts]
+    tokens = sum(lengths)
+    embed_batch = config.DEFAULT_EMBEDDINGS.embed_documents
+    max_batch_size = config.INGESTION_EMBEDDING_MAX_BATCH_SIZE
+    # Warm up the model (and its server) before timing.
+    embed_batch(texts[:8])
+
+    runs = {
+        "upload order": lambda: embed_in_upload_order(
+            texts, embed_batch, max_batch_size
+        ),
+        "bucketed": lambda: embed_by_length(texts, embed_batch, lengths=lengths),
+    }
+    seconds: dict[str, list[float]] = {name: [] for name in runs}
+    for _ in range(args.repeat):
+        for name, run in runs.items():
+            start = time.perf_counter()
+            run()
+            seconds[name].append(time.perf_counter() - start)
+
+    print(f"{args.chunks} chunks, {tokens} tokens, model {config.EMBEDDING_MODEL_NAME}")
+    print(f"{'batches':<14}{'median s':>10}{'texts/s':>10}{'tokens/s':>12}")
+    for name, samples in seconds.items():
+        median = statistics.median(samples)
+        print(
+            f"{name:<14}{median:>10.2f}{args.chunks / median:>10.1f}"
+            f"{tokens / median:>12.1f}"
+        )
+    speedup = statistics.median(seconds["upload order"]) / statistics.median(
+        seconds["bucketed"]
+    )
+    print(f"speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
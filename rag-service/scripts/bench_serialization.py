@@ -0,0 +1,156 @@
+"""Benchmark list-response assembly: per-row Python vs. database-side JSON.
+
+Compares the previous path (fetch `cmetadata` as text, `json.loads` every row,
+rebuild dicts, re-validate through Pydantic and encode with the stdlib) with
+the current path (one `json_agg` payload decoded by orjson, returned through
+`ORJSONResponse`).
+
+Usage:
+    uv run python scripts/bench_serialization.py --rows 5000
+    uv run python scripts/bench_serialization.py --rows 5000 --dsn postgresql://...
+
+Without `--dsn` the rows are synthetic and only the Python side is measured.
+With `--dsn` both SQL variants are also run against a scratch table.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+
+import asyncpg
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from langconnect.models import DocumentResponse
+
+DOCUMENTS_ADAPTER = TypeAdapter(list[DocumentResponse])
+
+
+def make_rows(count: int) -> list[dict]:
+    collection_id = str(uuid.uuid4())
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "document": "lorem ipsum dolor sit amet " * 40,
+            "cmetadata": json.dumps(
+                {
+                    "file_id": str(uuid.uuid4()),
+                    "filename": f"file_{i}.pdf",
+                    "description": "Annual leave policy",
+                    "source": None,
+                }
+            ),
+            "collection_id": collection_id,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_path(rows: list[dict]) -> bytes:
+    docs = [
+        {
+            "id": r["id"],
+            "content": r["document"],
+            "metadata": json.loads(r["cmetadata"]) if r["cmetadata"] else {},
+            "collection_id": r["collection_id"],
+        }
+        for r in rows
+    ]
+    validated = DOCUMENTS_ADAPTER.validate_python(docs)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def json_agg_path(payload: str) -> bytes:
+    return orjson.dumps(orjson.loads(payload))
+
+
+def timeit(fn: Callable[..., object], *args: object, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+async def bench_database(dsn: str, rows: list[dict], repeat: int) -> None:
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute(
+            "CREATE TEMP TABLE bench_rows"
+            " (id text, collection_id text, document text, cmetadata jsonb)"
+        )
+        await conn.executemany(
+            "INSERT INTO bench_rows VALUES ($1, $2, $3, $4::jsonb)",
+            [
+                (r["id"], r["collection_id"], r["document"], r["cmetadata"])
+                for r in rows
+            ],
+        )
+
+        async def legacy() -> None:
+            records = await conn.fetch(
+                "SELECT id, collection_id, document, cmetadata::text FROM bench_rows"
+            )
+            legacy_path([dict(r) for r in records])
+
+        async def aggregated() -> None:
+            payload = await conn.fetchval(
+                """
+                SELECT json_agg(json_build_object(
+                         'id', id, 'content', document,
+                         'metadata', cmetadata, 'collection_id', collection_id))::text
+                  FROM bench_rows
+                """
+            )
+            json_agg_path(payload)
+
+        for name, fn in (("legacy", legacy), ("json_agg", aggregated)):
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await fn()
+                samples.append(time.perf_counter() - start)
+            print(f"db+python {name:>9}: {statistics.median(samples) * 1000:8.2f} ms")
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--dsn", default=None)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    payload = json.dumps(
+        [
+            {
+                "id": r["id"],
+                "content": r["document"],
+                "metadata": json.loads(r["cmetadata"]),
+                "collection_id": r["collection_id"],
+            }
+            for r in rows
+        ]
+    )
+
+    legacy = timeit(legacy_path, rows, repeat=args.repeat)
+    aggregated = timeit(json_agg_path, payload, repeat=args.repeat)
+    print(f"rows: {args.rows}")
+    print(f"python    {'legacy':>9}: {legacy * 1000:8.2f} ms")
+    print(f"python    {'json_agg':>9}: {aggregated * 1000:8.2f} ms")
+    print(f"speedup: {legacy / aggregated:.1f}x")
+
+    if args.dsn:
+        asyncio.run(bench_database(args.dsn, rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
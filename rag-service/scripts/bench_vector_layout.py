@@ -0,0 +1,243 @@
+r"""Benchmark vector scans: combined rows vs. a separate vector table.
+
+Builds both layouts in a scratch schema with the same synthetic data:
+
+- `combined`: one table holding id, collection, vector, text and metadata
+  (the default `langchain_pg_embedding` layout);
+- `split`: a narrow vector table scanned for the top-k, joined to a text and
+  metadata table for the final rows only (`EMBEDDING_VECTOR_TABLE=true`).
+
+For each layout it reports the median top-k query latency and the buffers
+touched by one query (from `EXPLAIN (ANALYZE, BUFFERS)`).
+
+Usage:
+    uv run python scripts/bench_vector_layout.py --dsn postgresql://...
+    uv run python scripts/bench_vector_layout.py --dsn ... --rows 50000 \
+        --collections 10 --dimension 2560 --repeat 20
+
+The scratch schema is dropped at the end unless `--keep` is given.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+import uuid
+
+import asyncpg
+import numpy as np
+
+SCHEMA = "bench_vector_layout"
+WORDS = [
+    "연차",
+    "휴가",
+    "규정",
+    "사내",
+    "employee",
+    "leave",
+    "policy",
+    "approval",
+    "manager",
+    "access",
+]
+
+COMBINED_QUERY = """
+    SELECT id, document, cmetadata, embedding <=> $1::real[]::vector AS distance
+      FROM combined
+     WHERE collection_id = $2
+     ORDER BY embedding <=> $1::real[]::vector
+     LIMIT $3
+"""
+
+SPLIT_QUERY = """
+    WITH top AS MATERIALIZED (
+      SELECT id, embedding <=> $1::real[]::vector AS distance
+        FROM split_vector
+       WHERE collection_id = $2
+       ORDER BY embedding <=> $1::real[]::vector
+       LIMIT $3
+    )
+    SELECT top.*, t.document, t.cmetadata
+      FROM top
+      JOIN split_text AS t
+        ON t.id = top.id
+     ORDER BY top.distance
+"""
+
+
+def random_vectors(count: int, dimension: int, rng: np.random.Generator):
+    vectors = rng.standard_normal((count, dimension), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def random_document(rng: random.Random, chars: int) -> str:
+    words: list[str] = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+async def create_tables(conn: asyncpg.Connection) -> None:
+    await conn.execute(
+        f"""
+        CREATE EXTENSION IF NOT EXISTS vector;
+        DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+        CREATE SCHEMA {SCHEMA};
+        SET search_path TO {SCHEMA}, public;
+        CREATE TABLE staging (
+          id text, collection_id uuid, embedding real[], document text,
+          cmetadata text
+        );
+        CREATE TABLE combined (
+          id text PRIMARY KEY, collection_id uuid, embedding vector,
+          document text, cmetadata jsonb
+        );
+        CREATE INDEX ON combined (collection_id);
+        CREATE TABLE split_text (
+          id text PRIMARY KEY, collection_id uuid, document text, cmetadata jsonb
+        );
+        CREATE TABLE split_vector (
+          id text PRIMARY KEY REFERENCES split_text (id) ON DELETE CASCADE,
+          collection_id uuid NOT NULL,
+          embedding vector NOT NULL
+        );
+        ALTER TABLE split_vector ALTER COLUMN embedding SET STORAGE EXTERNAL;
+        CREATE INDEX ON split_vector (collection_id);
+        """
+    )
+
+
+async def load(conn: asyncpg.Connection, args: argparse.Namespace) -> list[str]:
+    rng = np.random.default_rng(args.seed)
+    text_rng = random.Random(args.seed)
+    collection_ids = [str(uuid.uuid4()) for _ in range(args.collections)]
+    batch_size = 1000
+    for offset in range(0, args.rows, batch_size):
+        count = min(batch_size, args.rows - offset)
+        vectors = random_vectors(count, args.dimension, rng)
+        await conn.copy_records_to_table(
+            "staging",
+            records=[
+                (
+                    str(uuid.uuid4()),
+                    uuid.UUID(collection_ids[(offset + i) % args.collections]),
+                    vector,
+                    random_document(text_rng, args.chars),
+                    json.dumps({"file_id": str(uuid.uuid4()), "ordinal": i}),
+                )
+                for i, vector in enumerate(vectors.tolist())
+            ],
+            schema_name=SCHEMA,
+        )
+    await conn.execute(
+        """
+        INSERT INTO combined
+        SELECT id, collection_id, embedding::vector, document, cmetadata::jsonb
+          FROM staging;
+        INSERT INTO split_text
+        SELECT id, collection_id, document, cmetadata::jsonb FROM staging;
+        INSERT INTO split_vector
+        SELECT id, collection_id, embedding::vector FROM staging;
+        DROP TABLE staging;
+        ANALYZE;
+        """
+    )
+    return collection_ids
+
+
+def buffers(plan: dict) -> dict[str, int]:
+    return {
+        key: plan.get(f"Shared {key.title()} Blocks", 0)
+        for key in ("hit", "read")
+    }
+
+
+async def measure(
+    conn: asyncpg.Connection,
+    query: str,
+    collection_id: str,
+    queries: np.ndarray,
+    k: int,
+) -> tuple[float, dict[str, int]]:
+    # Warm the cache once, so both layouts are measured from memory.
+    await conn.fetch(query, queries[0].tolist(), collection_id, k)
+    samples = []
+    for vector in queries:
+        start = time.perf_counter()
+        await conn.fetch(query, vector.tolist(), collection_id, k)
+        samples.append(time.perf_counter() - start)
+    explain = await conn.fetchval(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}",
+        queries[0].tolist(),
+        collection_id,
+        k,
+    )
+    plan = json.loads(explain)[0]["Plan"]
+    return statistics.median(samples), buffers(plan)
+
+
+async def relation_size(conn: asyncpg.Connection, *tables: str) -> str:
+    size = await conn.fetchval(
+        "SELECT pg_size_pretty(sum(pg_total_relation_size(t::regclass)))"
+        "  FROM unnest($1::text[]) AS t",
+        list(tables),
+    )
+    return size
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        print(
+            f"rows: {args.rows}, collections: {args.collections}, "
+            f"dimension: {args.dimension}, text: ~{args.chars} chars, k: {args.k}"
+        )
+        await create_tables(conn)
+        start = time.perf_counter()
+        collection_ids = await load(conn, args)
+        print(f"loaded in {time.perf_counter() - start:.1f} s")
+
+        queries = random_vectors(
+            args.repeat, args.dimension, np.random.default_rng(args.seed + 1)
+        )
+        print(f"{'layout':>9} {'median ms':>10} {'hit':>8} {'read':>8}  size")
+        for name, query, tables in (
+            ("combined", COMBINED_QUERY, ("combined",)),
+            ("split", SPLIT_QUERY, ("split_vector", "split_text")),
+        ):
+            latency, touched = await measure(
+                conn, query, collection_ids[0], queries, args.k
+            )
+            size = await relation_size(conn, *tables)
+            print(
+                f"{name:>9} {latency * 1000:10.2f} "
+                f"{touched['hit']:8d} {touched['read']:8d}  {size}"
+            )
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dsn", required=True)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--collections", type=int, default=10)
+    parser.add_argument("--dimension", type=int, default=2560)
+    parser.add_argument("--chars", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
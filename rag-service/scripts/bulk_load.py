@@ -0,0 +1,381 @@
+"""Load collections described by a manifest into the RAG service.
+
+Files are uploaded one request per file, concurrently (bounded by
+`--concurrency`) over a single pooled HTTP client. Transient failures
+(connection errors, 429 and 5xx responses) are retried with exponential
+backoff. Every uploaded file is recorded in a local state file, so an
+interrupted run picks up where it stopped when started again.
+
+Modes:
+    (default)  Create missing collections and upload every manifest file that
+               the state file does not already record as loaded.
+    --diff     Compare against what the service already holds, using the
+               `sha256` stored in each file's metadata: upload new and changed
+               files, then remove the superseded versions of changed files.
+               With `--prune`, also remove files that left the manifest.
+    --reset    Delete the manifest's collections and load them from scratch.
+
+Usage:
+    uv run scripts/bulk_load.py
+    uv run scripts/bulk_load.py --diff --prune --concurrency 8
+    uv run scripts/bulk_load.py --reset --base-url http://localhost:8000
+
+Manifest format (paths are relative to the manifest file):
+    {"collections": [{"name": ..., "metadata": {...}, "directory": ...,
+                      "files": [{"filename": ..., "type": ..., ...}]}]}
+Keys of a file entry other than `filename` and `type` become file metadata.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_MANIFEST = SCRIPTS_DIR / "data" / "collections" / "manifest.json"
+DEFAULT_STATE = SCRIPTS_DIR / ".bulk_load_state.json"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LIST_PAGE_SIZE = 100
+
+
+@dataclass
+class FileTask:
+    collection: str
+    path: Path
+    mimetype: str
+    metadata: dict[str, Any]
+    sha256: str
+    size: int
+    # file_ids of earlier versions to remove once this upload succeeds (--diff).
+    supersedes: list[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.collection}/{self.path.name}"
+
+
+@dataclass
+class Report:
+    uploaded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    deleted: int = 0
+    bytes: int = 0
+    chunks: int = 0
+    retries: int = 0
+    failures: list[str] = field(default_factory=list)
+
+
+class StateFile:
+    """Progress record that survives interrupted runs.
+
+    Maps `"<collection>/<filename>"` to the collection id, content hash and
+    chunk count of the last successful upload.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            self.entries = json.loads(path.read_text(encoding="utf-8"))
+
+    def is_loaded(self, task: FileTask, collection_id: str) -> bool:
+        entry = self.entries.get(task.key)
+        return (
+            entry is not None
+            and entry["collection_id"] == collection_id
+            and entry["sha256"] == task.sha256
+        )
+
+    def forget_collection(self, name: str) -> None:
+        prefix = f"{name}/"
+        self.entries = {
+            key: value
+            for key, value in self.entries.items()
+            if not key.startswith(prefix)
+        }
+        self.save()
+
+    def record(self, task: FileTask, collection_id: str, chunks: int) -> None:
+        self.entries[task.key] = {
+            "collection_id": collection_id,
+            "sha256": task.sha256,
+            "chunks": chunks,
+        }
+        self.save()
+
+    def save(self) -> None:
+        # Write-then-rename, so a crash never leaves a truncated state file.
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(self.entries, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        tmp.replace(self.path)
+
+
+class Loader:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        state: StateFile,
+        *,
+        concurrency: int,
+        max_attempts: int,
+        backoff: float,
+    ) -> None:
+        self.client = client
+        self.state = state
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.report = Report()
+
+    async def request(
+        self, method: str, url: str, **kwargs: object
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures with backoff."""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                response = await self.client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    return response
+                error: Exception = httpx.HTTPStatusError(
+                    f"{response.status_code} {response.text[:200]}",
+                    request=response.request,
+                    response=response,
+                )
+            except httpx.TransportError as e:
+                error = e
+            if attempt == self.max_attempts:
+                raise error
+            self.report.retries += 1
+            delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+            print(f"  retry {attempt}/{self.max_attempts - 1} {url}: {error}")
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def collections_by_name(self) -> dict[str, dict[str, Any]]:
+        response = await self.request("GET", "/collections")
+        return {collection["name"]: collection for collection in response.json()}
+
+    async def ensure_collection(
+        self, spec: dict[str, Any], existing: dict[str, dict[str, Any]]
+    ) -> str:
+        if spec["name"] in existing:
+            return existing[spec["name"]]["uuid"]
+        response = await self.request(
+            "POST",
+            "/collections",
+            json={"name": spec["name"], "metadata": spec.get("metadata", {})},
+        )
+        print(f"Created collection '{spec['name']}'.")
+        return response.json()["uuid"]
+
+    async def remote_files(self, collection_id: str) -> dict[str, list[dict]]:
+        """Map each filename in the collection to its stored file versions."""
+        files: dict[str, list[dict]] = {}
+        offset = 0
+        while True:
+            response = await self.request(
+                "GET",
+                f"/collections/{collection_id}/documents",
+                params={"limit": LIST_PAGE_SIZE, "offset": offset},
+            )
+            page = response.json()
+            for document in page:
+                metadata = document["metadata"]
+                files.setdefault(metadata.get("filename", ""), []).append(
+                    {"file_id": metadata["file_id"], "sha256": metadata.get("sha256")}
+                )
+            if len(page) < LIST_PAGE_SIZE:
+                return files
+            offset += LIST_PAGE_SIZE
+
+    async def delete_file(self, collection_id: str, file_id: str) -> None:
+        await self.request(
+            "DELETE", f"/collections/{collection_id}/documents/{file_id}"
+        )
+        self.report.deleted += 1
+
+    async def upload(self, task: FileTask, collection_id: str) -> None:
+        async with self.semaphore:
+            try:
+                content = await asyncio.to_thread(task.path.read_bytes)
+                response = await self.request(
+                    "POST",
+                    f"/collections/{collection_id}/documents",
+                    files=[("files", (task.path.name, content, task.mimetype))],
+                    data={
+                        "metadatas_json": json.dumps(
+                            [task.metadata], ensure_ascii=False
+                        )
+                    },
+                )
+                for file_id in task.supersedes:
+                    await self.delete_file(collection_id, file_id)
+            except (httpx.HTTPError, OSError) as e:
+                self.report.failed += 1
+                self.report.failures.append(f"{task.key}: {e}")
+                print(f"  failed   {task.key}: {e}", file=sys.stderr)
+                return
+        chunks = len(response.json().get("added_chunk_ids", []))
+        self.state.record(task, collection_id, chunks)
+        self.report.uploaded += 1
+        self.report.bytes += task.size
+        self.report.chunks += chunks
+        print(f"  uploaded {task.key} ({chunks} chunks)")
+
+
+def sha256_of(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(path: Path) -> list[dict[str, Any]]:
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    collections = manifest["collections"]
+    for spec in collections:
+        directory = path.parent / spec.get("directory", spec["name"])
+        tasks = []
+        for entry in spec["files"]:
+            file_path = directory / entry["filename"]
+            metadata = {k: v for k, v in entry.items() if k != "type"}
+            sha256 = sha256_of(file_path)
+            metadata["sha256"] = sha256
+            tasks.append(
+                FileTask(
+                    collection=spec["name"],
+                    path=file_path,
+                    mimetype=entry.get("type", "application/octet-stream"),
+                    metadata=metadata,
+                    sha256=sha256,
+                    size=file_path.stat().st_size,
+                )
+            )
+        spec["tasks"] = tasks
+    return collections
+
+
+async def run(args: argparse.Namespace) -> Report:
+    collections = load_manifest(args.manifest)
+    state = StateFile(args.state)
+    limits = httpx.Limits(
+        max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency,
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        loader = Loader(
+            client,
+            state,
+            concurrency=args.concurrency,
+            max_attempts=args.max_attempts,
+            backoff=args.backoff,
+        )
+        existing = await loader.collections_by_name()
+
+        if args.reset:
+            for spec in collections:
+                if spec["name"] in existing:
+                    uuid = existing.pop(spec["name"])["uuid"]
+                    await loader.request("DELETE", f"/collections/{uuid}")
+                    print(f"Deleted collection '{spec['name']}'.")
+                state.forget_collection(spec["name"])
+
+        uploads = []
+        for spec in collections:
+            collection_id = await loader.ensure_collection(spec, existing)
+            remote = await loader.remote_files(collection_id) if args.diff else {}
+            for task in spec["tasks"]:
+                if args.diff:
+                    versions = remote.pop(task.path.name, [])
+                    if any(v["sha256"] == task.sha256 for v in versions):
+                        loader.report.skipped += 1
+                        continue
+                    task.supersedes = [v["file_id"] for v in versions]
+                elif state.is_loaded(task, collection_id):
+                    loader.report.skipped += 1
+                    continue
+                uploads.append(loader.upload(task, collection_id))
+            if args.diff and args.prune:
+                for filename, versions in remote.items():
+                    for version in versions:
+                        await loader.delete_file(collection_id, version["file_id"])
+                    print(f"  pruned   {spec['name']}/{filename}")
+
+        print(
+            f"Uploading {len(uploads)} file(s), "
+            f"skipping {loader.report.skipped} up-to-date file(s)."
+        )
+        await asyncio.gather(*uploads)
+        return loader.report
+
+
+def print_report(report: Report, elapsed: float) -> None:
+    mib = report.bytes / (1 << 20)
+    seconds = elapsed or float("inf")
+    print()
+    print(
+        f"uploaded: {report.uploaded} file(s), {mib:.2f} MiB, "
+        f"{report.chunks} chunks"
+    )
+    print(f"skipped:  {report.skipped} file(s)")
+    print(f"deleted:  {report.deleted} file version(s)")
+    print(f"failed:   {report.failed} file(s)")
+    print(f"retries:  {report.retries}")
+    print(f"elapsed:  {elapsed:.2f} s")
+    print(
+        f"throughput: {report.uploaded / seconds:.2f} files/s, "
+        f"{report.chunks / seconds:.1f} chunks/s, {mib / seconds:.2f} MiB/s"
+    )
+    for failure in report.failures:
+        print(f"  {failure}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument("--state", type=Path, default=DEFAULT_STATE)
+    parser.add_argument(
+        "--base-url",
+        default=os.environ.get("RAG_SERVICE_URL", "http://localhost:8000"),
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--backoff", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--diff", action="store_true")
+    mode.add_argument("--reset", action="store_true")
+    parser.add_argument("--prune", action="store_true")
+    args = parser.parse_args()
+    if args.prune and not args.diff:
+        parser.error("--prune requires --diff")
+
+    start = time.perf_counter()
+    try:
+        report = asyncio.run(run(args))
+    except httpx.HTTPError as e:
+        print(f"\nAn error occurred: {e}", file=sys.stderr)
+        sys.exit(1)
+    print_report(report, time.perf_counter() - start)
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+#!/bin/bash
+# Runs once, when the primary's data directory is initialized: creates the
+# role the replica streams WAL with and lets it connect for replication.
+#
+# Commits then wait until the replica has applied them (remote_apply), so the
+# test suite sees its own writes on the replica. Drop the two ALTER SYSTEM
+# lines to observe replication lag instead.
+set -euo pipefail
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-SQL
+  CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD '${REPLICATION_PASSWORD}';
+  ALTER SYSTEM SET synchronous_standby_names = '*';
+  ALTER SYSTEM SET synchronous_commit = 'remote_apply';
+SQL
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
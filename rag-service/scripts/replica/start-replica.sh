@@ -0,0 +1,14 @@
+#!/bin/bash
+# Entrypoint of the read replica: clone the primary on first start, then run as
+# a hot standby streaming from it.
+set -euo pipefail
+
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  echo "Cloning $PRIMARY_HOST into $PGDATA..."
+  rm -rf "${PGDATA:?}"/*
+  pg_basebackup --host="$PRIMARY_HOST" --username=replicator \
+    --pgdata="$PGDATA" --wal-method=stream --write-recovery-conf --progress
+  chmod 0700 "$PGDATA"
+fi
+
+exec postgres -c hot_standby=on
@@ -44,7 +44,9 @@ def test_db_table_schemas_search():
         print("Query:", query)
         print("Required tables:", required_tables)
         print("Retrieved files:")
-        results = document_search(collection_id=collection_id, query=query, limit=10)
+        # Each table schema is a single chunk, so ask for exactly the tables needed.
+        limit = len(required_tables.split(","))
+        results = document_search(collection_id=collection_id, query=query, limit=limit)
         for result in results:
             filename, score = result["metadata"]["filename"], result["score"]
             print(filename, score)
@@ -1,5 +1,10 @@
+import asyncio
 from uuid import UUID
 
+import pytest
+
+from langconnect import config
+from langconnect.database.connection import get_db_connection
 from tests.unit_tests.fixtures import get_async_test_client
 
 USER_1_HEADERS = {
@@ -23,6 +28,18 @@ async def test_health() -> None:
         assert response.json() == {"status": "ok"}
 
 
+async def test_metrics() -> None:
+    """Test the metrics endpoint reports per-route latency."""
+    async with get_async_test_client() as client:
+        response = await client.get("/health")
+        response.raise_for_status()
+        response = await client.get("/metrics")
+        response.raise_for_status()
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "langconnect_http_request_duration_seconds_count" in response.text
+        assert 'route="/health"' in response.text
+
+
 async def test_create_and_get_collection() -> None:
     """Test creating and retrieving a collection."""
     async with get_async_test_client() as client:
@@ -315,6 +332,76 @@ async def test_list_empty_and_multiple_collections() -> None:
             assert n in got
 
 
+async def test_list_collections_payload_shape() -> None:
+    """The Postgres-built list payload matches the collection response."""
+    metadata = {"purpose": "연차 규정", "tags": ["hr", None], "nested": {"n": 1.5}}
+    async with get_async_test_client() as client:
+        created = []
+        for name in ("beta", "alpha"):
+            response = await client.post(
+                "/collections",
+                json={"name": name, "metadata": metadata},
+                headers=USER_1_HEADERS,
+            )
+            created.append(response.json())
+
+        listed = await client.get("/collections", headers=USER_1_HEADERS)
+
+        assert listed.status_code == 200
+        # Ordered by name; `name` is taken out of the metadata.
+        assert listed.json() == created[::-1]
+        assert all("name" not in c["metadata"] for c in listed.json())
+
+
+async def test_update_collection_metadata_round_trip() -> None:
+    """Metadata passed to `$1::jsonb` as a dict is stored as a JSON object."""
+    metadata = {
+        "text": 'quoted "연차" text',
+        "flag": True,
+        "empty": None,
+        "ratio": 0.25,
+        "items": [1, {"deep": ["x"]}],
+    }
+    async with get_async_test_client() as client:
+        response = await client.post(
+            "/collections", json={"name": "round_trip"}, headers=USER_1_HEADERS
+        )
+        collection = response.json()
+
+        updated = await client.patch(
+            f"/collections/{collection['uuid']}",
+            json={"metadata": metadata},
+            headers=USER_1_HEADERS,
+        )
+        fetched = await client.get(
+            f"/collections/{collection['uuid']}", headers=USER_1_HEADERS
+        )
+        async with get_db_connection() as conn:
+            stored = await conn.fetchrow(
+                "SELECT jsonb_typeof(cmetadata::jsonb) AS type,"
+                " cmetadata->'items'->1->'deep'->>0 AS deep"
+                " FROM langchain_pg_collection WHERE uuid = $1",
+                collection["uuid"],
+            )
+
+        expected = {**metadata, "owner_id": collection["metadata"]["owner_id"]}
+        assert updated.json()["metadata"] == expected
+        assert fetched.json()["metadata"] == expected
+        # Not double-encoded as a JSON string.
+        assert dict(stored) == {"type": "object", "deep": "x"}
+
+
+async def test_pooled_connections_are_reused() -> None:
+    """Releasing a connection returns it to the pool instead of closing it."""
+    async with get_async_test_client():
+        async with get_db_connection() as conn:
+            first = await conn.fetchval("SELECT pg_backend_pid()")
+        async with get_db_connection() as conn:
+            second = await conn.fetchval("SELECT pg_backend_pid()")
+
+        assert first == second
+
+
 # Check ownership of collections.
 async def test_ownership() -> None:
     """Try accessing and deleting collections owned by user 1 using user 2."""
@@ -361,3 +448,195 @@ async def test_ownership() -> None:
             f"/collections/{collection_id}", headers=USER_1_HEADERS
         )
         assert r5.status_code == 204
+
+
+async def test_create_collection_with_invalid_chunking() -> None:
+    """Test that an invalid chunking config is rejected."""
+    async with get_async_test_client() as client:
+        response = await client.post(
+            "/collections",
+            json={
+                "name": "bad_chunking",
+                "metadata": {"chunking": {"strategy": "nope", "chunk_size": -1}},
+            },
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 400
+
+
+async def test_collection_export_and_import_snapshot() -> None:
+    """Test that a snapshot restores a collection's chunks without re-uploading."""
+    async with get_async_test_client() as client:
+        source = await client.post(
+            "/collections", json={"name": "snapshot_source"}, headers=USER_1_HEADERS
+        )
+        source_id = source.json()["uuid"]
+        files = [
+            ("files", ("a.txt", b"Annual leave is 15 days.", "text/plain")),
+            ("files", ("b.txt", b"The web server runs on port 8080.", "text/plain")),
+        ]
+        upload = await client.post(
+            f"/collections/{source_id}/documents", files=files, headers=USER_1_HEADERS
+        )
+        assert upload.status_code == 200
+
+        export = await client.get(
+            f"/collections/{source_id}/export", headers=USER_1_HEADERS
+        )
+        assert export.status_code == 200
+        assert export.headers["content-type"] == "application/x-tar"
+
+        target = await client.post(
+            "/collections",
+            json={
+                "name": "snapshot_target",
+                "metadata": {"near_duplicates": {"mode": "skip"}},
+            },
+            headers=USER_1_HEADERS,
+        )
+        target_id = target.json()["uuid"]
+        imported = await client.post(
+            f"/collections/{target_id}/import",
+            files=[("snapshot", ("s.tar", export.content, "application/x-tar"))],
+            headers=USER_1_HEADERS,
+        )
+        assert imported.status_code == 200
+        assert imported.json() == {"success": True, "imported_chunks": 2}
+
+        search = await client.post(
+            f"/collections/{target_id}/documents/search",
+            json={"query": "web server port", "limit": 1},
+            headers=USER_1_HEADERS,
+        )
+        assert search.status_code == 200
+        assert search.json()[0]["page_content"] == "The web server runs on port 8080."
+
+        # Imported chunks are indexed for near-duplicate detection.
+        again = await client.post(
+            f"/collections/{target_id}/documents",
+            files=[("files", ("c.txt", b"Annual leave is 15 days.", "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        assert again.json()["added_chunk_ids"] == []
+        assert len(again.json()["near_duplicates"]["aliases"]) == 1
+
+        # Garbage is rejected.
+        bad = await client.post(
+            f"/collections/{target_id}/import",
+            files=[("snapshot", ("s.tar", b"not a tar", "application/x-tar"))],
+            headers=USER_1_HEADERS,
+        )
+        assert bad.status_code == 400
+
+
+async def test_collection_import_remaps_duplicate_of() -> None:
+    """Test that imported near-duplicates point at the imported canonical chunk."""
+    async with get_async_test_client() as client:
+        source = await client.post(
+            "/collections",
+            json={
+                "name": "snapshot_flag_source",
+                "metadata": {"near_duplicates": {"mode": "flag"}},
+            },
+            headers=USER_1_HEADERS,
+        )
+        source_id = source.json()["uuid"]
+        for name in ("a.txt", "b.txt"):
+            await client.post(
+                f"/collections/{source_id}/documents",
+                files=[("files", (name, b"Annual leave is 15 days.", "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+        export = await client.get(
+            f"/collections/{source_id}/export", headers=USER_1_HEADERS
+        )
+
+        target = await client.post(
+            "/collections",
+            json={"name": "snapshot_flag_target"},
+            headers=USER_1_HEADERS,
+        )
+        target_id = target.json()["uuid"]
+        imported = await client.post(
+            f"/collections/{target_id}/import",
+            files=[("snapshot", ("s.tar", export.content, "application/x-tar"))],
+            headers=USER_1_HEADERS,
+        )
+        assert imported.json()["imported_chunks"] == 2
+
+        listed = await client.get(
+            f"/collections/{target_id}/documents", headers=USER_1_HEADERS
+        )
+        docs = listed.json()
+        flagged = [doc for doc in docs if "duplicate_of" in doc["metadata"]]
+        canonical = [doc for doc in docs if "duplicate_of" not in doc["metadata"]]
+        assert len(flagged) == len(canonical) == 1
+        assert flagged[0]["metadata"]["duplicate_of"] == canonical[0]["id"]
+
+
+async def test_collection_stats() -> None:
+    """GET /stats reports counts and storage statistics of a collection."""
+    async with get_async_test_client() as client:
+        r1 = await client.post(
+            "/collections", json={"name": "stats_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = r1.json()["uuid"]
+        for name in ("a.txt", "b.txt"):
+            await client.post(
+                f"/collections/{collection_id}/documents",
+                files=[("files", (name, b"Some text.", "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+
+        response = await client.get(
+            f"/collections/{collection_id}/stats", headers=USER_1_HEADERS
+        )
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["rows"] == 2
+        assert stats["files"] == 2
+        assert stats["storage"]
+        for table in stats["storage"]:
+            assert table["table_bytes"] > 0
+            assert {"dead_rows", "index_bytes", "last_vacuum"} <= table.keys()
+
+        missing = await client.get(
+            "/collections/00000000-0000-0000-0000-000000000000/stats",
+            headers=USER_1_HEADERS,
+        )
+        assert missing.status_code == 404
+
+
+async def test_maintenance_requires_admin_and_runs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Maintenance is admin-only and runs the planned actions in a job."""
+    async with get_async_test_client() as client:
+        response = await client.post("/maintenance", headers=USER_1_HEADERS)
+        assert response.status_code == 403
+
+        monkeypatch.setattr(config, "ADMIN_USER_IDS", ["system_user_id"])
+        status = await client.get("/maintenance", headers=USER_1_HEADERS)
+        assert status.status_code == 200
+        assert "langchain_pg_embedding" in [t["table"] for t in status.json()["tables"]]
+
+        # A zero threshold vacuums every embedding table.
+        response = await client.post(
+            "/maintenance",
+            params={"dead_tuple_ratio": 0},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 202
+        body = response.json()
+        assert {"action": "vacuum", "target": "langchain_pg_embedding"} in [
+            {"action": a["action"], "target": a["target"]} for a in body["actions"]
+        ]
+        for _ in range(100):
+            job = (
+                await client.get(f"/jobs/{body['job']['id']}", headers=USER_1_HEADERS)
+            ).json()
+            if job["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        assert job["status"] == "succeeded"
+        assert job["done"] == len(body["actions"])
@@ -0,0 +1,60 @@
+from langconnect.services.ddl_parser import parse_create_table
+
+
+def test_columns_named_like_constraint_keywords() -> None:
+    """Columns starting with a constraint keyword are columns, not constraints."""
+    table = parse_create_table(
+        "CREATE TABLE orders ("
+        " id INT PRIMARY KEY,"
+        " key_name VARCHAR(20),"
+        " index_no INT,"
+        " check_date DATE,"
+        " unique_code TEXT,"
+        " primary_contact TEXT,"
+        " customer_id INT REFERENCES customers(id),"
+        " CONSTRAINT uq_code UNIQUE (unique_code),"
+        " KEY ix_date (check_date)"
+        ")"
+    )
+
+    assert table is not None
+    assert [column["name"] for column in table["columns"]] == [
+        "id",
+        "key_name",
+        "index_no",
+        "check_date",
+        "unique_code",
+        "primary_contact",
+        "customer_id",
+    ]
+    assert table["primary_key"] == ["id"]
+    assert table["foreign_keys"] == [
+        {
+            "columns": ["customer_id"],
+            "references_table": "customers",
+            "references_columns": ["id"],
+        }
+    ]
+
+
+def test_table_constraints() -> None:
+    """Table-level primary and foreign keys are read from their constraints."""
+    table = parse_create_table(
+        "CREATE TABLE order_items ("
+        " order_id INT,"
+        " line INT,"
+        " PRIMARY KEY (order_id, line),"
+        " FOREIGN KEY (order_id) REFERENCES orders (id)"
+        ")"
+    )
+
+    assert table is not None
+    assert [column["name"] for column in table["columns"]] == ["order_id", "line"]
+    assert table["primary_key"] == ["order_id", "line"]
+    assert table["foreign_keys"] == [
+        {
+            "columns": ["order_id"],
+            "references_table": "orders",
+            "references_columns": ["id"],
+        }
+    ]
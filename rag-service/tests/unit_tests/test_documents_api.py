@@ -1,6 +1,15 @@
+import asyncio
 import json
 from uuid import UUID
 
+import pytest
+from fastapi import HTTPException
+
+from langconnect import config
+from langconnect.database import partitioning, tombstones, vector_table
+from langconnect.database.collections import Collection
+from langconnect.database.connection import get_db_connection
+from langconnect.database.memory_index import MEMORY_INDEX
 from tests.unit_tests.fixtures import (
     get_async_test_client,
 )
@@ -104,6 +113,51 @@ async def test_documents_create_and_list_and_delete_and_search() -> None:
         assert del_resp2.status_code in (200, 204)
 
 
+async def test_documents_list_payload_shape_and_get() -> None:
+    """Test the Postgres-built document list and fetching one chunk by id."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "list_shape_col"}, headers=USER_1_HEADERS
+        )
+        collection = collection_response.json()
+        collection_id = collection["uuid"]
+        metadatas = [{"source": "a", "tags": ["x", None]}, {"source": "b"}]
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[
+                ("files", ("a.txt", b"First file.", "text/plain")),
+                ("files", ("b.txt", b"Second file.", "text/plain")),
+            ],
+            data={"metadatas_json": json.dumps(metadatas)},
+            headers=USER_1_HEADERS,
+        )
+
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+
+        assert listed.status_code == 200
+        docs = listed.json()
+        assert all(
+            set(doc) == {"id", "content", "metadata", "collection_id"} for doc in docs
+        )
+        assert {doc["collection_id"] for doc in docs} == {collection_id}
+        by_content = {doc["content"]: doc for doc in docs}
+        assert by_content["First file."]["metadata"]["tags"] == ["x", None]
+        assert by_content["Second file."]["metadata"]["source"] == "b"
+
+        # Chunks are looked up by their id column.
+        owner = collection["metadata"]["owner_id"]
+        chunk = await Collection(collection_id, owner).get(docs[0]["id"])
+        assert chunk == {
+            "id": docs[0]["id"],
+            "content": docs[0]["content"],
+            "metadata": docs[0]["metadata"],
+        }
+        with pytest.raises(HTTPException):
+            await Collection(collection_id, owner).get(str(UUID(int=0)))
+
+
 async def test_documents_create_with_invalid_metadata_json() -> None:
     """Test creating documents with invalid metadata JSON."""
     async with get_async_test_client() as client:
@@ -504,3 +558,1037 @@ async def test_documents_create_ownership_validation():
         assert response.status_code == 404
         data = response.json()
         assert "Collection not found" in data["detail"]
+
+
+async def test_documents_create_uses_collection_chunking() -> None:
+    """Test that uploads follow the collection's chunking config."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections",
+            json={
+                "name": "doc_test_chunking",
+                "metadata": {
+                    "chunking": {"chunk_size": 40, "chunk_overlap_ratio": 0.0}
+                },
+            },
+            headers=USER_1_HEADERS,
+        )
+        assert collection_response.status_code == 201
+        collection_id = collection_response.json()["uuid"]
+
+        file_content = b"First sentence here. " * 10
+        files = [("files", ("chunked.txt", file_content, "text/plain"))]
+        response = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=files,
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+        stats = response.json()["chunk_stats"]
+        assert stats["chunk_size"] == 40
+        assert stats["chunk_overlap_ratio"] == 0.0
+        assert stats["files"] == 1
+        assert stats["chunks"] > 1
+        assert stats["max_length"] <= 40
+        # Without overlap, stored text never exceeds the source text.
+        assert stats["storage_factor"] <= 1.0
+        embedding_stats = response.json()["embedding_stats"]
+        assert embedding_stats["texts"] == stats["chunks"]
+        assert embedding_stats["tokens"] <= embedding_stats["padded_tokens"]
+
+
+async def test_documents_create_sql_ddl_one_chunk_per_table() -> None:
+    """Test that SQL DDL files are chunked into exactly one chunk per table."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections",
+            json={"name": "doc_test_ddl", "metadata": {"chunking": {"chunk_size": 50}}},
+            headers=USER_1_HEADERS,
+        )
+        assert collection_response.status_code == 201
+        collection_id = collection_response.json()["uuid"]
+
+        ddl = b"""
+CREATE TABLE IF NOT EXISTS account (
+    account_id INT COMMENT 'The ID of the account',
+    district_id INT COMMENT 'Location of the branch'
+)
+COMMENT 'Table containing customer account information.'
+CREATE TABLE IF NOT EXISTS loan (
+    loan_id INT PRIMARY KEY,
+    account_id INT REFERENCES account(account_id),
+    amount INT COMMENT 'Approved loan amount in US dollars'
+)
+"""
+        # Uploaded as text/plain; the .sql extension selects the DDL parser.
+        files = [("files", ("tables.sql", ddl, "text/plain"))]
+        response = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=files,
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+        assert len(response.json()["added_chunk_ids"]) == 2
+
+        search_resp = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "loan amount", "limit": 2},
+            headers=USER_1_HEADERS,
+        )
+        assert search_resp.status_code == 200
+        tables = {r["metadata"]["table_name"]: r for r in search_resp.json()}
+        assert set(tables) == {"account", "loan"}
+        loan = tables["loan"]
+        assert loan["page_content"].startswith("CREATE TABLE IF NOT EXISTS loan (")
+        assert loan["page_content"].endswith(")")
+        assert loan["metadata"]["chunk_type"] == "table_schema"
+        assert [c["name"] for c in loan["metadata"]["columns"]] == [
+            "loan_id",
+            "account_id",
+            "amount",
+        ]
+        assert loan["metadata"]["primary_key"] == ["loan_id"]
+        assert loan["metadata"]["foreign_keys"] == [
+            {
+                "columns": ["account_id"],
+                "references_table": "account",
+                "references_columns": ["account_id"],
+            }
+        ]
+        assert tables["account"]["metadata"]["table_comment"] == (
+            "Table containing customer account information."
+        )
+
+
+async def test_documents_search_memory_index_matches_pgvector(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that the in-memory engine ranks and scores like pgvector."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "memory_index_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        files = [
+            ("files", ("a.txt", b"Annual leave is 15 days per year.", "text/plain")),
+            ("files", ("b.txt", b"The DB password rotates monthly.", "text/plain")),
+            ("files", ("c.txt", b"Lunch is served at noon.", "text/plain")),
+        ]
+        upload = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=files,
+            headers=USER_1_HEADERS,
+        )
+        assert upload.status_code == 200
+
+        async def search() -> list[dict]:
+            response = await client.post(
+                f"/collections/{collection_id}/documents/search",
+                json={"query": "how many vacation days", "limit": 3},
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        in_memory = await search()
+
+        MEMORY_INDEX.invalidate(collection_id)
+        monkeypatch.setattr(MEMORY_INDEX, "max_rows", 0)
+        from_pgvector = await search()
+
+        assert [r["id"] for r in in_memory] == [r["id"] for r in from_pgvector]
+        for a, b in zip(in_memory, from_pgvector, strict=True):
+            assert a["score"] == pytest.approx(b["score"], abs=1e-4)
+            assert a["metadata"] == b["metadata"]
+
+
+async def test_documents_search_memory_index_drops_deleted_files(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that entries loaded before a delete are not served afterwards.
+
+    Other workers still hold the entry; they are simulated by handing it out
+    again after the delete invalidated it in this process.
+    """
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "memory_stale_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        files = [
+            ("files", ("a.txt", b"Annual leave is 15 days per year.", "text/plain")),
+            ("files", ("b.txt", b"Lunch is served at noon.", "text/plain")),
+        ]
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=files,
+            headers=USER_1_HEADERS,
+        )
+
+        async def search() -> list[dict]:
+            response = await client.post(
+                f"/collections/{collection_id}/documents/search",
+                json={"query": "how many vacation days", "limit": 5},
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        hits = await search()
+        assert len(hits) == 2
+        stale = MEMORY_INDEX.lookup(collection_id, "system_user_id")
+        assert stale is not None
+        file_id = next(
+            hit["metadata"]["file_id"]
+            for hit in hits
+            if "Annual leave" in hit["page_content"]
+        )
+
+        delete = await client.delete(
+            f"/collections/{collection_id}/documents/{file_id}",
+            headers=USER_1_HEADERS,
+        )
+        assert delete.status_code == 200
+        monkeypatch.setattr(MEMORY_INDEX, "lookup", lambda *_: stale)
+
+        hits = await search()
+        assert [hit["page_content"] for hit in hits] == ["Lunch is served at noon."]
+
+
+async def test_documents_search_memory_index_sees_new_uploads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that entries loaded before an upload are not served afterwards."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "memory_upload_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("a.txt", b"Lunch is served at noon.", "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+
+        async def search() -> list[dict]:
+            response = await client.post(
+                f"/collections/{collection_id}/documents/search",
+                json={"query": "how many vacation days", "limit": 5},
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        assert len(await search()) == 1
+        stale = MEMORY_INDEX.lookup(collection_id, "system_user_id")
+        assert stale is not None
+
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("b.txt", b"Annual leave is 15 days.", "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        monkeypatch.setattr(MEMORY_INDEX, "lookup", lambda *_: stale)
+
+        assert len(await search()) == 2
+
+
+async def test_documents_partitioned_layout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the per-collection partition lifecycle and search on partitions."""
+    monkeypatch.setattr(partitioning, "_partitioned", None)
+    monkeypatch.setattr(partitioning, "_indexed", set())
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", 0)
+
+    async def relation_exists(name: str) -> bool:
+        async with get_db_connection() as conn:
+            return await conn.fetchval("SELECT to_regclass($1)", name) is not None
+
+    async with get_async_test_client() as client:
+        async with get_db_connection() as conn:
+            await partitioning.migrate(conn)
+
+        collection_response = await client.post(
+            "/collections", json={"name": "partitioned_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        partition = partitioning.partition_name(collection_id)
+        assert await relation_exists(partition)
+
+        files = [
+            ("files", ("a.txt", b"Annual leave is 15 days per year.", "text/plain")),
+            ("files", ("b.txt", b"Lunch is served at noon.", "text/plain")),
+        ]
+        upload = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=files,
+            headers=USER_1_HEADERS,
+        )
+        assert upload.status_code == 200
+        assert await relation_exists(f"{partition}_hnsw")
+
+        search = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "how many vacation days", "limit": 1},
+            headers=USER_1_HEADERS,
+        )
+        assert search.status_code == 200
+        assert "Annual leave" in search.json()[0]["page_content"]
+
+        listing = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        assert len(listing.json()) == 2
+
+        delete = await client.delete(
+            f"/collections/{collection_id}", headers=USER_1_HEADERS
+        )
+        assert delete.status_code == 204
+        assert not await relation_exists(partition)
+
+
+@pytest.mark.parametrize("memory_index_max_rows", [2000, 0])
+async def test_documents_search_mmr_skips_duplicates(
+    monkeypatch: pytest.MonkeyPatch, memory_index_max_rows: int
+) -> None:
+    """Test that MMR search returns diverse chunks, from memory and from SQL."""
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", memory_index_max_rows)
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "mmr_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        leave = b"Annual leave is 15 days per year."
+        files = [
+            ("files", ("leave.txt", leave, "text/plain")),
+            ("files", ("leave_copy.txt", leave, "text/plain")),
+            ("files", ("approval.txt", b"Leave needs manager approval.", "text/plain")),
+            ("files", ("lunch.txt", b"Lunch is served at noon.", "text/plain")),
+        ]
+        upload = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=files,
+            headers=USER_1_HEADERS,
+        )
+        assert upload.status_code == 200
+
+        async def search(**params) -> list[dict]:
+            response = await client.post(
+                f"/collections/{collection_id}/documents/search",
+                json={"query": "how many days of annual leave", "limit": 2, **params},
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            return response.json()
+
+        similar = await search()
+        assert [r["page_content"] for r in similar] == [leave.decode()] * 2
+
+        diverse = await search(search_type="mmr", fetch_k=4, **{"lambda": 0.5})
+        assert len(diverse) == 2
+        assert diverse[0]["page_content"] == leave.decode()
+        assert diverse[1]["page_content"] != leave.decode()
+
+        # lambda = 1 ranks by relevance only, like a similarity search.
+        relevance_only = await search(search_type="mmr", **{"lambda": 1.0})
+        assert [r["score"] for r in relevance_only] == pytest.approx(
+            [r["score"] for r in similar], abs=1e-4
+        )
+
+
+@pytest.mark.parametrize("memory_index_max_rows", [2000, 0])
+async def test_documents_search_window_merges_neighbours(
+    monkeypatch: pytest.MonkeyPatch, memory_index_max_rows: int
+) -> None:
+    """Test that `window` returns each hit merged with its neighbouring chunks."""
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", memory_index_max_rows)
+    async with get_async_test_client() as client:
+        chunking = {"chunk_size": 60, "chunk_overlap_ratio": 0.2}
+        collection_response = await client.post(
+            "/collections",
+            json={"name": "window_col", "metadata": {"chunking": chunking}},
+            headers=USER_1_HEADERS,
+        )
+        collection_id = collection_response.json()["uuid"]
+        sentences = [
+            "Employees receive fifteen days of annual leave.",
+            "Unused leave days can be carried over once.",
+            "The cafeteria serves lunch from noon to one.",
+            "Parking permits are renewed every January.",
+            "Security badges must be worn at all times.",
+        ]
+        text = " ".join(sentences)
+        upload = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("policy.txt", text.encode(), "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        assert upload.status_code == 200
+
+        async def search(window: int) -> dict:
+            response = await client.post(
+                f"/collections/{collection_id}/documents/search",
+                json={"query": "cafeteria lunch hours", "limit": 1, "window": window},
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            return response.json()[0]
+
+        hit = await search(0)
+        assert "cafeteria" in hit["page_content"]
+        ordinal = hit["metadata"]["ordinal"]
+        assert "window" not in hit["metadata"]
+
+        expanded = await search(1)
+        assert expanded["id"] == hit["id"]
+        assert hit["page_content"] in expanded["page_content"]
+        assert len(expanded["page_content"]) > len(hit["page_content"])
+        # Text repeated by chunk overlap is not duplicated.
+        assert expanded["page_content"].count("cafeteria") == 1
+        first, last = expanded["metadata"]["window"]
+        assert first <= ordinal <= last
+        assert (first, last) != (ordinal, ordinal)
+
+
+async def test_documents_separate_vector_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test ingestion, search and deletion with vectors in their own table."""
+    monkeypatch.setattr(vector_table, "_split", None)
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", 0)
+
+    async def count_vectors(collection_id: str) -> int:
+        async with get_db_connection() as conn:
+            return await conn.fetchval(
+                f"SELECT count(*) FROM {vector_table.VECTOR_TABLE}"
+                " WHERE collection_id = $1",
+                UUID(collection_id),
+            )
+
+    async with get_async_test_client() as client:
+        async with get_db_connection() as conn:
+            await vector_table.migrate(conn)
+        try:
+            collection_response = await client.post(
+                "/collections", json={"name": "split_col"}, headers=USER_1_HEADERS
+            )
+            collection_id = collection_response.json()["uuid"]
+            files = [
+                ("files", ("a.txt", b"Annual leave is 15 days a year.", "text/plain")),
+                ("files", ("b.txt", b"Lunch is served at noon.", "text/plain")),
+            ]
+            upload = await client.post(
+                f"/collections/{collection_id}/documents",
+                files=files,
+                headers=USER_1_HEADERS,
+            )
+            assert upload.status_code == 200
+            assert await count_vectors(collection_id) == 2
+
+            for search_type in ("similarity", "mmr"):
+                search = await client.post(
+                    f"/collections/{collection_id}/documents/search",
+                    json={
+                        "query": "how many vacation days",
+                        "limit": 1,
+                        "search_type": search_type,
+                    },
+                    headers=USER_1_HEADERS,
+                )
+                assert search.status_code == 200
+                hit = search.json()[0]
+                assert "Annual leave" in hit["page_content"]
+                assert 0 < hit["score"] <= 1
+
+            # Deleting a file's chunks cascades to their vectors.
+            file_id = hit["metadata"]["file_id"]
+            delete = await client.delete(
+                f"/collections/{collection_id}/documents/{file_id}",
+                headers=USER_1_HEADERS,
+            )
+            assert delete.status_code == 200
+            assert await count_vectors(collection_id) == 1
+        finally:
+            async with get_db_connection() as conn:
+                await conn.execute(f"DROP TABLE {vector_table.VECTOR_TABLE}")
+
+
+async def test_documents_search_return_modes() -> None:
+    """Test snippet and ids-only search responses."""
+    async with get_async_test_client() as client:
+        # One chunk per document, so the hit holds the whole text.
+        collection_response = await client.post(
+            "/collections",
+            json={"name": "return_col", "metadata": {"chunking": {"chunk_size": 4000}}},
+            headers=USER_1_HEADERS,
+        )
+        collection_id = collection_response.json()["uuid"]
+        filler = "Unrelated filler text about office furniture. " * 20
+        content = f"{filler}Annual leave requires manager approval. {filler}"
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            data={"metadatas_json": '[{"source": "handbook"}]'},
+            files=[("files", ("handbook.txt", content.encode(), "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        url = f"/collections/{collection_id}/documents/search"
+        query = {"query": "leave approval", "limit": 1}
+
+        full = (await client.post(url, json=query, headers=USER_1_HEADERS)).json()
+        assert full[0]["page_content"] == content.strip()
+
+        response = await client.post(
+            url,
+            json={**query, "return": "snippet", "snippet_chars": 80},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+        snippet = response.json()[0]
+        assert snippet["id"] == full[0]["id"]
+        assert len(snippet["page_content"]) <= 82
+        assert snippet["page_content"].startswith("…")
+        highlighted = [snippet["page_content"][s:e] for s, e in snippet["highlights"]]
+        assert highlighted == ["leave", "approval"]
+
+        response = await client.post(
+            url,
+            json={**query, "return": "ids", "metadata_fields": ["source"]},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": full[0]["id"],
+                "score": full[0]["score"],
+                "metadata": {"source": "handbook"},
+            }
+        ]
+
+        response = await client.post(
+            url, json={**query, "return": "text"}, headers=USER_1_HEADERS
+        )
+        assert response.status_code == 422
+
+
+async def test_documents_delete_in_background_batches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a background file delete: batches, progress and hidden results."""
+    monkeypatch.setattr(config, "DELETE_BATCH_SIZE", 2)
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections",
+            json={
+                "name": "batch_delete_col",
+                "metadata": {"chunking": {"chunk_size": 50}},
+            },
+            headers=USER_1_HEADERS,
+        )
+        collection_id = collection_response.json()["uuid"]
+        text = " ".join(f"Paragraph {i} about vacation policy." for i in range(10))
+        upload = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("policy.txt", text.encode(), "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        chunk_count = len(upload.json()["added_chunk_ids"])
+        assert chunk_count > 2
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        file_id = listed.json()[0]["metadata"]["file_id"]
+
+        response = await client.delete(
+            f"/collections/{collection_id}/documents/{file_id}",
+            params={"background": "true"},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        for _ in range(100):
+            job = (await client.get(f"/jobs/{job_id}", headers=USER_1_HEADERS)).json()
+            if job["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        assert job["status"] == "succeeded"
+        assert job["done"] == job["total"] == chunk_count
+
+        search = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "vacation"},
+            headers=USER_1_HEADERS,
+        )
+        assert search.json() == []
+
+
+async def test_collection_reindex_swaps_in_new_chunking(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a reindex: progress, swap under the same uuid, and cleanup."""
+    monkeypatch.setattr(config, "REINDEX_BATCH_SIZE", 3)
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections",
+            json={"name": "reindex_col", "metadata": {"chunking": {"chunk_size": 50}}},
+            headers=USER_1_HEADERS,
+        )
+        collection_id = collection_response.json()["uuid"]
+        text = " ".join(f"Paragraph {i} about vacation policy." for i in range(10))
+        for name in ("a.txt", "b.txt"):
+            await client.post(
+                f"/collections/{collection_id}/documents",
+                files=[("files", (name, text.encode(), "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+        before = (
+            await client.get(
+                f"/collections/{collection_id}/stats", headers=USER_1_HEADERS
+            )
+        ).json()
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        file_ids = sorted(doc["metadata"]["file_id"] for doc in listed.json())
+
+        response = await client.post(
+            f"/collections/{collection_id}/reindex",
+            json={"chunking": {"chunk_size": 400}},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        assert response.json()["kind"] == "reindex"
+        for _ in range(100):
+            job = (await client.get(f"/jobs/{job_id}", headers=USER_1_HEADERS)).json()
+            if job["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        assert job["status"] == "succeeded", job["error"]
+        assert job["done"] == job["total"] == before["rows"]
+        assert job["details"]["phase"] == "done"
+        assert job["details"]["embedding"]["texts"] == job["details"]["chunks"]
+        assert job["details"]["chunking"]["chunk_size"] == 400
+
+        after = (
+            await client.get(
+                f"/collections/{collection_id}/stats", headers=USER_1_HEADERS
+            )
+        ).json()
+        assert after["files"] == 2
+        assert 0 < after["rows"] < before["rows"]
+        collection = (
+            await client.get(f"/collections/{collection_id}", headers=USER_1_HEADERS)
+        ).json()
+        assert collection["metadata"]["chunking"] == {"chunk_size": 400}
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        assert sorted(doc["metadata"]["file_id"] for doc in listed.json()) == file_ids
+        search = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "vacation", "limit": 1},
+            headers=USER_1_HEADERS,
+        )
+        assert "Paragraph 0 about vacation policy." in search.json()[0]["page_content"]
+        async with get_db_connection() as conn:
+            shadows = await conn.fetchval(
+                "SELECT count(*) FROM langchain_pg_collection"
+                " WHERE cmetadata->>'reindex_of' = $1",
+                collection_id,
+            )
+        assert shadows == 0
+
+        # Reindexing keeps the chunking when none is given.
+        response = await client.post(
+            f"/collections/{collection_id}/reindex", headers=USER_1_HEADERS
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        for _ in range(100):
+            job = (await client.get(f"/jobs/{job_id}", headers=USER_1_HEADERS)).json()
+            if job["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        assert job["status"] == "succeeded", job["error"]
+        assert job["details"]["chunking"]["chunk_size"] == 400
+
+        response = await client.post(
+            f"/collections/{UUID(int=0)}/reindex", headers=USER_1_HEADERS
+        )
+        assert response.status_code == 404
+
+
+async def test_collection_reindex_refuses_chunks_without_positions() -> None:
+    """Test that chunks stored without offsets fail the reindex job."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "legacy_col"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("a.txt", b"Leave policy.", "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        async with get_db_connection() as conn:
+            # Chunks as stored before positions were recorded.
+            await conn.execute(
+                "UPDATE langchain_pg_embedding"
+                " SET cmetadata = cmetadata - 'ordinal' - 'start_index'"
+                " WHERE collection_id = $1",
+                collection_id,
+            )
+
+        response = await client.post(
+            f"/collections/{collection_id}/reindex", headers=USER_1_HEADERS
+        )
+        job_id = response.json()["id"]
+        for _ in range(100):
+            job = (await client.get(f"/jobs/{job_id}", headers=USER_1_HEADERS)).json()
+            if job["status"] != "running":
+                break
+            await asyncio.sleep(0.05)
+        assert job["status"] == "failed"
+        assert "without position metadata" in job["error"]
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        assert [doc["content"] for doc in listed.json()] == ["Leave policy."]
+
+
+@pytest.mark.parametrize("memory_index_max_rows", [2000, 0])
+async def test_documents_tombstoned_file_is_hidden(
+    monkeypatch: pytest.MonkeyPatch, memory_index_max_rows: int
+) -> None:
+    """Test that a file is hidden as soon as its tombstone is recorded."""
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", memory_index_max_rows)
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "tombstone_col"}, headers=USER_1_HEADERS
+        )
+        collection = collection_response.json()
+        collection_id = collection["uuid"]
+        for name, text in (("a.txt", "Leave policy A."), ("b.txt", "Leave policy B.")):
+            await client.post(
+                f"/collections/{collection_id}/documents",
+                files=[("files", (name, text.encode(), "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        deleted, kept = listed.json()
+        async with get_db_connection() as conn:
+            await tombstones.add(
+                conn,
+                collection_id,
+                collection["metadata"]["owner_id"],
+                deleted["metadata"]["file_id"],
+            )
+        MEMORY_INDEX.invalidate(collection_id)
+
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        assert [doc["id"] for doc in listed.json()] == [kept["id"]]
+        search = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "leave policy"},
+            headers=USER_1_HEADERS,
+        )
+        assert [hit["id"] for hit in search.json()] == [kept["id"]]
+
+
+async def test_documents_tombstoned_file_is_not_exported_or_counted() -> None:
+    """Test that export, stats and get leave out a file being deleted."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "tombstone_export"}, headers=USER_1_HEADERS
+        )
+        collection = collection_response.json()
+        collection_id = collection["uuid"]
+        owner = collection["metadata"]["owner_id"]
+        for name, text in (("a.txt", "Leave policy A."), ("b.txt", "Leave policy B.")):
+            await client.post(
+                f"/collections/{collection_id}/documents",
+                files=[("files", (name, text.encode(), "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        deleted, kept = listed.json()
+        async with get_db_connection() as conn:
+            await tombstones.add(
+                conn, collection_id, owner, deleted["metadata"]["file_id"]
+            )
+
+        stats = await client.get(
+            f"/collections/{collection_id}/stats", headers=USER_1_HEADERS
+        )
+        assert (stats.json()["rows"], stats.json()["files"]) == (1, 1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await Collection(collection_id, owner).get(deleted["id"])
+        assert exc_info.value.status_code == 404
+        chunk = await Collection(collection_id, owner).get(kept["id"])
+        assert chunk["id"] == kept["id"]
+
+        export = await client.get(
+            f"/collections/{collection_id}/export", headers=USER_1_HEADERS
+        )
+        target = await client.post(
+            "/collections", json={"name": "tombstone_import"}, headers=USER_1_HEADERS
+        )
+        imported = await client.post(
+            f"/collections/{target.json()['uuid']}/import",
+            files=[("snapshot", ("s.tar", export.content, "application/x-tar"))],
+            headers=USER_1_HEADERS,
+        )
+        assert imported.json() == {"success": True, "imported_chunks": 1}
+
+
+async def test_documents_tombstone_resumed_by_one_worker() -> None:
+    """Test that a pending delete is claimed by one worker at a time."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "claim_col"}, headers=USER_1_HEADERS
+        )
+        collection = collection_response.json()
+        collection_id = collection["uuid"]
+        async with get_db_connection() as conn:
+            await tombstones.add(
+                conn, collection_id, collection["metadata"]["owner_id"], "file-1"
+            )
+
+        async with tombstones.claim(collection_id, "file-1") as claimed:
+            assert claimed is True
+            # Another worker, holding its own connection.
+            async with tombstones.claim(collection_id, "file-1") as other:
+                assert other is False
+
+        async with get_db_connection() as conn:
+            await tombstones.remove(conn, collection_id, "file-1")
+        # Finished by the worker that held it: nothing left to resume.
+        async with tombstones.claim(collection_id, "file-1") as claimed:
+            assert claimed is False
+
+
+async def test_documents_delete_skips_purge_claimed_elsewhere() -> None:
+    """Test that a live delete leaves a claimed purge to the worker holding it."""
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections", json={"name": "claimed_delete"}, headers=USER_1_HEADERS
+        )
+        collection_id = collection_response.json()["uuid"]
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("a.txt", b"Leave policy.", "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        file_id = listed.json()[0]["metadata"]["file_id"]
+
+        # Another worker resuming the same delete holds the lock.
+        async with tombstones.claim(collection_id, file_id):
+            delete = await client.delete(
+                f"/collections/{collection_id}/documents/{file_id}",
+                headers=USER_1_HEADERS,
+            )
+            assert delete.status_code == 200
+            async with get_db_connection() as conn:
+                remaining = await conn.fetchval(
+                    "SELECT count(*) FROM langchain_pg_embedding "
+                    "WHERE collection_id = $1",
+                    collection_id,
+                )
+                assert remaining == 1
+                assert await tombstones.deleted_files(conn, collection_id) == [file_id]
+
+
+@pytest.mark.parametrize("memory_index_max_rows", [2000, 0])
+async def test_documents_search_cursor_pagination(
+    monkeypatch: pytest.MonkeyPatch, memory_index_max_rows: int
+) -> None:
+    """Test that cursor pages add up to the unpaginated result order."""
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", memory_index_max_rows)
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections",
+            json={"name": "cursor_col", "metadata": {"chunking": {"chunk_size": 40}}},
+            headers=USER_1_HEADERS,
+        )
+        collection_id = collection_response.json()["uuid"]
+        # Repeated sentences give chunks with identical scores.
+        sentences = ["Leave requests need approval."] * 3
+        sentences += [f"Topic {i} covers office rules." for i in range(5)]
+        text = " ".join(sentences)
+        await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("rules.txt", text.encode(), "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        url = f"/collections/{collection_id}/documents/search"
+        query = "leave approval"
+        everything = await client.post(
+            url, json={"query": query, "limit": 100}, headers=USER_1_HEADERS
+        )
+        expected = [hit["id"] for hit in everything.json()]
+        assert len(expected) > 3
+
+        paged: list[str] = []
+        cursor = None
+        for _ in range(len(expected)):
+            response = await client.post(
+                url,
+                json={"query": query, "limit": 3, "cursor": cursor},
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            paged += [hit["id"] for hit in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        assert paged == expected
+
+        response = await client.post(
+            url, json={"query": query, "limit": 3}, headers=USER_1_HEADERS
+        )
+        cursor = response.headers["X-Next-Cursor"]
+        for payload in (
+            {"query": "another query", "cursor": cursor},
+            {"query": query, "cursor": "not-a-cursor"},
+            {"query": query, "cursor": cursor, "search_type": "mmr"},
+        ):
+            response = await client.post(url, json=payload, headers=USER_1_HEADERS)
+            assert response.status_code == 400
+
+
+async def test_documents_near_duplicates_are_skipped_as_aliases() -> None:
+    """Test that a revised copy is stored as an alias until its original goes."""
+    policy = (
+        "Employees receive {days} days of annual leave per year. Leave is granted "
+        "on the first of January and prorated for new hires joining mid-year. "
+        "Unused leave may be carried over for up to three months, after which it "
+        "expires. Requests must be approved by the team lead at least one week in "
+        "advance, except for sick leave, which is reported on the same day."
+    )
+    async with get_async_test_client() as client:
+        collection_response = await client.post(
+            "/collections",
+            json={
+                "name": "near_duplicates_col",
+                "metadata": {"near_duplicates": {"mode": "skip", "threshold": 0.8}},
+            },
+            headers=USER_1_HEADERS,
+        )
+        assert collection_response.status_code == 201
+        collection_id = collection_response.json()["uuid"]
+
+        uploads = []
+        for name, days in (("original.txt", "fifteen"), ("revised.txt", "sixteen")):
+            content = policy.format(days=days).encode()
+            response = await client.post(
+                f"/collections/{collection_id}/documents",
+                files=[("files", (name, content, "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+            assert response.status_code == 200
+            uploads.append(response.json())
+        original, revised = uploads
+        [canonical_id] = original["added_chunk_ids"]
+        assert original["near_duplicates"]["duplicates"] == 0
+        assert revised["added_chunk_ids"] == []
+        [alias] = revised["near_duplicates"]["aliases"]
+        assert alias["canonical_id"] == canonical_id
+        assert alias["similarity"] >= 0.8
+
+        search = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "annual leave"},
+            headers=USER_1_HEADERS,
+        )
+        assert [hit["id"] for hit in search.json()] == [canonical_id]
+
+        # Deleting the original stores the alias in its place.
+        listed = await client.get(
+            f"/collections/{collection_id}/documents", headers=USER_1_HEADERS
+        )
+        [document] = listed.json()
+        file_id = document["metadata"]["file_id"]
+        response = await client.delete(
+            f"/collections/{collection_id}/documents/{file_id}",
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+        search = await client.post(
+            f"/collections/{collection_id}/documents/search",
+            json={"query": "annual leave"},
+            headers=USER_1_HEADERS,
+        )
+        [hit] = search.json()
+        assert hit["id"] == alias["id"]
+        assert "sixteen" in hit["page_content"]
+
+
+@pytest.mark.parametrize("memory_index_max_rows", [2000, 0])
+async def test_federated_search(
+    monkeypatch: pytest.MonkeyPatch, memory_index_max_rows: int
+) -> None:
+    """Test that /search merges several collections by score, within quotas."""
+    monkeypatch.setattr(MEMORY_INDEX, "max_rows", memory_index_max_rows)
+    async with get_async_test_client() as client:
+        collection_ids = []
+        for name, sentences in (
+            ("federated_hr", ["Annual leave is fifteen days.", "Sick leave is paid."]),
+            ("federated_it", ["Laptops are replaced every three years."]),
+        ):
+            response = await client.post(
+                "/collections",
+                json={"name": name, "metadata": {"chunking": {"chunk_size": 40}}},
+                headers=USER_1_HEADERS,
+            )
+            collection_id = response.json()["uuid"]
+            collection_ids.append(collection_id)
+            content = "\n\n".join(sentences).encode()
+            await client.post(
+                f"/collections/{collection_id}/documents",
+                files=[("files", (f"{name}.txt", content, "text/plain"))],
+                headers=USER_1_HEADERS,
+            )
+
+        response = await client.post(
+            "/search",
+            json={"query": "annual leave", "collection_ids": collection_ids},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+        results = response.json()
+        assert {hit["collection_id"] for hit in results} == set(collection_ids)
+        scores = [hit["score"] for hit in results]
+        assert scores == sorted(scores, reverse=True)
+        assert "Annual leave" in results[0]["page_content"]
+        assert results[0]["collection_id"] == collection_ids[0]
+
+        response = await client.post(
+            "/search",
+            json={
+                "query": "leave",
+                "collection_ids": collection_ids,
+                "quota": 1,
+                "return": "ids",
+            },
+            headers=USER_1_HEADERS,
+        )
+        results = response.json()
+        assert [hit["collection_id"] for hit in results].count(collection_ids[0]) == 1
+        assert all("page_content" not in hit for hit in results)
+
+        missing = "00000000-0000-0000-0000-000000000000"
+        response = await client.post(
+            "/search",
+            json={"query": "leave", "collection_ids": [collection_ids[0], missing]},
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 404
+        assert missing in response.json()["detail"]
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from langconnect.services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeModel:
+    """Embeds a text as its length, recording every batch."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        time.sleep(0.01)
+        return [[float(len(text))] for text in texts]
+
+
+async def test_concurrent_requests_share_batches() -> None:
+    """Concurrent requests are embedded together, up to the batch size."""
+    model = FakeModel()
+    batcher = EmbeddingBatcher(
+        max_batch_size=4, max_wait_seconds=0.01, embed_batch=model
+    )
+    texts = [f"query {i}" + "!" * i for i in range(10)]
+
+    results = await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    assert results == [[float(len(text))] for text in texts]
+    assert [len(batch) for batch in model.batches] == [4, 4, 2]
+
+
+async def test_identical_queries_are_embedded_once() -> None:
+    """Duplicate texts within a batch cost one embedding."""
+    model = FakeModel()
+    batcher = EmbeddingBatcher(
+        max_batch_size=8, max_wait_seconds=0.01, embed_batch=model
+    )
+
+    results = await asyncio.gather(*(batcher.embed("same") for _ in range(3)))
+
+    assert results == [[4.0]] * 3
+    assert model.batches == [["same"]]
+
+
+async def test_errors_reach_every_waiting_request() -> None:
+    """A failed forward pass fails the whole batch, not later ones."""
+
+    def broken(texts: list[str]) -> list[list[float]]:
+        raise RuntimeError("model unavailable")
+
+    batcher = EmbeddingBatcher(
+        max_batch_size=8, max_wait_seconds=0.01, embed_batch=broken
+    )
+    results = await asyncio.gather(
+        batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    batcher.embed_batch = FakeModel()
+    assert await batcher.embed("abc") == [3.0]
+
+
+async def test_requests_of_several_texts_are_embedded_as_submitted() -> None:
+    """A multi-text request is one pass of its own; queries go ahead of it."""
+    model = FakeModel()
+    batcher = EmbeddingBatcher(
+        max_batch_size=2, max_wait_seconds=0.01, embed_batch=model
+    )
+    documents = ["doc a", "doc bb", "doc ccc"]
+
+    results = await asyncio.gather(
+        batcher.embed_many(documents),
+        batcher.embed_many(documents[:2]),
+        batcher.embed("q1"),
+        batcher.embed("q2"),
+    )
+
+    assert results[0] == [[float(len(text))] for text in documents]
+    assert results[1] == [[5.0], [6.0]]
+    assert results[2:] == [[2.0], [2.0]]
+    # Queries go first; each multi-text request is one pass, even beyond
+    # `max_batch_size`.
+    assert model.batches == [["q1", "q2"], documents, documents[:2]]
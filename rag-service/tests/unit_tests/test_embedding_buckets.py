@@ -0,0 +1,62 @@
+from langconnect.services import embedding_buckets
+from langconnect.services.embedding_buckets import (
+    EmbeddingStats,
+    embed_by_length,
+    plan_batches,
+)
+
+
+def test_plan_batches_groups_similar_lengths() -> None:
+    """Short texts share large batches; long ones stay within the budget."""
+    lengths = [100, 5, 100, 5, 5, 100]
+
+    batches = plan_batches(lengths, token_budget=200, max_batch_size=3)
+
+    assert batches == [[1, 3, 4], [0, 2], [5]]
+    # A text longer than the budget is embedded on its own.
+    assert plan_batches([500, 1], token_budget=100, max_batch_size=8) == [[1], [0]]
+
+
+def test_embed_by_length_restores_order_and_reports_padding() -> None:
+    """Vectors come back in input order, with similar lengths batched."""
+    texts = ["long " * 20, "a", "long " * 20, "b", "c", "long " * 20]
+    lengths = [20, 1, 20, 1, 1, 20]
+    seen: list[list[str]] = []
+
+    def embed(batch: list[str]) -> list[list[float]]:
+        seen.append(batch)
+        return [[float(len(text))] for text in batch]
+
+    stats = EmbeddingStats()
+    vectors = embed_by_length(
+        texts, embed, lengths=lengths, token_budget=60, max_batch_size=3, stats=stats
+    )
+
+    assert vectors == [[float(len(text))] for text in texts]
+    assert seen == [["a", "b", "c"], ["long " * 20] * 3]
+    summary = stats.as_dict()
+    assert summary["texts"] == 6
+    assert summary["batches"] == 2
+    assert summary["tokens"] == 63
+    assert summary["padded_tokens"] == 63
+
+
+def test_embed_by_length_reuses_known_lengths(monkeypatch) -> None:
+    """Texts with a known token count are not tokenized again."""
+    counted: list[str] = []
+
+    def count_tokens(text: str) -> int:
+        counted.append(text)
+        return len(text)
+
+    monkeypatch.setattr(embedding_buckets, "count_tokens", count_tokens)
+    stats = EmbeddingStats()
+    embed_by_length(
+        ["known", "unknown"],
+        lambda batch: [[0.0] for _ in batch],
+        known_lengths={"known": 3},
+        stats=stats,
+    )
+
+    assert counted == ["unknown"]
+    assert stats.tokens == 3 + len("unknown")
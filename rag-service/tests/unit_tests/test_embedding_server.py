@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from langconnect.embedding_client import EmbeddingServerError, RemoteEmbeddings
+from langconnect.embedding_server import start_server
+
+
+def fake_model(texts: list[str]) -> list[list[float]]:
+    """Embeds a text as its length and number of words."""
+    if "fail" in texts:
+        raise RuntimeError("model unavailable")
+    return [[float(len(text)), float(len(text.split()))] for text in texts]
+
+
+async def test_client_embeds_through_server(tmp_path) -> None:
+    """Workers get the server's vectors, in request order."""
+    socket_path = str(tmp_path / "embeddings.sock")
+    server = await start_server(
+        socket_path, fake_model, max_batch_size=4, max_wait_seconds=0.01
+    )
+    client = RemoteEmbeddings(socket_path)
+    async with server:
+        texts = [f"text number {i}" for i in range(10)]
+        documents, query = await asyncio.gather(
+            asyncio.to_thread(client.embed_documents, texts),
+            asyncio.to_thread(client.embed_query, "a query"),
+        )
+        assert documents == fake_model(texts)
+        assert query == [7.0, 2.0]
+        assert await asyncio.to_thread(client.embed_documents, []) == []
+
+
+async def test_client_reports_server_errors(tmp_path) -> None:
+    """Model failures and a missing server surface as EmbeddingServerError."""
+    socket_path = str(tmp_path / "embeddings.sock")
+    missing = RemoteEmbeddings(socket_path, connect_timeout=0)
+    with pytest.raises(EmbeddingServerError):
+        await asyncio.to_thread(missing.embed_query, "a query")
+
+    server = await start_server(socket_path, fake_model, max_wait_seconds=0.01)
+    client = RemoteEmbeddings(socket_path)
+    async with server:
+        with pytest.raises(EmbeddingServerError, match="model unavailable"):
+            await asyncio.to_thread(client.embed_documents, ["fail"])
+        assert await asyncio.to_thread(client.embed_query, "ok") == [2.0, 1.0]
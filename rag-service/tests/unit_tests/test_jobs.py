@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from langconnect.services import jobs
+from langconnect.services.jobs import Job, JobRegistry
+
+
+async def test_job_state_is_shared_between_workers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a job started by one worker is reported by another."""
+    monkeypatch.setattr(jobs, "PROGRESS_SAVE_INTERVAL", 0.0)
+    worker, other_worker = JobRegistry(), JobRegistry()
+    advanced, release = asyncio.Event(), asyncio.Event()
+
+    async def run(job: Job) -> None:
+        job.total = 4
+        job.advance(3)
+        advanced.set()
+        await release.wait()
+        job.advance(1)
+
+    job = await worker.start("test", "owner", run)
+    assert (await other_worker.get(job.id, "owner"))["status"] == "running"
+    assert await other_worker.get(job.id, "someone else") is None
+
+    await advanced.wait()
+    for _ in range(100):
+        state = await other_worker.get(job.id, "owner")
+        if state["done"] == 3:
+            break
+        await asyncio.sleep(0.05)
+    assert (state["status"], state["done"], state["total"]) == ("running", 3, 4)
+
+    release.set()
+    for _ in range(100):
+        state = await other_worker.get(job.id, "owner")
+        if state["status"] != "running":
+            break
+        await asyncio.sleep(0.05)
+    assert (state["status"], state["done"]) == ("succeeded", 4)
+    assert state["finished_at"] is not None
+
+
+async def test_job_failure_is_saved() -> None:
+    """Test that a failed job is reported with its error."""
+
+    async def run(job: Job) -> None:
+        raise RuntimeError("boom")
+
+    job = await JobRegistry().start("test", "owner", run)
+    for _ in range(100):
+        state = await JobRegistry().get(job.id, "owner")
+        if state["status"] != "running":
+            break
+        await asyncio.sleep(0.05)
+    assert (state["status"], state["error"]) == ("failed", "boom")
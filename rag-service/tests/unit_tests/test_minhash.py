@@ -0,0 +1,45 @@
+import numpy as np
+
+from langconnect.services.minhash import (
+    NUM_PERMUTATIONS,
+    LSHIndex,
+    from_bytes,
+    signature,
+    similarity,
+    to_bytes,
+)
+
+POLICY = (
+    "Unused leave may be carried over for up to three months, after which it "
+    "expires. Requests must be approved by the team lead at least one week in "
+    "advance, except for sick leave, which is reported on the same day."
+)
+
+
+def test_signatures_estimate_similarity() -> None:
+    """Revised copies score high, unrelated texts low, whitespace is ignored."""
+    original = signature(POLICY)
+    assert original is not None
+    assert original.dtype == np.uint32
+    assert original.shape == (NUM_PERMUTATIONS,)
+
+    assert similarity(original, signature("  " + POLICY.upper() + "\n")) == 1.0
+    revised = signature(POLICY.replace("three", "four"))
+    assert similarity(original, revised) > 0.8
+    unrelated = signature("Quarterly revenue grew by twelve percent in Europe.")
+    assert similarity(original, unrelated) < 0.2
+    assert signature(" \n ") is None
+    assert np.array_equal(from_bytes(to_bytes(original)), original)
+
+
+def test_lsh_index_finds_near_duplicates() -> None:
+    """Only candidates at or above the threshold are returned."""
+    index = LSHIndex()
+    index.add("original", signature(POLICY))
+    index.add("other", signature("Quarterly revenue grew by twelve percent."))
+
+    match = index.best_match(signature(POLICY.replace("three", "four")), 0.8)
+
+    assert match is not None
+    assert match[0] == "original"
+    assert index.best_match(signature("Office hours are nine to six."), 0.8) is None
@@ -0,0 +1,60 @@
+import os
+
+from langchain_core.documents import Document
+
+from langconnect.services import document_processor
+from langconnect.services.parse_cache import ParseCache, ParseCacheStats, cache_key
+
+
+def test_parse_cache_round_trip_and_keys(tmp_path) -> None:
+    """Entries are keyed by content, mimetype and parser version."""
+    cache = ParseCache(str(tmp_path), max_bytes=10**6)
+    key = cache_key(b"contents", "application/pdf", "v1")
+    assert cache.get(key) is None
+
+    cache.put(key, [Document(page_content="text", metadata={"page": 1})])
+
+    [document] = cache.get(key)
+    assert document.page_content == "text"
+    assert document.metadata == {"page": 1}
+    assert key != cache_key(b"contents", "application/pdf", "v2")
+    assert key != cache_key(b"contents", "text/plain", "v1")
+    assert key != cache_key(b"other contents", "application/pdf", "v1")
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path) -> None:
+    """Beyond the size limit, the least recently read entries go first."""
+    entry = [Document(page_content="x" * 100)]
+    probe = ParseCache(str(tmp_path / "probe"), max_bytes=10**6)
+    probe.put("probe", entry)
+    entry_bytes = probe._scan_size()
+
+    cache = ParseCache(str(tmp_path / "cache"), max_bytes=int(entry_bytes * 2.5))
+    for age, key in enumerate(["a" * 64, "b" * 64]):
+        cache.put(key, entry)
+        os.utime(cache._path(key), (age, age))
+    # Reading "a" makes "b" the least recently used entry.
+    assert cache.get("a" * 64) is not None
+
+    cache.put("c" * 64, entry)
+
+    assert cache.get("a" * 64) is not None
+    assert cache.get("b" * 64) is None
+    assert cache.get("c" * 64) is not None
+
+
+def test_parse_contents_skips_parsing_on_hit(tmp_path, monkeypatch) -> None:
+    """Identical uploads are parsed once; the hit counts the bytes saved."""
+    monkeypatch.setattr(
+        document_processor, "PARSE_CACHE", ParseCache(str(tmp_path), 10**6)
+    )
+    contents = b"Cached document text."
+    stats = ParseCacheStats()
+
+    first = document_processor.parse_contents(contents, "text/plain", parse_stats=stats)
+    second = document_processor.parse_contents(
+        contents, "text/plain", parse_stats=stats
+    )
+
+    assert [doc.page_content for doc in second] == [doc.page_content for doc in first]
+    assert stats.as_dict() == {"hits": 1, "misses": 1, "bytes_saved": len(contents)}
@@ -0,0 +1,33 @@
+import pytest
+
+from langconnect.database import partitioning
+
+
+class FakeConnection:
+    """Answers the pgvector version query and records executed statements."""
+
+    def __init__(self, version: str | None) -> None:
+        self.version = version
+        self.executed: list[str] = []
+
+    async def fetchval(self, query: str, *args: object) -> str | None:
+        return self.version
+
+    async def execute(self, query: str, *args: object) -> None:
+        self.executed.append(query)
+
+
+@pytest.mark.parametrize(
+    ("version", "supported"),
+    [("0.8.0", True), ("0.10.1", True), ("0.7.4", False), (None, False)],
+)
+async def test_set_iterative_scan_checks_pgvector_version(
+    monkeypatch: pytest.MonkeyPatch, version: str | None, supported: bool
+) -> None:
+    """Test that `hnsw.iterative_scan` is only set where pgvector knows it."""
+    monkeypatch.setattr(partitioning, "_iterative_scan", None)
+    conn = FakeConnection(version)
+
+    await partitioning.set_iterative_scan(conn)
+
+    assert bool(conn.executed) is supported
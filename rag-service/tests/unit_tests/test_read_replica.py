@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from langconnect import config
+from langconnect.database import connection
+from langconnect.database.connection import (
+    close_replica_pool,
+    get_routed_pool,
+    replica_reads,
+)
+from tests.unit_tests.fixtures import get_async_test_client
+
+USER_1_HEADERS = {
+    "Authorization": "Bearer user1",
+}
+
+READ_YOUR_WRITES_HEADERS = {**USER_1_HEADERS, "X-Read-Your-Writes": "true"}
+
+
+@pytest.fixture
+async def replica(monkeypatch: pytest.MonkeyPatch):
+    """Route replica reads, to the primary itself unless a replica is set."""
+    if not config.POSTGRES_REPLICA_HOST:
+        monkeypatch.setattr(config, "POSTGRES_REPLICA_HOST", config.POSTGRES_HOST)
+        monkeypatch.setattr(config, "POSTGRES_REPLICA_PORT", config.POSTGRES_PORT)
+        # A pool opened before the settings changed would not be routed.
+        await close_replica_pool()
+        yield
+        await close_replica_pool()
+    else:
+        yield
+
+
+async def test_reads_stay_on_primary_without_replica(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that replica reads fall back to the primary when none is set."""
+    monkeypatch.setattr(config, "POSTGRES_REPLICA_HOST", "")
+    primary = await connection.get_db_pool()
+    with replica_reads():
+        assert await get_routed_pool() is primary
+
+
+async def test_replica_reads_routing(replica: None) -> None:
+    """Test which pool connections come from, in and out of `replica_reads`."""
+    primary = await connection.get_db_pool()
+    assert await get_routed_pool() is primary
+    with replica_reads():
+        routed = await get_routed_pool()
+        assert routed is await connection.get_replica_pool()
+        assert routed is not primary
+        # Tasks started in the context inherit it.
+        assert await asyncio.gather(get_routed_pool(), get_routed_pool()) == [
+            routed,
+            routed,
+        ]
+        with replica_reads(enabled=False):
+            assert await get_routed_pool() is primary
+        assert await get_routed_pool() is routed
+    assert await get_routed_pool() is primary
+
+
+async def test_read_endpoints_with_replica(replica: None) -> None:
+    """Test writes on the primary and reads with and without read-your-writes."""
+    async with get_async_test_client() as client:
+        response = await client.post(
+            "/collections", json={"name": "replica_col"}, headers=USER_1_HEADERS
+        )
+        assert response.status_code == 201
+        collection_id = response.json()["uuid"]
+        response = await client.post(
+            f"/collections/{collection_id}/documents",
+            files=[("files", ("policy.txt", b"Vacation policy.", "text/plain"))],
+            headers=USER_1_HEADERS,
+        )
+        assert response.status_code == 200
+
+        for headers in (USER_1_HEADERS, READ_YOUR_WRITES_HEADERS):
+            response = await client.get(
+                f"/collections/{collection_id}", headers=headers
+            )
+            assert response.json()["name"] == "replica_col"
+            response = await client.post(
+                f"/collections/{collection_id}/documents/search",
+                json={"query": "vacation"},
+                headers=headers,
+            )
+            assert [hit["page_content"] for hit in response.json()] == [
+                "Vacation policy."
+            ]
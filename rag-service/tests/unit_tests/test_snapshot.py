@@ -0,0 +1,102 @@
+import io
+import tarfile
+
+import numpy as np
+import orjson
+import pytest
+
+from langconnect.services.snapshot import (
+    MANIFEST_NAME,
+    RECORDS_NAME,
+    VECTORS_NAME,
+    SnapshotError,
+    SnapshotReader,
+    SnapshotWriter,
+)
+
+
+def _snapshot(tmp_path, count: int = 3) -> dict[str, bytes]:
+    """Members of a valid snapshot of `count` chunks."""
+    writer = SnapshotWriter(tmp_path)
+    writer.write(
+        [{"document": f"chunk {i}", "metadata": {"file_id": "f"}} for i in range(count)],
+        np.arange(count * 2, dtype=np.float32).reshape(count, 2),
+    )
+    archive = writer.finish(model="test-model", collection={"name": "c"})
+    with tarfile.open(archive) as tar:
+        return {
+            name: tar.extractfile(name).read()
+            for name in (MANIFEST_NAME, RECORDS_NAME, VECTORS_NAME)
+        }
+
+
+def _archive(members: dict[str, bytes]) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+
+def test_snapshot_round_trip(tmp_path) -> None:
+    """Records and vectors are read back in order."""
+    reader = SnapshotReader(_archive(_snapshot(tmp_path)))
+
+    batches = list(reader.iter_batches(batch_size=2))
+
+    assert [len(records) for records, _ in batches] == [2, 1]
+    assert batches[1][0] == [{"document": "chunk 2", "metadata": {"file_id": "f"}}]
+    assert batches[1][1].tolist() == [[4.0, 5.0]]
+
+
+@pytest.mark.parametrize(
+    ("manifest", "message"),
+    [
+        (b"{not json", "Unreadable manifest"),
+        (b"[]", "Unreadable manifest"),
+        ({"count": None}, "chunk count"),
+        ({"dimension": "2"}, "vector dimension"),
+    ],
+)
+def test_snapshot_invalid_manifest(tmp_path, manifest, message: str) -> None:
+    """Malformed manifests are reported as snapshot errors."""
+    members = _snapshot(tmp_path)
+    if isinstance(manifest, dict):
+        manifest = orjson.dumps({**orjson.loads(members[MANIFEST_NAME]), **manifest})
+    members[MANIFEST_NAME] = manifest
+
+    with pytest.raises(SnapshotError, match=message):
+        SnapshotReader(_archive(members))
+
+
+def test_snapshot_missing_count(tmp_path) -> None:
+    """A manifest without a count is reported as a snapshot error."""
+    members = _snapshot(tmp_path)
+    manifest = orjson.loads(members[MANIFEST_NAME])
+    del manifest["count"]
+    members[MANIFEST_NAME] = orjson.dumps(manifest)
+
+    with pytest.raises(SnapshotError, match="chunk count"):
+        SnapshotReader(_archive(members))
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        # Cut short mid-line, then missing lines.
+        b'{"document": "chunk 0"}\n{"docu',
+        b'{"document": "chunk 0"}\n',
+        b'{"document": "chunk 0"}\n[]\n{"document": "chunk 2"}\n',
+    ],
+)
+def test_snapshot_truncated_records(tmp_path, records: bytes) -> None:
+    """Records short of the manifest's count fail while streaming."""
+    members = _snapshot(tmp_path)
+    members[RECORDS_NAME] = records
+    reader = SnapshotReader(_archive(members))
+
+    with pytest.raises(SnapshotError):
+        list(reader.iter_batches())